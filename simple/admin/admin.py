@@ -1,35 +1,73 @@
+from django import forms
+from django.conf import settings
 from django.contrib import admin
-from django.db.models import Count
-from django.http import HttpResponseRedirect
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponseRedirect, JsonResponse
 from django.contrib import messages
+from django.urls import path, reverse
 
-from admin_auto_filters.filters import AutocompleteFilter
+from admin_auto_filters.filters import AutocompleteFilter, AutocompleteSelect
 from admin_numeric_filter.admin import NumericFilterModelAdmin
 from rangefilter.filters import DateRangeFilter
 from import_export import resources
-from import_export.admin import ImportExportModelAdmin
+from import_export.admin import ExportMixin, ImportExportModelAdmin
 from import_export.fields import Field
 
-from simple.models.models import Movie, MovieCategory, Author, Book
-from simple.models.weather import Weather
+from simple.admin.base import TrigramSearchMixin
+from simple.api.movies.snapshot import get_category_snapshot
+from simple.models.models import Movie, MovieCategory, Author, Book, Director
+from simple.models.weather import Weather, WeatherDaily, WeatherHourly
 from simple.processes.get_weather import get_weather_data
+from simple.processes.partitions import maintain_weather_partitions
 
 import logging
 
 logger = logging.getLogger(name="backends")
 
 
+class CategorySnapshotSelect(AutocompleteSelect):
+    """Autocomplete widget labelling the selected category from the category snapshot."""
+
+    def optgroups(self, name, value, attr=None):
+        default = (None, [], 0)
+        if not self.is_required:
+            default[1].append(self.create_option(name, "", "", False, 0))
+        by_id = get_category_snapshot().by_id
+        for category_id in value:
+            category = by_id.get(int(category_id)) if str(category_id).isdigit() else None
+            if category is not None:
+                default[1].append(
+                    self.create_option(name, category.id, category.name, True, len(default[1]))
+                )
+        return [default]
+
+
+class CategorySnapshotChoiceField(forms.ModelChoiceField):
+    """Category choice field rendered with `CategorySnapshotSelect`."""
+
+    def __init__(self, queryset, widget, **kwargs):
+        widget = CategorySnapshotSelect(
+            widget.field, widget.admin_site, using=widget.db, custom_url=widget.custom_url
+        )
+        super().__init__(queryset, widget=widget, **kwargs)
+
+
 class CategoryFilter(AutocompleteFilter):
     """Filter movies by category."""
 
     title = "Category"
     field_name = "category"
+    form_field = CategorySnapshotChoiceField
+
+    def get_autocomplete_url(self, request, model_admin):
+        """Categories are looked up in the category snapshot."""
+        return reverse("admin:simple_moviecategory_snapshot_autocomplete")
 
 
 class MovieCategoryResource(resources.ModelResource):
     """Resource for import/export of movie categories."""
 
-    movies_count = Field(attribute="movies_count", column_name="Movies Count")
+    movies_count = Field(attribute="movies_count", column_name="Movies Count", readonly=True)
 
     class Meta:
         model = MovieCategory
@@ -54,16 +92,6 @@ class MovieCategoryResource(resources.ModelResource):
             "updated_at",
         )
 
-    def before_export(self, queryset, *args, **kwargs):
-        """Optimize queryset by annotating movies count before export."""
-        return queryset.annotate(movies_count=Count("movies"))
-
-    def dehydrate_movies_count(self, category):
-        """Get the count of movies for this category."""
-        if hasattr(category, "movies_count"):
-            return category.movies_count
-        return 0
-
 
 @admin.register(MovieCategory)
 class MovieCategoryAdmin(ImportExportModelAdmin):
@@ -81,28 +109,41 @@ class MovieCategoryAdmin(ImportExportModelAdmin):
     list_filter = ("created_at", "updated_at", "is_active")
     search_fields = ("name", "slug", "description")
     prepopulated_fields = {"slug": ("name",)}
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("movies_count", "created_at", "updated_at")
 
     show_full_result_count = False
     list_per_page = 50
 
-    def get_queryset(self, request):
-        """Optimize query by annotating movie counts."""
-        queryset = super().get_queryset(request)
-        return queryset.annotate(movies_count=Count("movies"))
-
-    def movies_count(self, obj):
-        """Display count of movies in this category."""
-        return obj.movies_count
-
-    movies_count.admin_order_field = "movies_count"
-    movies_count.short_description = "Movies Count"
+    def get_urls(self):
+        urls = [
+            path(
+                "snapshot-autocomplete/",
+                self.admin_site.admin_view(self.snapshot_autocomplete_view),
+                name="simple_moviecategory_snapshot_autocomplete",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def snapshot_autocomplete_view(self, request):
+        """
+        Autocomplete JSON of `CategoryFilter`, matching `search_fields`
+        against the category snapshot instead of the database.
+        """
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        term = request.GET.get("term", "").lower()
+        results = [
+            {"id": str(category.id), "text": category.name}
+            for category in get_category_snapshot().rows
+            if any(term in getattr(category, field).lower() for field in self.search_fields)
+        ]
+        return JsonResponse({"results": results, "pagination": {"more": False}})
 
 
 class AuthorResource(resources.ModelResource):
     """Resource for import/export of authors."""
 
-    books_count = Field(attribute="books_count", column_name="Books Count")
+    books_count = Field(attribute="books_count", column_name="Books Count", readonly=True)
 
     class Meta:
         model = Author
@@ -133,19 +174,9 @@ class AuthorResource(resources.ModelResource):
             "updated_at",
         )
 
-    def before_export(self, queryset, *args, **kwargs):
-        """Optimize queryset by annotating books count before export."""
-        return queryset.annotate(books_count=Count("books"))
-
-    def dehydrate_books_count(self, author):
-        """Get the count of books for this author."""
-        if hasattr(author, "books_count"):
-            return author.books_count
-        return 0
-
 
 @admin.register(Author)
-class AuthorAdmin(ImportExportModelAdmin):
+class AuthorAdmin(TrigramSearchMixin, ImportExportModelAdmin):
     """Admin interface for authors."""
 
     resource_class = AuthorResource
@@ -161,27 +192,15 @@ class AuthorAdmin(ImportExportModelAdmin):
     )
     list_filter = ("is_active", "nationality")
     search_fields = ("first_name", "last_name", "biography")
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("books_count", "created_at", "updated_at")
     list_per_page = 50
 
-    def get_queryset(self, request):
-        """Optimize query by annotating book counts."""
-        queryset = super().get_queryset(request)
-        return queryset.annotate(books_count=Count("books"))
-
     def biography_short(self, obj):
         """Short version of biography for list display."""
         return obj.biography[:100] + "..." if obj.biography else ""
 
     biography_short.short_description = "Biography"
 
-    def books_count(self, obj):
-        """Display count of books for this author."""
-        return obj.books_count
-
-    books_count.admin_order_field = "books_count"
-    books_count.short_description = "Books Count"
-
 
 class BookResource(resources.ModelResource):
     """Resource for import/export of books."""
@@ -222,7 +241,7 @@ class BookResource(resources.ModelResource):
 
 
 @admin.register(Book)
-class BookAdmin(ImportExportModelAdmin):
+class BookAdmin(TrigramSearchMixin, ImportExportModelAdmin):
     """Admin interface for books."""
 
     resource_class = BookResource
@@ -287,7 +306,7 @@ class BookAdmin(ImportExportModelAdmin):
 
 
 @admin.register(Movie)
-class MovieAdmin(NumericFilterModelAdmin):
+class MovieAdmin(TrigramSearchMixin, NumericFilterModelAdmin):
     """Admin interface for movies."""
 
     list_display = (
@@ -307,7 +326,7 @@ class MovieAdmin(NumericFilterModelAdmin):
     )
     search_fields = ("title", "original_title")
     prepopulated_fields = {"slug": ("title",)}
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("directors", "created_at", "updated_at")
     list_select_related = ("category",)
     list_per_page = 50
     show_full_result_count = False
@@ -321,6 +340,7 @@ class MovieAdmin(NumericFilterModelAdmin):
             {
                 "fields": (
                     "director",
+                    "directors",
                     "duration_minutes",
                     "rating",
                     "release_date",
@@ -412,6 +432,18 @@ class MovieAdmin(NumericFilterModelAdmin):
     mark_as_inactive.short_description = "Mark selected movies as inactive"
 
 
+@admin.register(Director)
+class DirectorAdmin(TrigramSearchMixin, admin.ModelAdmin):
+    """Admin interface for directors."""
+
+    list_display = ("name", "slug", "created_at")
+    search_fields = ("name",)
+    prepopulated_fields = {"slug": ("name",)}
+    readonly_fields = ("created_at", "updated_at")
+    list_per_page = 50
+    show_full_result_count = False
+
+
 class WeatherResource(resources.ModelResource):
     """Resource for import/export of weather data."""
 
@@ -453,7 +485,7 @@ class WeatherResource(resources.ModelResource):
 
 
 @admin.register(Weather)
-class WeatherAdmin(ImportExportModelAdmin):
+class WeatherAdmin(TrigramSearchMixin, ImportExportModelAdmin):
     """Admin interface for weather data."""
 
     resource_class = WeatherResource
@@ -483,6 +515,9 @@ class WeatherAdmin(ImportExportModelAdmin):
         "temp_min",
         "temp_max",
     )
+    # Ids grow with `created_at`; the primary key serves the latest page while
+    # `-created_at`, indexed with BRIN only, would sort the whole table
+    ordering = ("-id",)
     list_per_page = 50
     show_full_result_count = False
 
@@ -490,15 +525,16 @@ class WeatherAdmin(ImportExportModelAdmin):
 
     def fetch_weather_action(self, request, queryset=None):
         """Admin action to fetch current weather data."""
-        success, message = get_weather_data()
+        success, message, stored = get_weather_data()
 
         if success:
-            self.message_user(request, message, messages.SUCCESS)
+            self.message_user(request, message, messages.SUCCESS if stored else messages.INFO)
             logger.info(
                 "Weather data fetched successfully via admin action",
                 extra={
                     "user_id": request.user.id,
                     "username": request.user.username,
+                    "stored": stored,
                 },
             )
         else:
@@ -533,22 +569,17 @@ class WeatherAdmin(ImportExportModelAdmin):
     temperature_fahrenheit_display.short_description = "Temperature (F)"
 
     def delete_old_records(self, request, queryset):
-        """Delete weather records older than 30 days."""
-        from django.utils import timezone
-        from datetime import timedelta
-
-        if not queryset.exists():
-            queryset = self.get_queryset(request)
+        """
+        Delete weather records older than the retention period: the expired
+        monthly partitions are dropped, the rest is deleted in one statement.
+        """
+        created, removed, deleted = maintain_weather_partitions()
 
-        cutoff_date = timezone.now() - timedelta(days=30)
-        old_records = queryset.filter(created_at__lt=cutoff_date)
-        count = old_records.count()
-
-        if count > 0:
-            old_records.delete()
+        if removed or deleted:
             self.message_user(
                 request,
-                f"Successfully deleted {count} old weather records.",
+                f"Successfully dropped {len(removed)} monthly partitions and deleted "
+                f"{deleted} old weather records.",
                 messages.SUCCESS,
             )
             logger.info(
@@ -556,7 +587,8 @@ class WeatherAdmin(ImportExportModelAdmin):
                 extra={
                     "user_id": request.user.id,
                     "username": request.user.username,
-                    "count": count,
+                    "partitions": removed,
+                    "count": deleted,
                 },
             )
         else:
@@ -566,7 +598,9 @@ class WeatherAdmin(ImportExportModelAdmin):
                 messages.INFO,
             )
 
-    delete_old_records.short_description = "Delete records older than 30 days"
+    delete_old_records.short_description = (
+        f"Delete records older than {settings.WEATHER_RETENTION_DAYS} days"
+    )
 
     def get_actions(self, request):
         """Override to ensure actions are properly configured."""
@@ -599,3 +633,33 @@ class WeatherAdmin(ImportExportModelAdmin):
     def has_fetch_weather_permission(self, request):
         """Check if user has permission to fetch weather."""
         return request.user.has_perm("simple.change_weather")
+
+
+@admin.register(WeatherHourly, WeatherDaily)
+class WeatherRollupAdmin(ExportMixin, admin.ModelAdmin):
+    """Read-only admin of the weather rollups, maintained from the readings."""
+
+    list_display = (
+        "city_name",
+        "bucket",
+        "samples",
+        "temperature_min",
+        "temperature_avg",
+        "temperature_max",
+        "humidity_avg",
+        "pressure_avg",
+        "wind_speed_avg",
+        "weather_main",
+    )
+    list_filter = ("city_name", ("bucket", DateRangeFilter))
+    list_per_page = 50
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,30 @@
+from django.urls import reverse
+
+from simple.factories.author import AuthorFactory
+from simple.factories.book import BookFactory
+from simple.factories.category import MovieCategoryFactory
+
+
+def test_book_changelist_search_matches_related_author(admin_client):
+    tolstoy = AuthorFactory.create(first_name="Leo", last_name="Tolstoy")
+    chekhov = AuthorFactory.create(first_name="Anton", last_name="Chekhov")
+    war = BookFactory.create(author=tolstoy, title="War and Peace", slug="war-and-peace")
+    BookFactory.create(author=tolstoy, title="Resurrection", slug="resurrection")
+    BookFactory.create(author=chekhov, title="The Steppe", slug="the-steppe")
+
+    response = admin_client.get(reverse("admin:simple_book_changelist"), {"q": "tolstoy war"})
+
+    assert response.status_code == 200
+    assert list(response.context["cl"].result_list) == [war]
+
+
+def test_category_filter_autocomplete_from_snapshot(admin_client, django_assert_num_queries):
+    MovieCategoryFactory.create(name="Drama", slug="drama")
+    MovieCategoryFactory.create(name="Action", slug="action")
+    url = reverse("admin:simple_moviecategory_snapshot_autocomplete")
+    admin_client.get(url)
+
+    with django_assert_num_queries(2):  # session and user
+        results = admin_client.get(url, {"term": "dra"}).json()["results"]
+
+    assert [result["text"] for result in results] == ["Drama"]
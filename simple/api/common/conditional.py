@@ -0,0 +1,68 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET support (ETag / Last-Modified / 304) for API views.
+
+    The validators are computed from `max(updated_at)` and the row count of
+    the queryset behind the response, plus the request path, query string
+    and negotiated media type. When the client validators still match, a
+    304 response is returned before anything is serialized.
+    """
+
+    last_modified_field = "updated_at"
+
+    def get_not_modified_response(self, request, queryset, *related):
+        """
+        Return a 304 response when the client copy of the queryset
+        representation is still fresh, otherwise None.
+
+        `related` are the instances whose fields the representation embeds
+        (e.g. the author of a list of books): their `last_modified_field`
+        counts as well.
+        """
+        state = queryset.aggregate(
+            last_modified=Max(self.last_modified_field),
+            count=Count("pk"),
+        )
+        last_modified = state["last_modified"]
+        if last_modified is not None:
+            last_modified = max(
+                [last_modified, *(getattr(obj, self.last_modified_field) for obj in related)]
+            )
+        return self.evaluate_conditions(request, last_modified, state["count"])
+
+    def evaluate_conditions(self, request, last_modified, count):
+        """
+        Compute the validators of the response and check the request
+        preconditions against them.
+        """
+        self.conditional_headers = {}
+        if not count or last_modified is None:
+            return None
+
+        query = sorted(request.query_params.lists())
+        media_type = getattr(request, "accepted_media_type", "")
+        digest = hashlib.md5(
+            f"{request.path}|{query}|{media_type}|{last_modified.isoformat()}|{count}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        etag = quote_etag(digest)
+        timestamp = int(last_modified.timestamp())
+
+        self.conditional_headers = {"ETag": etag, "Last-Modified": http_date(timestamp)}
+        return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        headers = getattr(self, "conditional_headers", {})
+        if headers and response.status_code in (200, 304):
+            for header, value in headers.items():
+                response.headers.setdefault(header, value)
+            patch_vary_headers(response, ["Accept"])
+        return response
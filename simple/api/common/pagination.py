@@ -0,0 +1,307 @@
+import base64
+import binascii
+import json
+import operator
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor (keyset) pagination for the API list endpoints.
+
+    Pages are fetched by seeking on the queryset ordering columns
+    (model `Meta.ordering` plus the primary key as a tie-breaker) instead of
+    using OFFSET, so every page costs O(page size) no matter how deep it is.
+    The cursor encodes the ordering values of the boundary row of the page.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return a single page of rows for the cursor of the request.
+        """
+        self.request = request
+        self.limit = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        # Cursors are built from the ordering columns, keep them loaded
+        columns = [name.lstrip("-") for name in self.ordering]
+        names, defer = queryset.query.deferred_loading
+        values = queryset.query.values_select
+        if values:
+            missing = [name for name in columns if name not in values]
+            if missing:
+                queryset = queryset.values(*values, *missing)
+        elif names and not defer:
+            queryset = queryset.only(*names, *columns)
+
+        order_by = [self._invert(name) for name in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*order_by)
+        if position is not None:
+            seek = self.get_seek_filter(queryset.model, position, reverse)
+            queryset = queryset.filter(seek) if seek is not None else queryset.none()
+
+        return self._set_page(list(queryset[: self.limit + 1]), position, reverse)
+
+    def paginate_rows(self, rows, request, ordering, model):
+        """
+        Same as `paginate_queryset()` for `model` rows held in memory, by
+        `ordering` (with a unique last column).
+
+        The rows are sorted here with the comparisons the cursor is checked
+        with, so pages stay consistent whatever order the rows came in:
+        strings compare in code point order, which may differ from the
+        collation of the database. The page starts right after the cursor
+        row; when that row is gone, rows are compared to the cursor values.
+        """
+        self.request = request
+        self.limit = self.get_page_size(request)
+        self.ordering = list(ordering)
+        position, reverse = self.decode_cursor(request, model)
+
+        rows = list(rows)
+        for name in reversed(self.ordering):
+            # NULLs sort last, as in PostgreSQL, or first when descending
+            rows.sort(
+                key=lambda row: (
+                    self._row_value(row, name) is None,
+                    self._row_value(row, name),
+                ),
+                reverse=name.startswith("-"),
+            )
+        if reverse:
+            rows = rows[::-1]
+        if position is not None:
+            positions = [[self._row_value(row, name) for name in self.ordering] for row in rows]
+            if position in positions:
+                rows = rows[positions.index(position) + 1 :]
+            else:
+                rows = [row for row in rows if self._follows(row, position, reverse)]
+        return self._set_page(list(rows[: self.limit + 1]), position, reverse)
+
+    def _set_page(self, rows, position, reverse):
+        has_more = len(rows) > self.limit
+        rows = rows[: self.limit]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request):
+        """
+        Page size from the query string, capped by `max_page_size`.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """
+        Ordering columns of the queryset with the primary key appended
+        as a tie-breaker so that every row has a unique position.
+        """
+        opts = queryset.model._meta
+        ordering = list(queryset.query.order_by or opts.ordering)
+        ordering = [
+            name.replace("pk", opts.pk.name, 1) if name.lstrip("-") == "pk" else name
+            for name in ordering
+        ]
+        if opts.pk.name not in (name.lstrip("-") for name in ordering):
+            ordering.append(opts.pk.name)
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_seek_filter(self, model, position, reverse):
+        """
+        Build the keyset predicate selecting the rows after `position`.
+
+        For ordering (a, b, c) this is
+        `a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)`, with the
+        comparison flipped for descending columns and NULLs treated as larger
+        than any value, the way PostgreSQL sorts them.
+        Returns None when no row can follow the position.
+        """
+        conditions = []
+        equal = Q()
+        for name, value in zip(self.ordering, position):
+            field = model._meta.get_field(name.lstrip("-"))
+            greater = name.startswith("-") == reverse
+            beyond = self._beyond(field, value, greater)
+            if beyond is not None:
+                conditions.append(equal & beyond)
+            equal &= (
+                Q(**{f"{field.attname}__isnull": True})
+                if value is None
+                else Q(**{field.attname: value})
+            )
+        if not conditions:
+            return None
+        return reduce(operator.or_, conditions)
+
+    def encode_cursor(self, row, reverse):
+        position = self._position(row)
+        payload = json.dumps({"p": position, "r": reverse}, separators=(",", ":"))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """
+        Return `(position, reverse)` of the request cursor, with the values
+        converted to the types of the `model` ordering fields,
+        `(None, False)` for the first page.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            position, reverse = payload["p"], bool(payload["r"])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": f"http://api.example.org/items/?{self.cursor_query_param}=eyJwIjpb",
+                },
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": f"http://api.example.org/items/?{self.cursor_query_param}=eyJwIjpb",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results to return per page (max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    @staticmethod
+    def _beyond(field, value, greater):
+        """
+        Predicate for the values of `field` strictly beyond `value`.
+        """
+        if greater:
+            if value is None:
+                return None
+            beyond = Q(**{f"{field.attname}__gt": value})
+            if field.null:
+                beyond |= Q(**{f"{field.attname}__isnull": True})
+            return beyond
+        if value is None:
+            return Q(**{f"{field.attname}__isnull": False})
+        return Q(**{f"{field.attname}__lt": value})
+
+    def _position(self, row):
+        return [self._encode_value(self._row_value(row, name)) for name in self.ordering]
+
+    def _follows(self, row, position, reverse):
+        """
+        In-memory counterpart of `get_seek_filter()`.
+        """
+        for name, bound in zip(self.ordering, position):
+            value = self._row_value(row, name)
+            if value == bound:
+                continue
+            greater = name.startswith("-") == reverse
+            if value is None or bound is None:
+                return (value is None) == greater
+            return (value > bound) == greater
+        return False
+
+    @staticmethod
+    def _invert(name):
+        return name[1:] if name.startswith("-") else f"-{name}"
+
+    @staticmethod
+    def _row_value(row, name):
+        field_name = name.lstrip("-")
+        if isinstance(row, dict):
+            return row[field_name]
+        if not hasattr(row, "_meta"):
+            return getattr(row, field_name)
+        return getattr(row, row._meta.get_field(field_name).attname)
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
@@ -0,0 +1,90 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+LOOKUP_SEP = "__"
+
+
+def project_queryset(queryset, serializer):
+    """
+    Restrict a queryset to what a serializer reads.
+
+    The declared fields of the serializer (class or instance, `many=True`
+    included) and their `source` paths are resolved against the queryset
+    model: forward relations are joined with `select_related`, to-many
+    relations are prefetched and the loaded columns are limited with
+    `only()`. A source that is not a model field (a property or a method)
+    can read anything, so the model it belongs to is loaded in full, unless
+    the serializer lists what it reads in `projection_dependencies`, e.g.
+    `{"author.full_name": ("author.first_name", "author.last_name")}`.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+
+    plan = _ProjectionPlan()
+    _collect(plan, queryset.model, serializer, prefix="")
+
+    if plan.select_related:
+        queryset = queryset.select_related(*sorted(plan.select_related))
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(plan.prefetch_related))
+    if "" not in plan.full:
+        only = {
+            name
+            for name in plan.only
+            if not any(name.startswith(f"{path}{LOOKUP_SEP}") for path in plan.full)
+        }
+        queryset = queryset.only(*sorted(only | plan.select_related))
+    return queryset
+
+
+class _ProjectionPlan:
+    def __init__(self):
+        self.only = set()
+        self.select_related = set()
+        self.prefetch_related = set()
+        # Relation paths ("" for the root model) whose columns are all needed
+        self.full = set()
+
+
+def _collect(plan, model, serializer, prefix):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    dependencies = getattr(serializer, "projection_dependencies", {})
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            if isinstance(field, serializers.BaseSerializer):
+                _collect(plan, model, field, prefix)
+            else:
+                plan.full.add(prefix.rstrip(LOOKUP_SEP))
+            continue
+        for source in dependencies.get(field.source, (field.source,)):
+            _resolve(plan, model, source.split("."), prefix, field)
+
+
+def _resolve(plan, model, attrs, prefix, field):
+    name, rest = attrs[0], attrs[1:]
+    path = f"{prefix}{name}"
+    try:
+        model_field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        plan.full.add(prefix[: -len(LOOKUP_SEP)] if prefix else "")
+        return
+
+    if not model_field.is_relation:
+        plan.only.add(path)
+        return
+
+    related_model = model_field.related_model
+    if model_field.many_to_many or model_field.one_to_many:
+        plan.prefetch_related.add(path)
+        return
+
+    plan.only.add(path)
+    if rest:
+        plan.select_related.add(path)
+        _resolve(plan, related_model, rest, f"{path}{LOOKUP_SEP}", field)
+    elif isinstance(field, serializers.BaseSerializer):
+        plan.select_related.add(path)
+        _collect(plan, related_model, field, f"{path}{LOOKUP_SEP}")
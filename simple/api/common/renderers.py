@@ -0,0 +1,64 @@
+import datetime
+
+import msgpack
+import orjson
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_datetime_field = serializers.DateTimeField()
+_json_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Fallback encoder of the API renderers.
+
+    Datetimes are formatted like `serializers.DateTimeField` does, with
+    `REST_FRAMEWORK["DATETIME_FORMAT"]` in the current timezone, so raw
+    datetimes and serialized ones look the same. Everything else is handled
+    the way the DRF JSON encoder does it.
+    """
+    if isinstance(obj, datetime.datetime):
+        return _datetime_field.to_representation(obj)
+    return _json_encoder.default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Produces the same documents as `rest_framework.renderers.JSONRenderer`
+    in compact form: dates, times, UUIDs and numpy arrays are encoded
+    natively, datetimes go through `encode_default` to keep the configured
+    `DATETIME_FORMAT`.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=encode_default, option=self.options)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer for internal consumers of the large payloads.
+
+    Values are encoded like in the JSON renderer (datetimes as
+    `DATETIME_FORMAT` strings), only the container format differs.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
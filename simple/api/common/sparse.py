@@ -0,0 +1,65 @@
+from functools import lru_cache
+
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    description="Comma-separated names of the fields to return, e.g. `id,name`. All by default.",
+    required=False,
+)
+
+
+@lru_cache(maxsize=256)
+def sparse_serializer_class(serializer_class, names):
+    """
+    Subclass of `serializer_class` declaring only the fields in `names`,
+    in the declaration order of the serializer.
+    """
+    sparse = type(f"Sparse{serializer_class.__name__}", (serializer_class,), {})
+    sparse._declared_fields = {
+        name: field
+        for name, field in serializer_class._declared_fields.items()
+        if name in names
+    }
+    return sparse
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets (`?fields=id,name`) for API views.
+
+    The view `serializer_class` is swapped for the request with a subclass
+    declaring only the requested fields. Since the queryset projection
+    (`project_queryset`, `values()`) is derived from the serializer, the
+    columns of the fields left out are not fetched either.
+    """
+
+    fields_query_param = "fields"
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        names = self.get_requested_fields(request)
+        if names is not None:
+            self.serializer_class = sparse_serializer_class(self.serializer_class, names)
+
+    def get_requested_fields(self, request):
+        """
+        Names of the fields requested with `?fields=`, None for all of them.
+        """
+        value = request.query_params.get(self.fields_query_param, "")
+        names = frozenset(name.strip() for name in value.split(",") if name.strip())
+        if not names:
+            return None
+        unknown = names.difference(self.serializer_class._declared_fields)
+        if unknown:
+            raise ValidationError(
+                {self.fields_query_param: [f"Unknown fields: {', '.join(sorted(unknown))}."]}
+            )
+        return names
+
+    def trim_representation(self, data):
+        """Drop the fields that were not requested from a ready payload."""
+        return {name: data[name] for name in self.serializer_class._declared_fields}
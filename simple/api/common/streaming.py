@@ -0,0 +1,75 @@
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+from simple.api.common.renderers import ORJSONRenderer
+
+STREAM_PARAMETER = OpenApiParameter(
+    name="stream",
+    type=OpenApiTypes.BOOL,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Stream the whole collection as newline-delimited JSON instead of a page. "
+        "Same as sending `Accept: application/x-ndjson`."
+    ),
+    required=False,
+)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON renderer.
+
+    Collections are streamed by `NDJSONStreamMixin`; regular responses
+    (errors, single objects) are rendered as a single line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return ORJSONRenderer().render(data) + b"\n"
+
+
+class NDJSONStreamMixin:
+    """
+    Streaming NDJSON mode for list views.
+
+    When the client accepts `application/x-ndjson` (or passes `?stream=1`),
+    the view streams every row of the queryset, serialized one by one from
+    a chunked database iterator, instead of building the full list in memory.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    stream_query_param = "stream"
+    stream_chunk_size = 2000
+
+    def wants_stream(self, request):
+        """Check whether the request asks for the streaming mode."""
+        if isinstance(getattr(request, "accepted_renderer", None), NDJSONRenderer):
+            return True
+        return request.query_params.get(self.stream_query_param, "").lower() in (
+            "1",
+            "true",
+        )
+
+    def get_row_representation(self, serializer_class=None):
+        """Callable turning one queryset row into its primitive representation."""
+        return (serializer_class or self.serializer_class)().to_representation
+
+    def stream_response(self, queryset, serializer_class=None):
+        """
+        Build a streaming response serializing the queryset (or any
+        iterable of rows) row by row.
+        """
+        to_representation = self.get_row_representation(serializer_class)
+        renderer = ORJSONRenderer()
+        if isinstance(queryset, QuerySet):
+            queryset = queryset.iterator(chunk_size=self.stream_chunk_size)
+        lines = (renderer.render(to_representation(row)) + b"\n" for row in queryset)
+        return StreamingHttpResponse(lines, content_type=NDJSONRenderer.media_type)
@@ -0,0 +1,74 @@
+import base64
+import json
+from collections import namedtuple
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from simple.api.common.pagination import KeysetPagination
+from simple.factories.author import AuthorFactory
+from simple.models import Movie, MovieCategory
+
+Row = namedtuple("Row", ["rating", "id"])
+Category = namedtuple("Category", ["name", "id"])
+
+
+def cursor(position, reverse=False):
+    payload = json.dumps({"p": position, "r": reverse}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def test_rows_follow_a_gone_cursor_row_by_value():
+    rows = [Row(Decimal("9.5"), 1), Row(Decimal("10.5"), 2), Row(Decimal("11.0"), 3)]
+    request = Request(APIRequestFactory().get("/", {"cursor": cursor(["10.0", 4])}))
+
+    page = KeysetPagination().paginate_rows(rows, request, ["rating", "id"], Movie)
+
+    assert page == rows[1:]
+
+
+def test_rows_pages_follow_their_own_order():
+    # As sorted by a case-insensitive database collation
+    rows = [
+        Category("alpha", 3),
+        Category("Beta", 1),
+        Category("gamma", 2),
+        Category("Zeta", 4),
+    ]
+    pages, url = [], "/?page_size=1"
+    while url:
+        paginator = KeysetPagination()
+        request = Request(APIRequestFactory().get(url))
+        pages += paginator.paginate_rows(rows, request, ["name", "id"], MovieCategory)
+        url = paginator.get_next_link()
+
+    assert [row.name for row in pages] == ["Beta", "Zeta", "alpha", "gamma"]
+
+    # The cursor row is gone: the page goes on from its position
+    request = Request(APIRequestFactory().get("/", {"cursor": cursor(["Gamma", 9])}))
+    page = KeysetPagination().paginate_rows(rows, request, ["name", "id"], MovieCategory)
+    assert [row.name for row in page] == ["Zeta", "alpha", "gamma"]
+
+
+def test_rows_cursor_values_must_match_the_field_types():
+    request = Request(APIRequestFactory().get("/", {"cursor": cursor(["high", 4])}))
+
+    with pytest.raises(NotFound):
+        KeysetPagination().paginate_rows([], request, ["rating", "id"], Movie)
+
+
+@pytest.mark.parametrize(
+    "position",
+    [["not-a-date", "Book", 1], ["1912-01-01", "Book", "one"], ["1912-01-01", "Book", [1]]],
+)
+def test_invalid_cursor_values_are_not_found(client, db, position):
+    author = AuthorFactory.create(first_name="Ivan", last_name="Bunin")
+    url = reverse("library-api:author-books", kwargs={"author_id": author.id})
+
+    response = client.get(url, {"cursor": cursor(position)})
+
+    assert response.status_code == 404
@@ -0,0 +1,34 @@
+import datetime
+import json
+from decimal import Decimal
+
+import msgpack
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from simple.api.common.renderers import MessagePackRenderer, ORJSONRenderer
+from simple.factories.author import AuthorFactory
+
+
+def test_orjson_renderer_matches_drf_json_renderer():
+    data = {
+        "created_at": datetime.datetime(2024, 5, 1, 12, 0, tzinfo=datetime.timezone.utc),
+        "date": datetime.date(2024, 5, 1),
+        "price": Decimal("9.90"),
+        "names": ["Anna", "Ivan"],
+    }
+
+    expected = json.loads(JSONRenderer().render(data))
+    expected["created_at"] = "2024-05-01T12:00:00.000000Z"
+
+    assert json.loads(ORJSONRenderer().render(data)) == expected
+
+
+def test_author_list_negotiates_msgpack(client, db):
+    AuthorFactory.create(first_name="Anna", last_name="Akhmatova")
+    url = reverse("library-api:author-list")
+
+    response = client.get(url, HTTP_ACCEPT=MessagePackRenderer.media_type)
+
+    assert response["Content-Type"] == MessagePackRenderer.media_type
+    assert msgpack.unpackb(response.content) == client.get(url).json()
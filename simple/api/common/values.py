@@ -0,0 +1,113 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+
+from simple.api.common.projection import project_queryset
+
+LOOKUP_SEP = "__"
+
+# Serializer fields whose `to_representation` returns database values as is
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+)
+
+
+class ValuesRepresentation:
+    """
+    Serializer output built straight from `values()` rows.
+
+    Every field of a flat serializer must read a model column (relations
+    followed with dotted sources are fine). The rows are fetched as plain
+    dicts with exactly those columns, so no model instance is built, and
+    the representation only calls the serializer field converters that
+    actually change a value (dates, decimals ...).
+    """
+
+    def __init__(self, serializer_class, model):
+        self.columns = []
+        self.fields = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            column = self._column(model, field, serializer_class)
+            converter = None if type(field) in PASSTHROUGH_FIELDS else field.to_representation
+            self.columns.append(column)
+            self.fields.append((name, column, converter))
+
+    def values(self, queryset):
+        """Restrict the queryset to the serializer columns, rows as dicts."""
+        return queryset.values(*self.columns)
+
+    def to_representation(self, row):
+        data = {}
+        for name, column, converter in self.fields:
+            value = row[column]
+            data[name] = (
+                converter(value) if converter is not None and value is not None else value
+            )
+        return data
+
+    @staticmethod
+    def _column(model, field, serializer_class):
+        if isinstance(field, serializers.BaseSerializer) or field.source == "*":
+            raise ImproperlyConfigured(
+                f"{serializer_class.__name__}.{field.field_name} cannot be read from values()"
+            )
+        attrs = field.source.split(".")
+        for attr in attrs:
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or model_field.many_to_many or model_field.one_to_many:
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{field.field_name} source "
+                    f"{field.source!r} is not a model column"
+                )
+            model = model_field.related_model
+        return LOOKUP_SEP.join(attrs)
+
+
+@lru_cache(maxsize=None)
+def get_values_representation(serializer_class, model):
+    return ValuesRepresentation(serializer_class, model)
+
+
+class ValuesSerializationMixin:
+    """
+    Opt-in fast serialization path for read-only list views.
+
+    With `values_serialization = True` the view reads `values()` rows for
+    the columns of `serializer_class` and builds the same representation
+    the serializer would, without model instances or serializer instances
+    per row. Without it the queryset is projected and serialized as usual.
+    """
+
+    values_serialization = False
+    row_representation = None
+
+    def get_serialization_queryset(self, queryset):
+        """
+        Queryset restricted to what the response reads, rows as dicts on
+        the fast path and model instances otherwise.
+        """
+        if not self.values_serialization:
+            self.row_representation = None
+            return project_queryset(queryset, self.serializer_class)
+        representation = get_values_representation(self.serializer_class, queryset.model)
+        self.row_representation = representation.to_representation
+        return representation.values(queryset)
+
+    def serialize_rows(self, rows):
+        """Primitive representation of the rows of a page."""
+        if self.row_representation is None:
+            return self.serializer_class(rows, many=True).data
+        return [self.row_representation(row) for row in rows]
+
+    def get_row_representation(self, serializer_class=None):
+        if serializer_class is None and self.row_representation is not None:
+            return self.row_representation
+        return super().get_row_representation(serializer_class)
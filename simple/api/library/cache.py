@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from simple.api.common.projection import project_queryset
+from simple.api.library.serializers.root import AuthorFieldsSerializer
+from simple.models.models import Author
+
+AUTHOR_CACHE_TIMEOUT = 60 * 60
+
+
+def author_cache_key(author_id):
+    """Cache key of the serialized author payload."""
+    return f"library:author:{author_id}"
+
+
+def get_author_payload(author_id):
+    """
+    Read-through cache of the `AuthorFieldsSerializer` payload.
+
+    Returns None when the author does not exist.
+    """
+    key = author_cache_key(author_id)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    authors = project_queryset(Author.objects.filter(pk=author_id), AuthorFieldsSerializer)
+    author = authors.first()
+    if author is None:
+        return None
+    payload = dict(AuthorFieldsSerializer(author).data)
+    cache.set(key, payload, AUTHOR_CACHE_TIMEOUT)
+    return payload
+
+
+def get_author_payloads(author_ids):
+    """
+    Multi-get variant of `get_author_payload`.
+
+    Cached payloads are read in one cache round trip and the misses are
+    loaded with a single `id__in` query. Returns a dict of payloads by id,
+    unknown ids are left out.
+    """
+    keys = {author_cache_key(author_id): author_id for author_id in author_ids}
+    payloads = {keys[key]: payload for key, payload in cache.get_many(keys).items()}
+
+    missing = [author_id for author_id in author_ids if author_id not in payloads]
+    if missing:
+        authors = project_queryset(
+            Author.objects.filter(pk__in=missing), AuthorFieldsSerializer
+        )
+        loaded = {author.pk: dict(AuthorFieldsSerializer(author).data) for author in authors}
+        cache.set_many(
+            {author_cache_key(author_id): payload for author_id, payload in loaded.items()},
+            AUTHOR_CACHE_TIMEOUT,
+        )
+        payloads.update(loaded)
+    return payloads
+
+
+def invalidate_authors(author_ids):
+    """
+    Drop the cached payloads of the given authors.
+
+    The entries are dropped right away and once more after the current
+    transaction commits, so that a concurrent read of the old row cannot
+    leave a stale payload behind.
+    """
+    keys = [author_cache_key(author_id) for author_id in author_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
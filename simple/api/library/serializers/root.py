@@ -20,7 +20,16 @@ class AuthorFieldsSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField()
 
 
+class AuthorBatchSerializer(serializers.Serializer):
+    results = AuthorFieldsSerializer(many=True)
+    missing = serializers.ListField(child=serializers.IntegerField())
+
+
 class BookSerializer(serializers.Serializer):
+    projection_dependencies = {
+        "author.full_name": ("author.first_name", "author.last_name"),
+    }
+
     id = serializers.IntegerField()
     title = serializers.CharField()
     original_title = serializers.CharField(required=False, allow_blank=True)
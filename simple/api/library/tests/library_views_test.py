@@ -0,0 +1,195 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+
+from simple.factories.author import AuthorFactory
+from simple.factories.book import BookFactory
+from simple.models.models import Author, Book
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def authors(db):
+    names = [("Anna", "Akhmatova"), ("Ivan", "Bunin"), ("Anton", "Chekhov"), ("Ivan", "Bunin")]
+    return [AuthorFactory.create(first_name=first, last_name=last) for first, last in names]
+
+
+def test_author_list_keyset_pages(client, authors):
+    url = reverse("library-api:author-list")
+
+    first = client.get(url, {"page_size": 2}).json()
+    assert [a["last_name"] for a in first["results"]] == ["Akhmatova", "Bunin"]
+    assert first["previous"] is None
+
+    second = client.get(first["next"]).json()
+    assert [a["last_name"] for a in second["results"]] == ["Bunin", "Chekhov"]
+    assert second["next"] is None
+
+    back = client.get(second["previous"]).json()
+    assert back["results"] == first["results"]
+
+
+def test_author_list_invalid_cursor(client, authors):
+    response = client.get(reverse("library-api:author-list"), {"cursor": "garbage"})
+    assert response.status_code == 404
+
+
+def test_author_books_keyset_pages_with_null_dates(client, authors):
+    author = authors[0]
+    for index, published in enumerate(["1912-01-01", None, "1940-01-01", None]):
+        BookFactory.create(
+            author=author,
+            title=f"Book {index}",
+            slug=f"book-{index}",
+            publication_date=published,
+            page_count=100,
+        )
+    url = reverse("library-api:author-books", kwargs={"author_id": author.id})
+
+    titles, page = [], client.get(url, {"page_size": 1}).json()
+    while True:
+        titles += [book["title"] for book in page["results"]]
+        if not page["next"]:
+            break
+        page = client.get(page["next"]).json()
+
+    assert titles == ["Book 1", "Book 3", "Book 2", "Book 0"]
+
+
+@pytest.mark.parametrize(
+    "params, headers",
+    [({"stream": "1"}, {}), ({}, {"HTTP_ACCEPT": "application/x-ndjson"})],
+)
+def test_author_list_ndjson_stream(client, authors, params, headers):
+    response = client.get(reverse("library-api:author-list"), params, **headers)
+
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["last_name"] for line in lines] == [
+        "Akhmatova",
+        "Bunin",
+        "Bunin",
+        "Chekhov",
+    ]
+
+
+def test_author_books_fixed_query_count(client, authors, django_assert_num_queries):
+    author = authors[0]
+    for index in range(5):
+        BookFactory.create(
+            author=author,
+            title=f"Book {index}",
+            slug=f"book-{index}",
+            page_count=100,
+        )
+    url = reverse("library-api:author-books", kwargs={"author_id": author.id})
+
+    with django_assert_num_queries(3) as context:
+        response = client.get(url)
+
+    assert {book["author_name"] for book in response.json()["results"]} == {"Anna Akhmatova"}
+    books_query = context.captured_queries[-1]["sql"]
+    assert "INNER JOIN" in books_query
+    assert '"simple_author"."biography"' not in books_query
+
+
+def test_author_books_conditional_get_follows_author_and_bulk_updates(client, authors):
+    author = authors[0]
+    book = BookFactory.create(author=author, title="Book", slug="book", page_count=100)
+    url = reverse("library-api:author-books", kwargs={"author_id": author.id})
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    author.last_name = "Gorenko"
+    author.save()
+    renamed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert renamed.status_code == 200
+    assert renamed.json()["results"][0]["author_name"].endswith("Gorenko")
+
+    Book.objects.filter(pk=book.pk).update(page_count=200)
+    assert client.get(url, HTTP_IF_NONE_MATCH=renamed["ETag"]).status_code == 200
+
+
+def test_author_detail_conditional_get(client, authors):
+    author = authors[0]
+    url = reverse("library-api:author-detail", kwargs={"id": author.id})
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code == 304
+
+    author.nationality = "Russian"
+    author.save()
+    changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+
+
+def test_author_detail_read_through_cache(
+    client, authors, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    author = authors[0]
+    url = reverse("library-api:author-detail", kwargs={"id": author.id})
+    assert client.get(url).json()["nationality"] == ""
+
+    with django_assert_num_queries(0):
+        assert client.get(url).status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Author.objects.filter(pk=author.pk).update(nationality="Russian")
+    assert client.get(url).json()["nationality"] == "Russian"
+
+    author.refresh_from_db()
+    author.delete()
+    assert client.get(url).status_code == 404
+
+
+def test_author_batch(client, authors, django_assert_num_queries):
+    url = reverse("library-api:author-batch")
+    cached = authors[1]
+    client.get(reverse("library-api:author-detail", kwargs={"id": cached.id}))
+    ids = [authors[2].id, cached.id, 999999, authors[2].id]
+
+    with django_assert_num_queries(1):
+        response = client.get(url, {"ids": ",".join(map(str, ids))})
+
+    assert response.status_code == 200
+    assert [author["id"] for author in response.json()["results"]] == [authors[2].id, cached.id]
+    assert response.json()["missing"] == [999999]
+    assert client.get(url, {"ids": "1,x"}).status_code == 400
+    assert client.get(url, {"ids": ",".join(map(str, range(1, 102)))}).status_code == 400
+
+
+def test_sparse_fieldsets(client, authors, django_assert_num_queries):
+    author = authors[0]
+    BookFactory.create(author=author, title="Evening", slug="evening", page_count=100)
+
+    detail = client.get(
+        reverse("library-api:author-detail", kwargs={"id": author.id}),
+        {"fields": "id,nationality,first_name"},
+    )
+    assert detail.json() == {
+        "id": author.id,
+        "first_name": "Anna",
+        "nationality": author.nationality,
+    }
+
+    url = reverse("library-api:author-books", kwargs={"author_id": author.id})
+    with django_assert_num_queries(3) as context:
+        books = client.get(url, {"fields": "id,title"}).json()["results"]
+    assert [set(book) for book in books] == [{"id", "title"}]
+    books_query = context.captured_queries[-1]["sql"]
+    assert '"simple_book"."description"' not in books_query
+    assert "JOIN" not in books_query
+
+    assert client.get(url, {"fields": "id,synopsis"}).status_code == 400
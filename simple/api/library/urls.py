@@ -2,6 +2,7 @@ from django.urls import re_path, include
 from rest_framework import routers
 from simple.api.library.views.root import (
     AuthorListView,
+    AuthorBatchView,
     AuthorByIdView,
     AuthorBooksView,
 )
@@ -10,6 +11,7 @@ router = routers.DefaultRouter()
 
 urlpatterns = [
     re_path(r"^author/$", AuthorListView.as_view(), name="author-list"),
+    re_path(r"^author/batch/$", AuthorBatchView.as_view(), name="author-batch"),
     re_path(r"^author/(?P<id>\d+)/$", AuthorByIdView.as_view(), name="author-detail"),
     re_path(
         r"^author/(?P<author_id>\d+)/books/$",
@@ -1,25 +1,36 @@
+from django.utils.dateparse import parse_datetime
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
 from rest_framework import status
 from rest_framework.parsers import FormParser, JSONParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from simple.api.common.conditional import ConditionalGetMixin
+from simple.api.common.pagination import KeysetPagination
+from simple.api.common.projection import project_queryset
+from simple.api.common.sparse import FIELDS_PARAMETER, SparseFieldsMixin
+from simple.api.common.streaming import STREAM_PARAMETER, NDJSONStreamMixin
+from simple.api.common.values import ValuesSerializationMixin
+from simple.api.library.cache import get_author_payload, get_author_payloads
 from simple.models.models import Author
 from simple.models.models import Book
 from simple.api.library.serializers.root import (
     AuthorSerializer,
+    AuthorBatchSerializer,
     AuthorFieldsSerializer,
     BookSerializer,
 )
 
 
-class AuthorListView(APIView):
+class AuthorListView(ValuesSerializationMixin, NDJSONStreamMixin, APIView):
     """
     API endpoint for authors
     """
 
     serializer_class = AuthorSerializer
     parser_classes = [JSONParser, FormParser]
+    pagination_class = KeysetPagination
+    values_serialization = True
 
     @extend_schema(
         methods=["GET"],
@@ -27,17 +38,21 @@ class AuthorListView(APIView):
         description="Get all authors",
         tags=["Authors"],
         responses=AuthorSerializer(many=True),
+        parameters=[STREAM_PARAMETER],
     )
     def get(self, request):
         """
-        Get all authors with basic information
+        Get a page of authors with basic information
         """
-        authors = Author.objects.all()
-        serializer = self.serializer_class(authors, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        authors = self.get_serialization_queryset(Author.objects.all())
+        if self.wants_stream(request):
+            return self.stream_response(authors)
+        paginator = self.pagination_class()
+        authors = paginator.paginate_queryset(authors, request, view=self)
+        return paginator.get_paginated_response(self.serialize_rows(authors))
 
 
-class AuthorByIdView(APIView):
+class AuthorByIdView(SparseFieldsMixin, ConditionalGetMixin, APIView):
     """
     Retrieve an author by its ID with all fields.
     """
@@ -62,30 +77,98 @@ class AuthorByIdView(APIView):
                 description="ID of the author",
                 required=True,
             ),
+            FIELDS_PARAMETER,
         ],
     )
     def get(self, request, id):
         """
         Get all fields of an author by ID
         """
-        try:
-            author = Author.objects.get(pk=id)
-            serializer = AuthorFieldsSerializer(author)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Author.DoesNotExist:
+        payload = get_author_payload(id)
+        if payload is None:
             return Response(
                 {"detail": "Author not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        not_modified = self.evaluate_conditions(
+            request, parse_datetime(payload["updated_at"]), count=1
+        )
+        if not_modified:
+            return not_modified
+        return Response(self.trim_representation(payload), status=status.HTTP_200_OK)
+
+
+class AuthorBatchView(APIView):
+    """
+    Retrieve several authors by their IDs in a single request.
+    """
+
+    serializer_class = AuthorBatchSerializer
+    parser_classes = [JSONParser, FormParser]
+    max_ids = 100
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="author-batch-handler",
+        description="Get all fields of several authors by comma-separated IDs",
+        tags=["Authors"],
+        responses={
+            200: AuthorBatchSerializer,
+            400: OpenApiTypes.OBJECT,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Comma-separated IDs of the authors (up to 100)",
+                required=True,
+            ),
+        ],
+    )
+    def get(self, request):
+        """
+        Get all fields of the requested authors, reporting unknown IDs
+        """
+        try:
+            ids = [
+                int(value) for value in request.query_params.get("ids", "").split(",") if value
+            ]
+        except ValueError:
+            return Response(
+                {"detail": "ids must be a comma-separated list of integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return Response(
+                {"detail": "ids is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > self.max_ids:
+            return Response(
+                {"detail": f"No more than {self.max_ids} ids are allowed."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        payloads = get_author_payloads(ids)
+        return Response(
+            {
+                "results": [payloads[author_id] for author_id in ids if author_id in payloads],
+                "missing": [author_id for author_id in ids if author_id not in payloads],
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
-class AuthorBooksView(APIView):
+class AuthorBooksView(SparseFieldsMixin, ConditionalGetMixin, NDJSONStreamMixin, APIView):
     """
     Retrieve all books of an author by author ID.
     """
 
     serializer_class = BookSerializer
     parser_classes = [JSONParser, FormParser]
+    pagination_class = KeysetPagination
 
     @extend_schema(
         methods=["GET"],
@@ -104,17 +187,28 @@ class AuthorBooksView(APIView):
                 description="ID of the author",
                 required=True,
             ),
+            STREAM_PARAMETER,
+            FIELDS_PARAMETER,
         ],
     )
     def get(self, request, author_id):
         """
-        Get all books of an author by author ID
+        Get a page of books of an author by author ID
         """
         try:
-            author = Author.objects.get(pk=author_id)
+            author = Author.objects.only("id", "updated_at").get(pk=author_id)
             books = Book.objects.filter(author=author)
+            # The books embed the author name
+            not_modified = self.get_not_modified_response(request, books, author)
+            if not_modified:
+                return not_modified
+            books = project_queryset(books, self.serializer_class)
+            if self.wants_stream(request):
+                return self.stream_response(books)
+            paginator = self.pagination_class()
+            books = paginator.paginate_queryset(books, request, view=self)
             serializer = self.serializer_class(books, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return paginator.get_paginated_response(serializer.data)
         except Author.DoesNotExist:
             return Response(
                 {"detail": "Author not found."},
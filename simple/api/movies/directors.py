@@ -0,0 +1,50 @@
+from django.utils.text import slugify
+
+from simple.models.common import split_names
+from simple.models.models import Director, Movie
+
+
+def director_slug(name):
+    """Slug identifying a director, the same for every spelling of the name case."""
+    return slugify(name, allow_unicode=True)[:255]
+
+
+def sync_movie_directors(movies):
+    """
+    Link `(id, director)` movie rows to the directors named in `director`,
+    creating the missing ones, and unlink the directors no longer named.
+    """
+    names = {
+        movie_id: {director_slug(name): name for name in split_names(director)}
+        for movie_id, director in movies
+    }
+    for slugs in names.values():
+        slugs.pop("", None)
+    directors = {slug: name for slugs in names.values() for slug, name in slugs.items()}
+    Director.objects.bulk_create(
+        [Director(name=name, slug=slug) for slug, name in directors.items()],
+        ignore_conflicts=True,
+    )
+    director_ids = dict(Director.objects.filter(slug__in=directors).values_list("slug", "pk"))
+
+    wanted = {
+        (movie_id, director_ids[slug]) for movie_id, slugs in names.items() for slug in slugs
+    }
+    through = Movie.directors.through
+    linked = {
+        (movie_id, director_id): pk
+        for pk, movie_id, director_id in through.objects.filter(movie_id__in=names).values_list(
+            "pk", "movie_id", "director_id"
+        )
+    }
+    stale = [pk for pair, pk in linked.items() if pair not in wanted]
+    if stale:
+        through.objects.filter(pk__in=stale).delete()
+    through.objects.bulk_create(
+        [
+            through(movie_id=movie_id, director_id=director_id)
+            for movie_id, director_id in wanted
+            if (movie_id, director_id) not in linked
+        ],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,72 @@
+import django_filters
+from django.db.models import Count
+from django.db.models.functions import Floor
+
+from simple.api.movies.snapshot import get_category_snapshot
+from simple.models import Movie
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    pass
+
+
+class MovieFilter(django_filters.FilterSet):
+    """
+    Filters of the movie browse endpoint.
+
+    Ranges take `<name>_min`/`<name>_max` (`release_date_after`/
+    `release_date_before` for dates), `category` a comma-separated list of ids.
+    """
+
+    category = NumberInFilter(
+        field_name="category_id", help_text="Comma-separated category ids"
+    )
+    rating = django_filters.RangeFilter()
+    release_date = django_filters.DateFromToRangeFilter()
+    duration_minutes = django_filters.RangeFilter()
+    is_active = django_filters.BooleanFilter()
+
+    class Meta:
+        model = Movie
+        fields = ["category", "rating", "release_date", "duration_minutes", "is_active"]
+
+
+def get_movie_facets(queryset):
+    """
+    Facet counts of the filtered movies per category and per rating bucket
+    (`rating` is the floor of the bucket, `None` for unrated movies).
+
+    Both facets come from a single query grouped by (category, bucket),
+    folded here; category names are read from the category snapshot.
+    """
+    groups = (
+        queryset.order_by()
+        .values("category_id", rating_bucket=Floor("rating"))
+        .annotate(count=Count("pk"))
+    )
+    categories = {}
+    ratings = {}
+    for group in groups:
+        category_id, bucket = group["category_id"], group["rating_bucket"]
+        categories[category_id] = categories.get(category_id, 0) + group["count"]
+        bucket = None if bucket is None else int(bucket)
+        ratings[bucket] = ratings.get(bucket, 0) + group["count"]
+
+    by_id = get_category_snapshot().by_id
+    return {
+        "category": sorted(
+            (
+                {
+                    "id": category_id,
+                    "name": by_id[category_id].name if category_id in by_id else None,
+                    "count": count,
+                }
+                for category_id, count in categories.items()
+            ),
+            key=lambda facet: (-facet["count"], facet["id"]),
+        ),
+        "rating": sorted(
+            ({"rating": bucket, "count": count} for bucket, count in ratings.items()),
+            key=lambda facet: (facet["rating"] is None, facet["rating"] or 0),
+        ),
+    }
@@ -0,0 +1,316 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from functools import cache
+
+import redis
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from simple.models import Movie
+
+logger = logging.getLogger(__name__)
+
+# Width of the zero-padded parts of queue members
+RELEASE_KEY_WIDTH = len(str(date.max.toordinal()))
+PK_WIDTH = 20
+REBUILD_LOCK_KEY = "movies:ready:rebuild"
+REBUILD_LOCK_TIMEOUT = 30
+# Seconds before ids popped by a claim that never completed are queued again
+CLAIM_TIMEOUT = 60
+
+
+class ReadyQueueError(Exception):
+    """The ready queue backend is unavailable."""
+
+
+def queue_member(pk, release_date, title):
+    """
+    Queue member of a movie. All members share the same score, so they pop
+    in lexicographic order, which encodes the claim order of
+    `MovieQuerySet.claim_active()`: the newest release first (missing dates
+    first, like NULLs in `ORDER BY release_date DESC`), then the title
+    compared bytewise (`COLLATE "C"`) and the primary key.
+    """
+    if release_date is None:
+        release = 0
+    else:
+        release = date.max.toordinal() + 1 - release_date.toordinal()
+    return f"{release:0{RELEASE_KEY_WIDTH}d}\x00{title}\x00{pk:0{PK_WIDTH}d}"
+
+
+def member_pk(member):
+    """Primary key of the movie of a queue member."""
+    if isinstance(member, bytes):
+        member = member.decode()
+    return int(member.rsplit("\x00", 1)[1])
+
+
+class RedisReadyQueue:
+    """
+    Ready queue of active movies in a Redis sorted set of `queue_member()`
+    members, with a hash of the member of each movie id.
+
+    `pop()` moves the members to a pending sorted set scored by a claim
+    deadline in a single script, so concurrent consumers never get the same
+    id, and ids of claims that never complete are queued again by the next
+    `pop()` after the deadline.
+    """
+
+    POP_SCRIPT = """
+        for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[2])) do
+            redis.call('ZADD', KEYS[1], 0, member)
+        end
+        redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[2])
+        local members = {}
+        local popped = redis.call('ZPOPMIN', KEYS[1], ARGV[1])
+        for index = 1, #popped, 2 do
+            redis.call('ZADD', KEYS[3], ARGV[3], popped[index])
+            members[#members + 1] = popped[index]
+        end
+        return members
+    """
+    ADD_SCRIPT = """
+        for index = 1, #ARGV, 2 do
+            local previous = redis.call('HGET', KEYS[2], ARGV[index])
+            if previous and previous ~= ARGV[index + 1] then
+                redis.call('ZREM', KEYS[1], previous)
+                redis.call('ZREM', KEYS[3], previous)
+            end
+            redis.call('HSET', KEYS[2], ARGV[index], ARGV[index + 1])
+            if not redis.call('ZSCORE', KEYS[3], ARGV[index + 1]) then
+                redis.call('ZADD', KEYS[1], 0, ARGV[index + 1])
+            end
+        end
+    """
+    REMOVE_SCRIPT = """
+        for _, pk in ipairs(ARGV) do
+            local member = redis.call('HGET', KEYS[2], pk)
+            if member then
+                redis.call('ZREM', KEYS[1], member)
+                redis.call('ZREM', KEYS[3], member)
+                redis.call('HDEL', KEYS[2], pk)
+            end
+        end
+    """
+    REQUEUE_SCRIPT = """
+        for _, pk in ipairs(ARGV) do
+            local member = redis.call('HGET', KEYS[2], pk)
+            if member and redis.call('ZREM', KEYS[3], member) == 1 then
+                redis.call('ZADD', KEYS[1], 0, member)
+            end
+        end
+    """
+
+    def __init__(self, location, key):
+        self.client = redis.Redis.from_url(location)
+        self.key = key
+        self.keys = [key, f"{key}:members", f"{key}:pending"]
+        self.pop_script = self.client.register_script(self.POP_SCRIPT)
+        self.add_script = self.client.register_script(self.ADD_SCRIPT)
+        self.remove_script = self.client.register_script(self.REMOVE_SCRIPT)
+        self.requeue_script = self.client.register_script(self.REQUEUE_SCRIPT)
+
+    def add(self, items):
+        if items:
+            with self._errors():
+                self.add_script(
+                    keys=self.keys, args=[value for item in items.items() for value in item]
+                )
+
+    def remove(self, ids):
+        if ids:
+            with self._errors():
+                self.remove_script(keys=self.keys, args=list(ids))
+
+    def pop(self, count):
+        now = time.time()
+        with self._errors():
+            members = self.pop_script(keys=self.keys, args=[count, now, now + CLAIM_TIMEOUT])
+        return [member_pk(member) for member in members]
+
+    def requeue(self, ids):
+        if ids:
+            with self._errors():
+                self.requeue_script(keys=self.keys, args=list(ids))
+
+    def replace(self, items):
+        with self._errors():
+            pipeline = self.client.pipeline(transaction=True)
+            pipeline.delete(*self.keys)
+            if items:
+                pipeline.hset(self.keys[1], mapping=items)
+                pipeline.zadd(self.key, dict.fromkeys(items.values(), 0))
+            pipeline.execute()
+
+    @contextmanager
+    def _errors(self):
+        try:
+            yield
+        except redis.RedisError as ex:
+            raise ReadyQueueError(str(ex)) from ex
+
+
+class LocalReadyQueue:
+    """
+    Process-local stand-in of `RedisReadyQueue` for development and tests.
+    """
+
+    def __init__(self, location=None, key=None):
+        self.items = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def add(self, items):
+        with self.lock:
+            for movie_id, member in items.items():
+                if self.pending.get(movie_id, (member,))[0] != member:
+                    del self.pending[movie_id]
+                if movie_id not in self.pending:
+                    self.items[movie_id] = member
+
+    def remove(self, ids):
+        with self.lock:
+            for movie_id in ids:
+                self.items.pop(movie_id, None)
+                self.pending.pop(movie_id, None)
+
+    def pop(self, count):
+        now = time.time()
+        with self.lock:
+            for movie_id, (member, deadline) in list(self.pending.items()):
+                if deadline <= now:
+                    self.items[movie_id] = member
+                    del self.pending[movie_id]
+            ids = sorted(self.items, key=self.items.get)[:count]
+            for movie_id in ids:
+                self.pending[movie_id] = (self.items.pop(movie_id), now + CLAIM_TIMEOUT)
+            return ids
+
+    def requeue(self, ids):
+        with self.lock:
+            for movie_id in ids:
+                if movie_id in self.pending:
+                    self.items[movie_id] = self.pending.pop(movie_id)[0]
+
+    def replace(self, items):
+        with self.lock:
+            self.items = dict(items)
+            self.pending = {}
+
+
+@cache
+def get_ready_queue():
+    """The ready queue configured in `settings.MOVIE_READY_QUEUE`."""
+    config = settings.MOVIE_READY_QUEUE
+    return import_string(config["BACKEND"])(config.get("LOCATION"), config.get("KEY"))
+
+
+def enqueue_movies(movies):
+    """
+    Queue the active ones of `(id, is_active, release_date, title)` rows and
+    drop the others, once the current transaction commits.
+    """
+    items = {
+        pk: queue_member(pk, release_date, title)
+        for pk, is_active, release_date, title in movies
+        if is_active
+    }
+    inactive = [pk for pk, is_active, release_date, title in movies if not is_active]
+    transaction.on_commit(lambda: _sync(items, inactive))
+
+
+def dequeue_movies(ids):
+    """Drop movies from the queue once the current transaction commits."""
+    transaction.on_commit(lambda: _sync({}, ids))
+
+
+def refresh_movies(ids):
+    """Re-read movies from the database and queue or drop them accordingly."""
+    rows = {
+        pk: (pk, is_active, release_date, title)
+        for pk, is_active, release_date, title in Movie.objects.filter(pk__in=ids).values_list(
+            "pk", "is_active", "release_date", "title"
+        )
+    }
+    enqueue_movies([rows.get(pk, (pk, False, None, "")) for pk in ids])
+
+
+def rebuild_ready_queue():
+    """
+    Replace the queue content with the active movies of the database.
+
+    Rebuilds are throttled to one per `REBUILD_LOCK_TIMEOUT` seconds.
+    """
+    if not django_cache.add(REBUILD_LOCK_KEY, 1, REBUILD_LOCK_TIMEOUT):
+        return
+    items = {
+        pk: queue_member(pk, release_date, title)
+        for pk, release_date, title in Movie.objects.filter(is_active=True).values_list(
+            "pk", "release_date", "title"
+        )
+    }
+    try:
+        get_ready_queue().replace(items)
+    except ReadyQueueError:
+        logger.warning("Movie ready queue rebuild failed", exc_info=True)
+
+
+def claim_movies(count):
+    """
+    Claim up to `count` active movies, popping their ids from the ready queue.
+
+    The popped movies are deactivated by primary key; the database stays the
+    source of truth, so ids that went stale are skipped. Popped ids that were
+    not claimed are queued again while their movie is still active, e.g.
+    locked by a concurrent claim that may roll back.
+
+    When the queue is unavailable, dry or has drifted, the rest is claimed
+    from the database, and the queue is rebuilt when that found movies.
+    """
+    queue = get_ready_queue()
+    try:
+        ids = queue.pop(count)
+    except ReadyQueueError:
+        logger.warning("Movie ready queue unavailable, claiming from database", exc_info=True)
+        return Movie.objects.claim_active(count)
+
+    try:
+        movies = Movie.objects.claim_ids(ids) if ids else []
+    except Exception:
+        _release(queue, ids)
+        raise
+    skipped = set(ids).difference(movie.pk for movie in movies)
+    if skipped:
+        active = set(
+            Movie.objects.filter(pk__in=skipped, is_active=True).values_list("pk", flat=True)
+        )
+        _release(queue, active, skipped - active)
+    if len(movies) < count:
+        rest = Movie.objects.claim_active(count - len(movies))
+        if rest:
+            rebuild_ready_queue()
+        movies += rest
+    return movies
+
+
+def _release(queue, requeued, dropped=()):
+    """Queue popped ids again and drop others; claimed ids are dropped on sync."""
+    try:
+        queue.requeue(requeued)
+        queue.remove(dropped)
+    except ReadyQueueError:
+        logger.warning("Movie ready queue update failed", exc_info=True)
+
+
+def _sync(items, inactive):
+    queue = get_ready_queue()
+    try:
+        queue.add(items)
+        queue.remove(inactive)
+    except ReadyQueueError:
+        logger.warning("Movie ready queue update failed", exc_info=True)
@@ -19,3 +19,32 @@ class MovieSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     title = serializers.CharField(max_length=255)
     description = serializers.CharField()
+
+
+class MovieListSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField(max_length=255)
+    slug = serializers.CharField(max_length=255)
+    release_date = serializers.DateField()
+    duration_minutes = serializers.IntegerField()
+    rating = serializers.DecimalField(max_digits=3, decimal_places=1)
+    category = serializers.IntegerField(source="category_id")
+    is_active = serializers.BooleanField()
+
+
+class TopMovieSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField(max_length=255)
+    slug = serializers.CharField(max_length=255)
+    release_date = serializers.DateField()
+    rating = serializers.DecimalField(max_digits=3, decimal_places=1)
+
+
+class TopMoviesCategorySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField(max_length=100)
+    movies = TopMovieSerializer(many=True)
+
+
+class SimilarMovieSerializer(MovieListSerializer):
+    score = serializers.FloatField()
@@ -0,0 +1,264 @@
+import zlib
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from simple.models.common import split_names
+from simple.models.models import Movie, MovieSimilarity
+
+SIMILAR_MOVIES_COUNT = 20
+DIRECTOR_BUCKETS = 64
+# Relative weight of each group of features in the similarity
+FEATURE_WEIGHTS = {
+    "category": 1.0,
+    "director": 1.0,
+    "rating": 0.5,
+    "duration": 0.25,
+    "year": 0.5,
+}
+# Movie fields the features are built from
+SIMILARITY_FIELDS = {
+    "category",
+    "category_id",
+    "rating",
+    "duration_minutes",
+    "release_date",
+    "director",
+}
+# Cells of the similarity matrix computed at once (64 MB of float32)
+CHUNK_CELLS = 1 << 24
+
+
+def director_tokens(director):
+    """Normalized names of the directors listed in a `director` value."""
+    return {name.lower() for name in split_names(director)}
+
+
+class FeatureMatrix:
+    """
+    Feature vectors of the whole catalogue, one L2-normalized row per movie,
+    so that the dot product of two rows is their cosine similarity.
+
+    The features are the category (one-hot), the director names (hashed
+    into `DIRECTOR_BUCKETS` columns), and the standardized rating, duration
+    and release year (missing values count as the catalogue mean).
+    """
+
+    def __init__(self, ids, vectors):
+        self.ids = ids
+        self.vectors = vectors
+        self.index = {movie_id: row for row, movie_id in enumerate(ids.tolist())}
+
+    @classmethod
+    def build(cls):
+        movies = Movie._base_manager.order_by("pk").values_list(
+            "pk", "category_id", "rating", "duration_minutes", "release_date", "director"
+        )
+        ids, categories, ratings, durations, release_dates, directors = (
+            zip(*movies) if movies else ((),) * 6
+        )
+        ids = np.array(ids, dtype=np.int64)
+        blocks = [
+            (_one_hot(categories), FEATURE_WEIGHTS["category"]),
+            (_director_block(directors), FEATURE_WEIGHTS["director"]),
+            (_standardized(ratings), FEATURE_WEIGHTS["rating"]),
+            (_standardized(durations), FEATURE_WEIGHTS["duration"]),
+            (
+                _standardized([value and value.year for value in release_dates]),
+                FEATURE_WEIGHTS["year"],
+            ),
+        ]
+        vectors = np.hstack([block * weight for block, weight in blocks]).astype(np.float32)
+        return cls(ids, _normalized(vectors))
+
+    def rows(self, movie_ids):
+        return np.array(
+            [self.index[movie_id] for movie_id in movie_ids if movie_id in self.index],
+            dtype=np.int64,
+        )
+
+    def nearest(self, rows, count):
+        """
+        Yield `(movie_id, similar_ids, scores)` with the `count` movies most
+        similar to each of the given rows, most similar first.
+        """
+        count = min(count, len(self.ids) - 1)
+        if count <= 0:
+            for row in rows:
+                yield int(self.ids[row]), [], []
+            return
+        for chunk in _chunks(rows, len(self.ids)):
+            scores = self.vectors[chunk] @ self.vectors.T
+            scores[np.arange(len(chunk)), chunk] = -np.inf
+            top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for row, similar, similar_scores in zip(chunk, top, top_scores):
+                yield (
+                    int(self.ids[row]),
+                    self.ids[similar].tolist(),
+                    similar_scores.round(6).tolist(),
+                )
+
+
+def refresh_similar_movies(full=False, count=SIMILAR_MOVIES_COUNT):
+    """
+    Recompute the neighbour lists of the movies that changed since the
+    last refresh (every movie with `full`), return the number of lists
+    written.
+
+    The lists of changed movies, and of the movies that had one of them
+    as a neighbour, are recomputed against the whole catalogue. The other
+    lists only take in the changed movies that now rank among their
+    `count` nearest, so a refresh costs O(changed x catalogue).
+    """
+    # Lists flagged from now on keep their flag: the features read below
+    # may predate the change
+    started = timezone.now()
+    stored = {
+        movie_id: (similar_ids, scores)
+        for movie_id, similar_ids, scores in MovieSimilarity.objects.filter(
+            is_stale=False
+        ).values_list("movie_id", "similar_ids", "scores")
+    }
+
+    matrix = FeatureMatrix.build()
+    if full:
+        changed = set(matrix.index)
+    else:
+        changed = {movie_id for movie_id in matrix.index if movie_id not in stored}
+    if not changed:
+        return 0
+
+    recompute = changed | {
+        movie_id
+        for movie_id, (similar_ids, scores) in stored.items()
+        if not changed.isdisjoint(similar_ids)
+    }
+    results = {
+        movie_id: (similar_ids, scores)
+        for movie_id, similar_ids, scores in matrix.nearest(matrix.rows(recompute), count)
+    }
+    others = [movie_id for movie_id in stored if movie_id not in recompute]
+    results.update(_merge_changed(matrix, others, stored, changed, count))
+
+    with transaction.atomic():
+        MovieSimilarity.objects.filter(
+            movie_id__in=list(results), is_stale=True, updated_at__lt=started
+        ).update(is_stale=False)
+        MovieSimilarity.objects.bulk_create(
+            [
+                MovieSimilarity(
+                    movie_id=movie_id, similar_ids=similar_ids, scores=scores, is_stale=False
+                )
+                for movie_id, (similar_ids, scores) in results.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["movie"],
+            update_fields=["similar_ids", "scores", "updated_at"],
+            batch_size=1000,
+        )
+    return len(results)
+
+
+def mark_similarity_stale(movie_ids):
+    """Flag the neighbour lists of the given movies for the next refresh."""
+    MovieSimilarity.objects.bulk_create(
+        [MovieSimilarity(movie_id=movie_id, is_stale=True) for movie_id in set(movie_ids)],
+        update_conflicts=True,
+        unique_fields=["movie"],
+        update_fields=["is_stale", "updated_at"],
+    )
+
+
+def mark_neighbours_stale(movie_id):
+    """Flag the neighbour lists that contain the given movie."""
+    MovieSimilarity.objects.filter(similar_ids__contains=[movie_id]).update(
+        is_stale=True, updated_at=timezone.now()
+    )
+
+
+def get_similar_movies(movie_id, limit):
+    """
+    `(similar_ids, scores)` of the `limit` movies most similar to a movie,
+    None when the movie does not exist.
+    """
+    similarity = (
+        MovieSimilarity.objects.filter(movie_id=movie_id)
+        .values_list("similar_ids", "scores")
+        .first()
+    )
+    if similarity is None:
+        return ([], []) if Movie.objects.filter(pk=movie_id).exists() else None
+    similar_ids, scores = similarity
+    return similar_ids[:limit], scores[:limit]
+
+
+def _merge_changed(matrix, movie_ids, stored, changed, count):
+    changed_rows = matrix.rows(changed)
+    rows = matrix.rows(movie_ids)
+    for chunk in _chunks(rows, len(changed_rows)):
+        scores = matrix.vectors[chunk] @ matrix.vectors[changed_rows].T
+        thresholds = np.array(
+            [
+                stored[movie_id][1][-1] if len(stored[movie_id][1]) >= count else -np.inf
+                for movie_id in matrix.ids[chunk].tolist()
+            ]
+        )
+        better = scores > thresholds[:, None]
+        for offset in np.flatnonzero(better.any(axis=1)):
+            movie_id = int(matrix.ids[chunk[offset]])
+            similar_ids, similar_scores = stored[movie_id]
+            candidates = list(zip(similar_scores, similar_ids))
+            for column in np.flatnonzero(better[offset]):
+                candidates.append(
+                    (
+                        round(float(scores[offset, column]), 6),
+                        int(matrix.ids[changed_rows[column]]),
+                    )
+                )
+            candidates.sort(key=lambda candidate: -candidate[0])
+            candidates = candidates[:count]
+            yield movie_id, (
+                [similar_id for _, similar_id in candidates],
+                [score for score, _ in candidates],
+            )
+
+
+def _chunks(rows, width):
+    size = max(1, CHUNK_CELLS // max(width, 1))
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _one_hot(values):
+    keys, inverse = np.unique(np.array(values, dtype=np.int64), return_inverse=True)
+    block = np.zeros((len(values), len(keys)))
+    block[np.arange(len(values)), inverse] = 1.0
+    return block
+
+
+def _director_block(directors):
+    block = np.zeros((len(directors), DIRECTOR_BUCKETS))
+    for row, director in enumerate(directors):
+        for token in director_tokens(director):
+            block[row, zlib.crc32(token.encode()) % DIRECTOR_BUCKETS] += 1.0
+    return _normalized(block)
+
+
+def _standardized(values):
+    column = np.array([np.nan if value is None else float(value) for value in values])
+    if not len(column) or np.isnan(column).all():
+        return np.zeros((len(column), 1))
+    std = np.nanstd(column)
+    column = (column - np.nanmean(column)) / (std if std else 1.0)
+    return np.nan_to_num(column, nan=0.0)[:, None]
+
+
+def _normalized(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
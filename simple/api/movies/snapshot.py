@@ -0,0 +1,86 @@
+import threading
+import uuid
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+
+from django.core.cache import cache
+from django.db import transaction
+
+from simple.models import MovieCategory
+
+GENERATION_KEY = "movies:categories:generation"
+
+CategoryRow = namedtuple(
+    "CategoryRow", [field.attname for field in MovieCategory._meta.concrete_fields]
+)
+
+
+@dataclass(frozen=True)
+class CategorySnapshot:
+    """
+    Immutable in-memory copy of all movie categories.
+
+    `rows` are in the model ordering, `by_id` and `by_slug` index them.
+    """
+
+    generation: str
+    rows: tuple
+    by_id: MappingProxyType
+    by_slug: MappingProxyType
+    last_modified: datetime | None
+
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+def get_category_snapshot():
+    """
+    Process-local snapshot of the movie categories.
+
+    Each call reads the global generation from the cache and the snapshot
+    is only reloaded from the database when a category was written since it
+    was built, so category reads cost a single cache round trip.
+    """
+    global _snapshot
+    generation = _current_generation()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.generation == generation:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.generation != generation:
+            _snapshot = _build_snapshot(generation)
+        return _snapshot
+
+
+def bump_category_generation():
+    """
+    Make every process rebuild its snapshot, right away and once more
+    after the current transaction commits.
+    """
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, None)
+    transaction.on_commit(lambda: cache.set(GENERATION_KEY, uuid.uuid4().hex, None))
+
+
+def _current_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _build_snapshot(generation):
+    rows = tuple(
+        CategoryRow._make(values)
+        for values in MovieCategory.objects.values_list(*CategoryRow._fields)
+    )
+    return CategorySnapshot(
+        generation=generation,
+        rows=rows,
+        by_id=MappingProxyType({row.id: row for row in rows}),
+        by_slug=MappingProxyType({row.slug: row for row in rows}),
+        last_modified=max((row.updated_at for row in rows), default=None),
+    )
@@ -0,0 +1,346 @@
+import datetime
+import json
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.urls import reverse
+
+from simple.api.movies.queue import CLAIM_TIMEOUT, get_ready_queue, queue_member
+from simple.api.movies.serializers.root import MovieCategorySerializer
+from simple.factories.category import MovieCategoryFactory
+from simple.factories.movie import MovieFactory
+from simple.models import Director, Movie, MovieCategory
+from simple.signals import movies as signals
+
+
+@pytest.fixture
+def categories(db):
+    return [
+        MovieCategoryFactory.create(name=name, slug=name.lower())
+        for name in ("Drama", "Action", "Comedy")
+    ]
+
+
+def test_category_list_snapshot_pages(client, categories):
+    url = reverse("simple-api:movie-category-list")
+    expected = MovieCategorySerializer(MovieCategory.objects.all(), many=True).data
+
+    first = client.get(url, {"page_size": 2}).json()
+    second = client.get(first["next"]).json()
+    back = client.get(second["previous"]).json()
+
+    assert first["results"] + second["results"] == expected
+    assert second["next"] is None
+    assert back["results"] == first["results"]
+
+
+def test_category_list_streams(client, categories):
+    response = client.get(reverse("simple-api:movie-category-list"), {"stream": "1"})
+
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+    assert [row["name"] for row in rows] == ["Action", "Comedy", "Drama"]
+    assert set(rows[0]) == {"id", "name"}
+
+
+def test_category_reads_from_snapshot(
+    client, categories, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    list_url = reverse("simple-api:movie-category-list")
+    detail_url = reverse("simple-api:movie-category-detail", kwargs={"id": categories[0].id})
+    client.get(list_url)
+
+    with django_assert_num_queries(0):
+        assert client.get(list_url).status_code == 200
+        assert client.get(detail_url).json()["name"] == "Drama"
+
+    categories[0].name = "Noir"
+    categories[0].save()
+    assert client.get(detail_url).json()["name"] == "Noir"
+    with django_capture_on_commit_callbacks(execute=True):
+        MovieCategory.objects.filter(pk=categories[0].pk).update(slug="noir")
+    assert client.get(detail_url).json()["slug"] == "noir"
+
+
+def test_category_sparse_fieldsets(client, categories):
+    url = reverse("simple-api:movie-category-list")
+    results = client.get(url, {"fields": "name"}).json()["results"]
+    assert results == [{"name": "Action"}, {"name": "Comedy"}, {"name": "Drama"}]
+
+    detail = client.get(
+        reverse("simple-api:movie-category-detail", kwargs={"id": categories[0].id}),
+        {"fields": "slug"},
+    )
+    assert detail.json() == {"slug": "drama"}
+
+
+@pytest.fixture(autouse=True)
+def ready_queue():
+    cache.clear()
+    queue = get_ready_queue()
+    queue.replace({})
+    return queue
+
+
+@pytest.fixture
+def movies(categories, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return [
+            MovieFactory.create(
+                title=f"Movie {index}",
+                slug=f"movie-{index}",
+                category=categories[0],
+                release_date=datetime.date(2020, 1, index),
+            )
+            for index in range(1, 5)
+        ]
+
+
+def test_next_active_movie_claims(client, movies, django_assert_num_queries):
+    url = reverse("simple-api:next-active-movie")
+
+    with django_assert_num_queries(1):
+        first = client.get(url).json()
+    batch = client.get(url, {"count": 5}).json()
+
+    assert first["title"] == "Movie 4"
+    assert [movie["title"] for movie in batch] == ["Movie 3", "Movie 2", "Movie 1"]
+    assert not Movie.objects.filter(is_active=True).exists()
+    assert client.get(url).status_code == 404
+    assert client.get(url, {"count": 0}).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_next_active_movie_skips_locked_rows(client, movies):
+    locked, released = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with transaction.atomic():
+            Movie.objects.select_for_update().get(pk=movies[-1].pk)
+            locked.set()
+            released.wait(5)
+        connection.close()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait(5)
+    try:
+        claimed = client.get(reverse("simple-api:next-active-movie")).json()
+    finally:
+        released.set()
+        holder.join()
+
+    assert claimed["title"] == "Movie 3"
+    assert Movie.objects.get(pk=movies[-1].pk).is_active
+    # The locked movie was popped but not claimed: it is queued again
+    assert movies[-1].pk in get_ready_queue().items
+
+
+def test_next_active_movie_rebuilds_drifted_queue(client, movies, ready_queue):
+    ready_queue.replace({movies[3].pk: queue_member(movies[3].pk, None, "")})
+    Movie.objects.filter(pk=movies[3].pk).update(is_active=False)
+
+    claimed = client.get(reverse("simple-api:next-active-movie")).json()
+
+    assert claimed["title"] == "Movie 3"
+    assert set(ready_queue.items) == {movies[0].pk, movies[1].pk}
+
+
+@pytest.mark.parametrize("queued", [True, False])
+def test_next_active_movie_ties_follow_claim_order(
+    client, categories, ready_queue, django_capture_on_commit_callbacks, queued
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        for title in ["beta", "Alpha", "Gamma"]:
+            MovieFactory.create(
+                title=title,
+                slug=title.lower(),
+                category=categories[0],
+                release_date=datetime.date(2020, 1, 1),
+            )
+        MovieFactory.create(
+            title="Omega", slug="omega", category=categories[0], release_date=None
+        )
+    if not queued:
+        ready_queue.replace({})
+
+    claimed = client.get(reverse("simple-api:next-active-movie"), {"count": 4}).json()
+
+    # Titles compare bytewise both in the queue and in the database
+    assert [movie["title"] for movie in claimed] == ["Omega", "Alpha", "Gamma", "beta"]
+
+
+def test_next_active_movie_requeues_unfinished_claims(client, movies, ready_queue, monkeypatch):
+    ready_queue.pop(2)
+    assert set(ready_queue.items) == {movies[0].pk, movies[1].pk}
+
+    # Claims crashed before the database claim: the ids come back after the timeout
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + CLAIM_TIMEOUT)
+    claimed = client.get(reverse("simple-api:next-active-movie")).json()
+
+    assert claimed["title"] == "Movie 4"
+    assert set(ready_queue.items) == {movies[0].pk, movies[1].pk, movies[2].pk}
+
+
+def test_next_active_movie_throttles_queue_rebuilds(
+    client, movies, ready_queue, django_assert_num_queries
+):
+    ready_queue.replace({})
+    url = reverse("simple-api:next-active-movie")
+
+    # The dry queue is rebuilt from the database after the claim
+    with django_assert_num_queries(2):
+        assert client.get(url).json()["title"] == "Movie 4"
+    assert set(ready_queue.items) == {movies[0].pk, movies[1].pk, movies[2].pk}
+    ready_queue.replace({})
+
+    # Claims still fall back to the database while rebuilds are throttled
+    with django_assert_num_queries(1):
+        assert client.get(url).json()["title"] == "Movie 3"
+    assert ready_queue.items == {}
+
+
+def test_ready_queue_follows_bulk_updates(
+    movies, ready_queue, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        Movie.objects.filter(pk__in=[movies[0].pk, movies[1].pk]).update(is_active=False)
+    assert set(ready_queue.items) == {movies[2].pk, movies[3].pk}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Movie.objects.filter(pk=movies[0].pk).update(is_active=True)
+    assert set(ready_queue.items) == {movies[0].pk, movies[2].pk, movies[3].pk}
+
+
+def test_movie_browse_filters_and_facets(client, categories, django_assert_num_queries):
+    drama, action, comedy = categories
+    for index, (category, rating, minutes) in enumerate(
+        [(drama, "7.5", 90), (drama, "8.0", 120), (action, "7.1", 100), (comedy, None, 95)]
+    ):
+        MovieFactory.create(
+            title=f"Movie {index}",
+            slug=f"movie-{index}",
+            category=category,
+            rating=rating,
+            duration_minutes=minutes,
+            release_date=datetime.date(2020, 1, index + 1),
+        )
+    url = reverse("simple-api:movie-list")
+    client.get(url)
+
+    with django_assert_num_queries(2):
+        data = client.get(
+            url, {"category": f"{drama.id},{action.id}", "duration_minutes_min": 95}
+        ).json()
+
+    assert [movie["title"] for movie in data["results"]] == ["Movie 2", "Movie 1"]
+    assert data["results"][0]["rating"] == "7.1"
+    assert data["facets"] == {
+        "category": [
+            {"id": drama.id, "name": "Drama", "count": 1},
+            {"id": action.id, "name": "Action", "count": 1},
+        ],
+        "rating": [{"rating": 7, "count": 1}, {"rating": 8, "count": 1}],
+    }
+
+    data = client.get(url, {"rating_min": "7.2", "release_date_before": "2020-01-02"}).json()
+    assert [movie["title"] for movie in data["results"]] == ["Movie 1", "Movie 0"]
+    assert client.get(url, {"is_active": "false"}).json()["results"] == []
+    assert client.get(url, {"rating_min": "high"}).status_code == 400
+
+
+def test_top_movies_per_category(
+    client, categories, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    drama, action, comedy = categories
+    ratings = {drama: ["6.0", "9.0", "7.5", None], action: ["8.0"]}
+    top = {}
+    with django_capture_on_commit_callbacks(execute=True):
+        for category, values in ratings.items():
+            for index, rating in enumerate(values):
+                top[category.name, rating] = MovieFactory.create(
+                    title=f"{category.name} {index}",
+                    slug=f"{category.slug}-{index}",
+                    category=category,
+                    rating=rating,
+                )
+    url = reverse("simple-api:top-movies")
+    client.get(reverse("simple-api:movie-category-list"))
+
+    with django_assert_num_queries(1):
+        data = client.get(url, {"limit": 2}).json()
+    with django_assert_num_queries(0):
+        assert client.get(url, {"limit": 2}).json() == data
+
+    assert [(category["name"], len(category["movies"])) for category in data] == [
+        ("Action", 1),
+        ("Comedy", 0),
+        ("Drama", 2),
+    ]
+    assert [movie["rating"] for movie in data[2]["movies"]] == ["9.0", "7.5"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        moved = top["Drama", "9.0"]
+        moved.category = action
+        moved.save()
+    data = client.get(url, {"limit": 2}).json()
+    assert [movie["title"] for movie in data[0]["movies"]] == ["Drama 1", "Action 0"]
+    assert [movie["title"] for movie in data[2]["movies"]] == ["Drama 2", "Drama 0"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Movie.objects.filter(pk=top["Drama", "6.0"].pk).update(rating="9.5")
+    assert client.get(url).json()[2]["movies"][0]["title"] == "Drama 0"
+    assert client.get(url, {"limit": 51}).status_code == 400
+
+
+def test_director_movies(
+    client, categories, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    matrix = MovieFactory.create(
+        title="The Matrix",
+        slug="the-matrix",
+        category=categories[1],
+        director="Lana Wachowski, Lilly Wachowski",
+        release_date=datetime.date(1999, 3, 31),
+    )
+    MovieFactory.create(
+        title="Sense8",
+        slug="sense8",
+        category=categories[0],
+        director="Lilly  Wachowski & lana wachowski",
+        release_date=datetime.date(2015, 6, 5),
+    )
+    lana, lilly = Director.objects.order_by("name")
+    assert [lana.name, lilly.name] == ["Lana Wachowski", "Lilly Wachowski"]
+
+    url = reverse("simple-api:director-movies", kwargs={"id": lana.pk})
+    with django_assert_num_queries(1):
+        results = client.get(url).json()["results"]
+    assert [movie["title"] for movie in results] == ["Sense8", "The Matrix"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Movie.objects.filter(pk=matrix.pk).update(director="Lilly Wachowski")
+    assert [movie["title"] for movie in client.get(url).json()["results"]] == ["Sense8"]
+    assert list(matrix.directors.all()) == [lilly]
+
+    missing = reverse("simple-api:director-movies", kwargs={"id": lilly.pk + 100})
+    assert client.get(missing).status_code == 404
+
+
+def test_saves_resync_directors_only_when_changed(categories, monkeypatch):
+    movie = MovieFactory.create(
+        title="The Matrix", slug="the-matrix", category=categories[0], director="Lana Wachowski"
+    )
+    synced = []
+    monkeypatch.setattr(signals, "sync_movie_directors", synced.append)
+
+    movie.title = "The Matrix Reloaded"
+    movie.save()
+    assert synced == []
+
+    movie.director = "Lilly Wachowski"
+    movie.save()
+    assert synced == [[(movie.pk, "Lilly Wachowski")]]
@@ -0,0 +1,82 @@
+import datetime
+import time
+
+import fakeredis
+import pytest
+import redis
+
+from simple.api.movies.queue import (
+    CLAIM_TIMEOUT,
+    LocalReadyQueue,
+    RedisReadyQueue,
+    queue_member,
+)
+
+
+@pytest.fixture(params=[LocalReadyQueue, RedisReadyQueue])
+def queue(request, monkeypatch):
+    # The Lua scripts of RedisReadyQueue run in fakeredis
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis, "from_url", lambda location: fakeredis.FakeRedis(server=server)
+    )
+    return request.param("redis://localhost:6379/0", "movies:ready")
+
+
+def members(*movies):
+    return {pk: queue_member(pk, release_date, title) for pk, release_date, title in movies}
+
+
+def test_pop_order(queue):
+    day = datetime.date(2020, 1, 1)
+    queue.add(
+        members(
+            (1, day, "beta"),
+            (2, day, "Alpha"),
+            (3, day + datetime.timedelta(days=1), "Zulu"),
+            (4, None, "Omega"),
+            (5, day, "Alpha"),
+            (10, day, "Alpha"),
+        )
+    )
+
+    assert queue.pop(4) == [4, 3, 2, 5]
+    assert queue.pop(10) == [10, 1]
+    assert queue.pop(1) == []
+
+
+def test_changed_and_removed_movies(queue):
+    day = datetime.date(2020, 1, 1)
+    queue.add(members((1, day, "Alpha"), (2, day, "Beta"), (3, day, "Gamma")))
+
+    queue.add(members((1, day, "Zulu")))
+    queue.remove([2, 99])
+
+    assert queue.pop(3) == [3, 1]
+
+
+def test_requeue_and_claim_timeout(queue, monkeypatch):
+    day = datetime.date(2020, 1, 1)
+    queue.add(members((1, day, "Alpha"), (2, day, "Beta"), (3, day, "Gamma")))
+
+    assert queue.pop(2) == [1, 2]
+    queue.requeue([2])
+    # Pending ids are not queued twice, and removed ones do not come back
+    queue.add(members((1, day, "Alpha")))
+    queue.remove([3])
+    assert queue.pop(3) == [2]
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + CLAIM_TIMEOUT)
+    assert queue.pop(3) == [1, 2]
+
+
+def test_replace(queue):
+    day = datetime.date(2020, 1, 1)
+    queue.add(members((1, day, "Alpha"), (2, day, "Beta")))
+    queue.pop(1)
+
+    queue.replace(members((2, day, "Beta"), (3, day, "Gamma")))
+    queue.requeue([1])
+
+    assert queue.pop(3) == [2, 3]
@@ -0,0 +1,142 @@
+import pytest
+from django.urls import reverse
+
+from simple.api.movies.similarity import (
+    FeatureMatrix,
+    director_tokens,
+    refresh_similar_movies,
+)
+from simple.factories.category import MovieCategoryFactory
+from simple.factories.movie import MovieFactory
+from simple.models.models import Movie, MovieSimilarity
+
+
+@pytest.fixture
+def movies(db):
+    drama = MovieCategoryFactory.create(name="Drama", slug="drama")
+    action = MovieCategoryFactory.create(name="Action", slug="action")
+    specs = [
+        (drama, "8.0", 120, "Jane Doe"),
+        (drama, "7.9", 115, "Jane Doe"),
+        (drama, "3.0", 90, "John Roe"),
+        (action, "8.1", 118, "Jane Doe, Max Poe"),
+        (action, "5.0", 95, "Max Poe"),
+        (action, None, None, ""),
+    ]
+    return [
+        MovieFactory.create(
+            title=f"Movie {index}",
+            slug=f"movie-{index}",
+            category=category,
+            rating=rating,
+            duration_minutes=minutes,
+            director=director,
+        )
+        for index, (category, rating, minutes, director) in enumerate(specs)
+    ]
+
+
+def stored_lists():
+    return {
+        movie_id: (similar_ids, scores)
+        for movie_id, similar_ids, scores in MovieSimilarity.objects.values_list(
+            "movie_id", "similar_ids", "scores"
+        )
+    }
+
+
+def test_director_tokens():
+    assert director_tokens(" Jane  Doe & max poe; Ann Lee and Bo") == {
+        "jane doe",
+        "max poe",
+        "ann lee",
+        "bo",
+    }
+    assert director_tokens("") == set()
+
+
+def test_refresh_builds_neighbour_lists(movies):
+    assert refresh_similar_movies(count=3) == len(movies)
+    assert refresh_similar_movies(count=3) == 0
+
+    lists = stored_lists()
+    assert lists[movies[0].pk][0][0] == movies[1].pk
+    assert all(len(similar_ids) == 3 for similar_ids, _ in lists.values())
+    assert all(scores == sorted(scores, reverse=True) for _, scores in lists.values())
+    matrix = FeatureMatrix.build()
+    assert matrix.vectors.shape[0] == len(movies)
+
+
+def test_incremental_refresh_matches_full_rebuild(movies, django_capture_on_commit_callbacks):
+    refresh_similar_movies(count=3)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Movie.objects.filter(pk=movies[2].pk).update(rating="8.0", duration_minutes=119)
+    movies[4].director = "Jane Doe"
+    movies[4].save()
+    movies[5].delete()
+    added = MovieFactory.create(
+        title="Movie 6", slug="movie-6", category=movies[0].category, rating="8.0"
+    )
+    assert set(
+        MovieSimilarity.objects.filter(is_stale=True).values_list("movie_id", flat=True)
+    ) >= {
+        movies[2].pk,
+        movies[4].pk,
+        added.pk,
+    }
+
+    refresh_similar_movies(count=3)
+    incremental = stored_lists()
+    refresh_similar_movies(full=True, count=3)
+
+    assert not MovieSimilarity.objects.filter(is_stale=True).exists()
+    assert incremental.keys() == stored_lists().keys()
+    for movie_id, (similar_ids, scores) in stored_lists().items():
+        assert incremental[movie_id][1] == pytest.approx(scores, abs=1e-5)
+
+
+def test_similar_movies_view(client, movies, django_assert_num_queries):
+    url = reverse("simple-api:similar-movies", kwargs={"id": movies[0].pk})
+    assert client.get(url).json() == []
+
+    refresh_similar_movies()
+    with django_assert_num_queries(2):
+        data = client.get(url, {"limit": 2}).json()
+
+    assert [movie["id"] for movie in data] == stored_lists()[movies[0].pk][0][:2]
+    assert data[0]["title"] == "Movie 1"
+    assert 0 < data[1]["score"] <= data[0]["score"] <= 1
+    assert client.get(url, {"limit": 0}).status_code == 400
+    missing = reverse("simple-api:similar-movies", kwargs={"id": movies[-1].pk + 100})
+    assert client.get(missing).status_code == 404
+
+
+def test_movies_changed_during_refresh_stay_stale(movies, monkeypatch):
+    refresh_similar_movies(count=3)
+    build = FeatureMatrix.build.__func__
+
+    def build_while_edited(cls):
+        movies[1].director = "John Roe"
+        movies[1].save()
+        return build(cls)
+
+    monkeypatch.setattr(FeatureMatrix, "build", classmethod(build_while_edited))
+    refresh_similar_movies(count=3)
+
+    assert MovieSimilarity.objects.get(movie_id=movies[1].pk).is_stale
+
+
+def test_failed_refresh_keeps_the_flags(movies, monkeypatch):
+    refresh_similar_movies(count=3)
+    movies[1].director = "John Roe"
+    movies[1].save()
+
+    def build_failing(cls):
+        raise MemoryError
+
+    monkeypatch.setattr(FeatureMatrix, "build", classmethod(build_failing))
+    with pytest.raises(MemoryError):
+        refresh_similar_movies(count=3)
+
+    assert MovieSimilarity.objects.get(movie_id=movies[1].pk).is_stale
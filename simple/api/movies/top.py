@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from simple.api.common.values import get_values_representation
+from simple.api.movies.serializers.root import TopMovieSerializer
+from simple.api.movies.snapshot import get_category_snapshot
+from simple.models import Movie
+
+TOP_CACHE_TIMEOUT = 60 * 60
+# Number of movies cached per category, the largest `limit` served
+MAX_TOP_MOVIES = 50
+# Movie fields the top lists depend on
+TOP_FIELDS = {"title", "slug", "release_date", "rating", "category", "category_id"}
+
+
+def top_cache_key(category_id):
+    """Cache key of the top movies of a category."""
+    return f"movies:top:{category_id}"
+
+
+def get_top_movies(limit):
+    """
+    The `limit` best rated movies of every category (unrated movies left
+    out), as a list of `{"id", "name", "movies"}` in the category ordering.
+
+    The top list of each category is cached until a movie of the category
+    changes. Cached lists are read in one cache round trip and the misses
+    are loaded with a single query ranking the movies of every missing
+    category with `ROW_NUMBER() OVER (PARTITION BY category_id ...)`.
+    """
+    categories = get_category_snapshot().rows
+    keys = {top_cache_key(category.id): category.id for category in categories}
+    movies = {keys[key]: rows for key, rows in cache.get_many(keys).items()}
+
+    missing = [category.id for category in categories if category.id not in movies]
+    if missing:
+        loaded = _load_top_movies(missing)
+        cache.set_many(
+            {top_cache_key(category_id): rows for category_id, rows in loaded.items()},
+            TOP_CACHE_TIMEOUT,
+        )
+        movies.update(loaded)
+
+    return [
+        {"id": category.id, "name": category.name, "movies": movies[category.id][:limit]}
+        for category in categories
+    ]
+
+
+def invalidate_top_movies(category_ids):
+    """
+    Drop the cached top lists of the given categories, right away and once
+    more after the current transaction commits.
+    """
+    keys = [top_cache_key(category_id) for category_id in set(category_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _load_top_movies(category_ids):
+    representation = get_values_representation(TopMovieSerializer, Movie)
+    ranked = (
+        Movie.objects.filter(category_id__in=category_ids, rating__isnull=False)
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=F("category_id"),
+                order_by=[F("rating").desc(), F("title").asc(), F("pk").asc()],
+            )
+        )
+        .filter(rank__lte=MAX_TOP_MOVIES)
+        .order_by("category_id", "rank")
+        .values("category_id", *representation.columns)
+    )
+    top = {category_id: [] for category_id in category_ids}
+    for row in ranked:
+        top[row["category_id"]].append(representation.to_representation(row))
+    return top
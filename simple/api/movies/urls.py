@@ -2,9 +2,13 @@ from django.urls import include, re_path
 from rest_framework import routers
 
 from simple.api.movies.views.root import (
+    DirectorMoviesView,
     MovieCategoryListView,
     MovieCategoryByIdView,
+    MovieListView,
     NextActiveMovieView,
+    SimilarMoviesView,
+    TopMoviesView,
 )
 
 router = routers.DefaultRouter()
@@ -20,10 +24,30 @@ urlpatterns = [
         MovieCategoryByIdView.as_view(),
         name="movie-category-detail",
     ),
+    re_path(
+        r"^movies/$",
+        MovieListView.as_view(),
+        name="movie-list",
+    ),
+    re_path(
+        r"^movies/top/$",
+        TopMoviesView.as_view(),
+        name="top-movies",
+    ),
+    re_path(
+        r"^movies/(?P<id>\d+)/similar/$",
+        SimilarMoviesView.as_view(),
+        name="similar-movies",
+    ),
     re_path(
         r"^movies/next-active/$",
         NextActiveMovieView.as_view(),
         name="next-active-movie",
     ),
+    re_path(
+        r"^directors/(?P<id>\d+)/movies/$",
+        DirectorMoviesView.as_view(),
+        name="director-movies",
+    ),
     re_path(r"", include(router.urls)),
 ]
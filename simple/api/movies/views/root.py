@@ -1,3 +1,4 @@
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
 from rest_framework import status
 from rest_framework.parsers import FormParser, JSONParser
@@ -5,39 +6,67 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
+from simple.api.common.conditional import ConditionalGetMixin
+from simple.api.common.pagination import KeysetPagination
+from simple.api.common.sparse import FIELDS_PARAMETER, SparseFieldsMixin
+from simple.api.common.streaming import STREAM_PARAMETER, NDJSONStreamMixin
+from simple.api.common.values import ValuesSerializationMixin, get_values_representation
+from simple.api.movies.filters import MovieFilter, get_movie_facets
+from simple.api.movies.queue import claim_movies
 from simple.api.movies.serializers.root import (
     MovieCategorySerializer,
     MovieCategoryFieldsSerializer,
+    MovieListSerializer,
     MovieSerializer,
+    SimilarMovieSerializer,
+    TopMoviesCategorySerializer,
 )
+from simple.api.movies.similarity import SIMILAR_MOVIES_COUNT, get_similar_movies
+from simple.api.movies.snapshot import get_category_snapshot
+from simple.api.movies.top import MAX_TOP_MOVIES, get_top_movies
 
-from simple.models import Movie, MovieCategory
+from simple.models import Director, Movie, MovieCategory
 
 
-class MovieCategoryListView(APIView):
+class MovieCategoryListView(SparseFieldsMixin, ConditionalGetMixin, NDJSONStreamMixin, APIView):
+    """
+    Movie categories, served from the process-local category snapshot.
+    """
 
     serializer_class = MovieCategorySerializer
     parser_classes = [JSONParser, FormParser]
+    pagination_class = KeysetPagination
 
     @extend_schema(
         methods=["GET"],
         operation_id="movie-category-handler",
         description="Get all movie categories",
         tags=["Movies"],
-        responses=MovieCategorySerializer,
+        responses=MovieCategorySerializer(many=True),
+        parameters=[STREAM_PARAMETER, FIELDS_PARAMETER],
     )
     def get(self, request):
         """
-        Get all movie categories.
+        Get a page of movie categories.
         """
-        categories = MovieCategory.objects.all()
+        snapshot = get_category_snapshot()
+        not_modified = self.evaluate_conditions(
+            request, snapshot.last_modified, len(snapshot.rows)
+        )
+        if not_modified:
+            return not_modified
+        if self.wants_stream(request):
+            return self.stream_response(snapshot.rows)
+        paginator = self.pagination_class()
+        ordering = paginator.get_ordering(MovieCategory.objects.all())
+        categories = paginator.paginate_rows(snapshot.rows, request, ordering, MovieCategory)
         serializer = self.serializer_class(categories, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
 
 
-class MovieCategoryByIdView(APIView):
+class MovieCategoryByIdView(SparseFieldsMixin, ConditionalGetMixin, APIView):
     """
-    Retrieve a movie category by its ID.
+    Retrieve a movie category by its ID from the category snapshot.
     """
 
     serializer_class = MovieCategoryFieldsSerializer
@@ -60,49 +89,274 @@ class MovieCategoryByIdView(APIView):
                 description="ID of the movie category",
                 required=True,
             ),
+            FIELDS_PARAMETER,
         ],
     )
     def get(self, request, id):
         """
         Get selected fields of a movie category by its ID.
         """
-        try:
-            category = MovieCategory.objects.get(pk=id)
-        except MovieCategory.DoesNotExist:
+        category = get_category_snapshot().by_id.get(int(id))
+        if category is None:
             return Response(
                 {"detail": "Not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        serializer = MovieCategoryFieldsSerializer(category)
+        not_modified = self.evaluate_conditions(request, category.updated_at, count=1)
+        if not_modified:
+            return not_modified
+        serializer = self.serializer_class(category)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class MovieListView(ValuesSerializationMixin, NDJSONStreamMixin, APIView):
+    """
+    Browse movies with filters, a page of results and facet counts.
+    """
+
+    queryset = Movie.objects.all()
+    serializer_class = MovieListSerializer
+    parser_classes = [JSONParser, FormParser]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = MovieFilter
+    values_serialization = True
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="movie-list-handler",
+        description=(
+            "Get a page of movies matching the filters. The response also has `facets`: "
+            "the number of matching movies per category and per rating bucket."
+        ),
+        tags=["Movies"],
+        responses=MovieListSerializer(many=True),
+        parameters=[STREAM_PARAMETER],
+    )
+    def get(self, request):
+        """
+        Get a page of filtered movies along with the facet counts of all
+        the movies matching the filters.
+        """
+        movies = self.queryset.all()
+        for backend in self.filter_backends:
+            movies = backend().filter_queryset(request, movies, self)
+        rows = self.get_serialization_queryset(movies)
+        if self.wants_stream(request):
+            return self.stream_response(rows)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(rows, request, view=self)
+        response = paginator.get_paginated_response(self.serialize_rows(page))
+        response.data["facets"] = get_movie_facets(movies)
+        return response
+
+
+class DirectorMoviesView(ValuesSerializationMixin, APIView):
+    """
+    Movies of a director, through the indexed director links.
+    """
+
+    serializer_class = MovieListSerializer
+    parser_classes = [JSONParser, FormParser]
+    pagination_class = KeysetPagination
+    values_serialization = True
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="director-movies-handler",
+        description="Get the movies of a director",
+        tags=["Movies"],
+        responses={
+            200: MovieListSerializer(many=True),
+            404: OpenApiTypes.OBJECT,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="id",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.PATH,
+                description="ID of the director",
+                required=True,
+            ),
+        ],
+    )
+    def get(self, request, id):
+        """
+        Get a page of the movies of a director.
+        """
+        movies = self.get_serialization_queryset(Movie.objects.filter(directors=id))
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(movies, request, view=self)
+        if not page and not Director.objects.filter(pk=id).exists():
+            return Response(
+                {"detail": "Director not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return paginator.get_paginated_response(self.serialize_rows(page))
+
+
+class TopMoviesView(APIView):
+    """
+    The best rated movies of every category in a single request.
+    """
+
+    default_limit = 10
+    max_limit = MAX_TOP_MOVIES
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="top-movies-handler",
+        description="Get the best rated movies of every movie category",
+        tags=["Movies"],
+        responses={
+            200: TopMoviesCategorySerializer(many=True),
+            400: OpenApiTypes.OBJECT,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Number of movies per category (up to {MAX_TOP_MOVIES})",
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        """
+        Get the `limit` best rated movies of every category, by rating.
+        """
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            return Response(
+                {"detail": f"limit must be an integer between 1 and {self.max_limit}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(get_top_movies(limit), status=status.HTTP_200_OK)
+
+
+class SimilarMoviesView(APIView):
+    """
+    The movies most similar to a movie, from the precomputed neighbour table.
+    """
+
+    default_limit = 10
+    max_limit = SIMILAR_MOVIES_COUNT
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="similar-movies-handler",
+        description="Get the movies most similar to a movie, most similar first",
+        tags=["Movies"],
+        responses={
+            200: SimilarMovieSerializer(many=True),
+            400: OpenApiTypes.OBJECT,
+            404: OpenApiTypes.OBJECT,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="id",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.PATH,
+                description="ID of the movie",
+                required=True,
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Number of similar movies (up to {SIMILAR_MOVIES_COUNT})",
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request, id):
+        """
+        Get the `limit` movies most similar to a movie with their cosine
+        similarity `score`. Movies added since the last similarity refresh
+        have no similar movies yet.
+        """
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            return Response(
+                {"detail": f"limit must be an integer between 1 and {self.max_limit}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        similar = get_similar_movies(int(id), limit)
+        if similar is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        similar_ids, scores = similar
+        representation = get_values_representation(MovieListSerializer, Movie)
+        rows = {
+            row["id"]: row
+            for row in representation.values(Movie.objects.filter(pk__in=similar_ids))
+        }
+        movies = [
+            {**representation.to_representation(rows[movie_id]), "score": score}
+            for movie_id, score in zip(similar_ids, scores)
+            if movie_id in rows
+        ]
+        return Response(movies, status=status.HTTP_200_OK)
+
+
 class NextActiveMovieView(APIView):
     """
-    Get the next active movie and deactivate it after retrieval.
+    Claim the next active movies, deactivating them atomically.
     """
 
+    max_count = 100
+
     @extend_schema(
         methods=["GET"],
         operation_id="next-active-movie",
-        description="Get the next active movie and deactivate it",
+        description=(
+            "Get the next active movie and deactivate it. "
+            "With `count`, claim up to `count` movies and return them as a list."
+        ),
         tags=["Movies"],
         responses={
             200: MovieSerializer,
+            400: OpenApiTypes.OBJECT,
             404: {"description": "No active movies available"},
         },
+        parameters=[
+            OpenApiParameter(
+                name="count",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Number of movies to claim (up to 100)",
+                required=False,
+            ),
+        ],
     )
     def get(self, request):
         """
-        Returns the next active movie and marks it as inactive.
+        Returns the next active movie (or a list of up to `count` movies)
+        and marks it as inactive. The movie ids are popped from the ready
+        queue, so concurrent requests never get the same movie.
         If no active movies are available, returns "NO MOVIES".
         """
-        movie = Movie.objects.filter(is_active=True).first()
+        count = request.query_params.get("count")
+        try:
+            limit = 1 if count is None else int(count)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_count:
+            return Response(
+                {"detail": f"count must be an integer between 1 and {self.max_count}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        if not movie:
+        movies = claim_movies(limit)
+        if not movies:
             return Response({"message": "NO MOVIES"}, status=status.HTTP_404_NOT_FOUND)
-        serializer = MovieSerializer(movie)
-        movie.is_active = False
-        movie.save()
-
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if count is None:
+            return Response(MovieSerializer(movies[0]).data, status=status.HTTP_200_OK)
+        return Response(MovieSerializer(movies, many=True).data, status=status.HTTP_200_OK)
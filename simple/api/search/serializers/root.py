@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+
+class SearchResultSerializer(serializers.Serializer):
+    type = serializers.CharField(source="kind")
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    rank = serializers.FloatField()
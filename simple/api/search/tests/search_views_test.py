@@ -0,0 +1,56 @@
+import pytest
+from django.urls import reverse
+
+from simple.factories.author import AuthorFactory
+from simple.factories.book import BookFactory
+
+
+@pytest.fixture
+def library(db):
+    tolstoy = AuthorFactory.create(
+        first_name="Leo", last_name="Tolstoy", biography="Wrote about war and peace"
+    )
+    BookFactory.create(
+        author=tolstoy,
+        title="War and Peace",
+        slug="war-and-peace",
+        description="Napoleonic wars",
+        page_count=1225,
+    )
+    BookFactory.create(
+        author=tolstoy,
+        title="Anna Karenina",
+        slug="anna-karenina",
+        description="A novel with a short war episode",
+        page_count=864,
+    )
+    return tolstoy
+
+
+def test_search_ranks_books_and_authors(client, library):
+    response = client.get(reverse("search-api:search"), {"q": "war"})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert response.json()["count"] == 3
+    assert results[0] == {
+        "type": "book",
+        "id": results[0]["id"],
+        "name": "War and Peace",
+        "rank": results[0]["rank"],
+    }
+    assert {result["type"] for result in results} == {"book", "author"}
+    assert [result["rank"] for result in results] == sorted(
+        (result["rank"] for result in results), reverse=True
+    )
+
+
+def test_search_by_type_and_validation(client, library):
+    url = reverse("search-api:search")
+
+    authors = client.get(url, {"q": "tolstoy", "type": "author"}).json()["results"]
+    assert [(result["type"], result["name"]) for result in authors] == [
+        ("author", "Leo Tolstoy")
+    ]
+    assert client.get(url).status_code == 400
+    assert client.get(url, {"q": "war", "type": "movie"}).status_code == 400
@@ -0,0 +1,11 @@
+from django.urls import include, re_path
+from rest_framework import routers
+
+from simple.api.search.views.root import SearchView
+
+router = routers.DefaultRouter()
+
+urlpatterns = [
+    re_path(r"^search/$", SearchView.as_view(), name="search"),
+    re_path(r"", include(router.urls)),
+]
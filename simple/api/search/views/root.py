@@ -0,0 +1,97 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
+from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import FormParser, JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from simple.api.search.serializers.root import SearchResultSerializer
+from simple.models.models import SEARCH_CONFIG, Author, Book
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search over books and authors.
+    """
+
+    serializer_class = SearchResultSerializer
+    parser_classes = [JSONParser, FormParser]
+    pagination_class = SearchPagination
+    search_types = ("book", "author")
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="search-handler",
+        description="Full-text search over books and authors, ranked by relevance",
+        tags=["Search"],
+        responses={
+            200: SearchResultSerializer(many=True),
+            400: OpenApiTypes.OBJECT,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Search query (web search syntax: quotes, OR, -word)",
+                required=True,
+            ),
+            OpenApiParameter(
+                name="type",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Restrict results to one type",
+                enum=["book", "author"],
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        """
+        Get a page of books and authors matching the query, best matches first.
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"detail": "q is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        kinds = self.search_types
+        if "type" in request.query_params:
+            kinds = [request.query_params["type"]]
+            if kinds[0] not in self.search_types:
+                return Response(
+                    {"detail": f"type must be one of: {', '.join(self.search_types)}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+        querysets = {
+            "book": Book.objects.annotate(name=F("title")),
+            "author": Author.objects.annotate(
+                name=Concat("first_name", Value(" "), "last_name")
+            ),
+        }
+        ranked = [
+            querysets[kind]
+            .filter(search_vector=query)
+            .annotate(kind=Value(kind), rank=SearchRank(F("search_vector"), query))
+            .values("id", "name", "kind", "rank")
+            .order_by()
+            for kind in kinds
+        ]
+        results = ranked[0].union(*ranked[1:], all=True).order_by("-rank", "kind", "id")
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(results, request, view=self)
+        serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+
+class WeatherSeriesSerializer(serializers.Serializer):
+    city = serializers.CharField(max_length=100)
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    resolution = serializers.ChoiceField(
+        choices=["reading", "hour"],
+        help_text="Individual readings, or hourly averages for windows past the retention",
+    )
+    series = serializers.DictField(
+        child=serializers.ListField(
+            child=serializers.ListField(
+                child=serializers.FloatField(), min_length=2, max_length=2
+            )
+        ),
+        help_text="[epoch milliseconds, value] points of every requested metric",
+    )
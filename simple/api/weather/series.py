@@ -0,0 +1,119 @@
+import hashlib
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from simple.models.weather import Weather, WeatherHourly, WeatherRollup
+
+# Fields a series can be drawn of, stored both per reading and per hour
+SERIES_METRICS = WeatherRollup.METRICS
+DEFAULT_SERIES_METRICS = ("temperature", "pressure")
+MAX_SERIES_POINTS = 5000
+SERIES_CACHE_TIMEOUT = 24 * 60 * 60
+# Windows ending within the last hour still change as readings arrive
+RECENT_SERIES_WINDOW = timedelta(hours=1)
+RECENT_SERIES_CACHE_TIMEOUT = 5 * 60
+
+
+def series_cache_key(city, start, end, points, metrics):
+    """Cache key of a downsampled series window."""
+    window = f"{city}|{start.isoformat()}|{end.isoformat()}|{points}|{','.join(metrics)}"
+    return f"weather:series:{hashlib.sha1(window.encode()).hexdigest()}"
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of the `threshold` points of `(x, y)` kept by the
+    Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are kept; the others are split in
+    `threshold - 2` buckets of consecutive points, each keeping the point
+    forming the largest triangle with the point kept in the previous
+    bucket and the average point of the next bucket.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+
+    edges = (np.arange(threshold - 1) * (size - 2) / (threshold - 2)).astype(np.int64) + 1
+    edges[-1] = size - 1
+    # Average point of every bucket, then of the last point
+    counts = np.diff(edges)
+    average_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    average_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, size - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Twice the triangle areas, as cross products of its sides
+        across = (x[previous] - average_x[bucket + 1]) * (y[start:stop] - y[previous])
+        along = (x[previous] - x[start:stop]) * (average_y[bucket + 1] - y[previous])
+        areas = np.abs(across - along)
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+    return indices
+
+
+def get_weather_series(city, start, end, points, metrics=DEFAULT_SERIES_METRICS):
+    """
+    The `metrics` of a city from `start` to `end`, each downsampled with
+    LTTB to at most `points` `[epoch milliseconds, value]` pairs, as
+    `{"city", "start", "end", "resolution", "series": {metric: pairs}}`.
+
+    Windows within the retention of the readings are drawn from the
+    readings, older ones from the hourly averages of `WeatherHourly`.
+    The payloads are cached per window.
+    """
+    key = series_cache_key(city, start, end, points, metrics)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    now = timezone.now()
+    if start < now - timedelta(days=settings.WEATHER_RETENTION_DAYS):
+        resolution = "hour"
+        rows = (
+            WeatherHourly.objects.filter(city_name=city, bucket__gte=start, bucket__lt=end)
+            .order_by("bucket")
+            .values_list("bucket", *(f"{metric}_avg" for metric in metrics))
+        )
+    else:
+        resolution = "reading"
+        rows = (
+            Weather.objects.filter(
+                city_name=city, api_timestamp__gte=start, api_timestamp__lt=end
+            )
+            .order_by("api_timestamp")
+            .values_list("api_timestamp", *metrics)
+        )
+    columns = list(zip(*rows)) or [()] * (len(metrics) + 1)
+    x = np.fromiter(
+        (moment.timestamp() * 1000 for moment in columns[0]),
+        dtype=np.float64,
+        count=len(columns[0]),
+    )
+
+    series = {}
+    for metric, values in zip(metrics, columns[1:]):
+        y = np.array(values, dtype=np.float64)
+        kept = lttb(x, y, points)
+        series[metric] = [
+            [moment, value]
+            for moment, value in zip(x[kept].astype(np.int64).tolist(), y[kept].tolist())
+        ]
+
+    payload = {
+        "city": city,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "resolution": resolution,
+        "series": series,
+    }
+    recent = end > now - RECENT_SERIES_WINDOW
+    cache.set(key, payload, RECENT_SERIES_CACHE_TIMEOUT if recent else SERIES_CACHE_TIMEOUT)
+    return payload
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from django.urls import reverse
+from django.utils import timezone as django_timezone
+
+from simple.api.weather.series import lttb
+from simple.factories.weather import WeatherFactory
+from simple.models import WeatherHourly
+
+
+def test_lttb_keeps_extremes_and_ends():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    y[437] = 10.0
+
+    kept = lttb(x, y, 50)
+
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert 437 in kept
+    assert np.all(np.diff(kept) > 0)
+    assert lttb(x[:10], y[:10], 50).tolist() == list(range(10))
+
+
+@pytest.fixture
+def readings(db):
+    now = django_timezone.now().replace(microsecond=0)
+    return [
+        WeatherFactory.create(
+            api_timestamp=now - timedelta(minutes=10 * index),
+            temperature=270.0 + index % 7,
+            pressure=1000 + index % 5,
+        )
+        for index in range(100)
+    ]
+
+
+def test_weather_series_view(client, readings, django_assert_num_queries):
+    url = reverse("weather-api:weather-series")
+    params = {"city": "Moscow", "points": 20, "metrics": "temperature,pressure"}
+
+    with django_assert_num_queries(1):
+        data = client.get(url, params).json()
+    with django_assert_num_queries(0):
+        assert client.get(url, params).json() == data
+
+    assert data["resolution"] == "reading"
+    assert set(data["series"]) == {"temperature", "pressure"}
+    temperatures = data["series"]["temperature"]
+    assert len(temperatures) == 20
+    first = readings[-1].api_timestamp
+    assert temperatures[0] == [int(first.timestamp() * 1000), readings[-1].temperature]
+    assert [moment for moment, _ in temperatures] == sorted(
+        moment for moment, _ in temperatures
+    )
+
+    assert client.get(url, {"city": "Kazan"}).json()["series"]["temperature"] == []
+    for invalid in [
+        {},
+        {"city": "Moscow", "points": 2},
+        {"city": "Moscow", "metrics": "visibility"},
+        {"city": "Moscow", "from": "yesterday"},
+        {"city": "Moscow", "from": "2025-02-01", "to": "2025-01-01"},
+    ]:
+        assert client.get(url, invalid).status_code == 400
+
+
+def test_old_windows_are_drawn_from_hourly_rollups(client, db):
+    old = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for hour in range(48):
+        WeatherFactory.create(api_timestamp=old + timedelta(hours=hour), temperature=260 + hour)
+    assert WeatherHourly.objects.count() == 48
+
+    data = client.get(
+        reverse("weather-api:weather-series"),
+        {"city": "Moscow", "from": "2024-01-01", "to": "2024-01-02", "metrics": "temperature"},
+    ).json()
+
+    assert data["resolution"] == "hour"
+    assert [value for _, value in data["series"]["temperature"]] == [
+        260.0 + hour for hour in range(24)
+    ]
@@ -0,0 +1,11 @@
+from django.urls import include, re_path
+from rest_framework import routers
+
+from simple.api.weather.views.root import WeatherSeriesView
+
+router = routers.DefaultRouter()
+
+urlpatterns = [
+    re_path(r"^weather/series/$", WeatherSeriesView.as_view(), name="weather-series"),
+    re_path(r"", include(router.urls)),
+]
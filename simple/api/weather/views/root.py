@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from simple.api.weather.serializers.root import WeatherSeriesSerializer
+from simple.api.weather.series import (
+    DEFAULT_SERIES_METRICS,
+    MAX_SERIES_POINTS,
+    SERIES_METRICS,
+    get_weather_series,
+)
+
+
+class WeatherSeriesView(APIView):
+    """
+    Weather time series of a city, downsampled for charting.
+    """
+
+    default_points = 500
+    max_points = MAX_SERIES_POINTS
+    default_window = timedelta(days=7)
+    # Default windows end on this step, so that they are cached between readings
+    window_step = timedelta(minutes=5)
+
+    @extend_schema(
+        methods=["GET"],
+        operation_id="weather-series-handler",
+        description=(
+            "Get the weather metrics of a city over a time window, each downsampled to "
+            "at most `points` points with Largest-Triangle-Three-Buckets"
+        ),
+        tags=["Weather"],
+        responses={
+            200: WeatherSeriesSerializer,
+            400: OpenApiTypes.OBJECT,
+        },
+        parameters=[
+            OpenApiParameter(
+                name="city",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="City name",
+                required=True,
+            ),
+            OpenApiParameter(
+                name="from",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Start of the window (inclusive), 7 days before `to` by default",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="to",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="End of the window (exclusive), now by default",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="points",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Maximum points per series (3 to {MAX_SERIES_POINTS})",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="metrics",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    f"Comma-separated metrics among {', '.join(SERIES_METRICS)}, "
+                    f"{','.join(DEFAULT_SERIES_METRICS)} by default"
+                ),
+                required=False,
+            ),
+        ],
+    )
+    def get(self, request):
+        """
+        Get the downsampled series of the requested metrics of a city.
+        """
+        params = request.query_params
+        city = params.get("city", "").strip()
+        if not city:
+            return Response({"detail": "city is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            points = int(params.get("points", self.default_points))
+        except ValueError:
+            points = 0
+        if not 3 <= points <= self.max_points:
+            return Response(
+                {"detail": f"points must be an integer between 3 and {self.max_points}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        metrics = tuple(
+            dict.fromkeys(
+                metric.strip()
+                for metric in params.get("metrics", ",".join(DEFAULT_SERIES_METRICS)).split(",")
+            )
+        )
+        if not set(metrics) <= set(SERIES_METRICS):
+            return Response(
+                {"detail": f"metrics must be among: {', '.join(SERIES_METRICS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            end = self.parse_moment(params["to"]) if "to" in params else self.window_end()
+            start = (
+                self.parse_moment(params["from"])
+                if "from" in params
+                else end - self.default_window
+            )
+        except ValueError:
+            return Response(
+                {"detail": "from and to must be ISO 8601 dates or datetimes."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if start >= end:
+            return Response(
+                {"detail": "from must be before to."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            get_weather_series(city, start, end, points, metrics), status=status.HTTP_200_OK
+        )
+
+    def parse_moment(self, value):
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(value)
+        return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+
+    def window_end(self):
+        """Now, rounded up to the next `window_step`."""
+        step = self.window_step.total_seconds()
+        now = timezone.now().timestamp()
+        return datetime.fromtimestamp(-(-now // step) * step, tz=dt_timezone.utc)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SimpleConfig(AppConfig):
+    name = "simple"
+
+    def ready(self):
+        """Connect signal receivers."""
+        from simple import signals  # noqa: F401
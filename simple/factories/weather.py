@@ -0,0 +1,32 @@
+import factory.django
+from django.utils import timezone
+from simple.models.weather import Weather
+
+
+class WeatherFactory(factory.django.DjangoModelFactory):
+
+    class Meta:
+        model = Weather
+
+    city_name = "Moscow"
+    country_code = "RU"
+    longitude = 37.61
+    latitude = 55.75
+    weather_id = 802
+    weather_main = "Clouds"
+    weather_description = "scattered clouds"
+    weather_icon = "03d"
+    temperature = 294.87
+    feels_like = 294.51
+    temp_min = 293.51
+    temp_max = 295.08
+    pressure = 1010
+    humidity = 54
+    visibility = 10000
+    wind_speed = 6.75
+    wind_degree = 329
+    clouds = 32
+    sunrise = factory.LazyFunction(timezone.now)
+    sunset = factory.LazyFunction(timezone.now)
+    api_timestamp = factory.LazyFunction(timezone.now)
+    timezone_offset = 10800
@@ -0,0 +1,38 @@
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from simple.processes.rollups import backfill_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the hourly and daily weather rollups from the stored readings, "
+        "e.g. after deploying the rollup tables or repairing readings. Days whose "
+        "readings the retention started deleting are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First day to rebuild (YYYY-MM-DD)")
+        parser.add_argument("--until", help="Last day to rebuild (YYYY-MM-DD)")
+        parser.add_argument(
+            "--chunk-days", type=int, default=7, help="Days of readings rebuilt per transaction"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = options["since"] and self.day_start(options["since"])
+            until = options["until"] and self.day_start(options["until"]) + timedelta(days=1)
+        except ValueError:
+            raise CommandError("--since and --until must be dates formatted as YYYY-MM-DD")
+        if options["chunk_days"] < 1:
+            raise CommandError("--chunk-days must be positive")
+
+        written = backfill_rollups(since, until, chunk_days=options["chunk_days"])
+        self.stdout.write(f"{written} rollup rows written")
+
+    def day_start(self, value):
+        return timezone.make_aware(
+            datetime.combine(datetime.strptime(value, "%Y-%m-%d"), time())
+        )
@@ -0,0 +1,91 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from simple.models import Movie, MovieCategory
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark Movie.objects.claim_active() (NextActiveMovieView) as the movie table "
+        "grows, with a small active fraction. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10000,100000,1000000",
+            help="Comma-separated table sizes to measure at",
+        )
+        parser.add_argument(
+            "--active-every",
+            type=int,
+            default=1000,
+            help="One movie out of this many is active",
+        )
+        parser.add_argument(
+            "--claims", type=int, default=200, help="Claims per size (at most the active rows)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes must be a comma-separated list of integers")
+
+        try:
+            with transaction.atomic():
+                self.run(sizes, options["active_every"], options["claims"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, sizes, active_every, claims):
+        category = MovieCategory.objects.create(name="Benchmark", slug="benchmark")
+        self.stdout.write(f"{'rows':>10} {'active':>8} {'mean ms':>9} {'p95 ms':>8}  plan")
+
+        inserted = 0
+        for size in sizes:
+            self.insert_movies(category, inserted, size, active_every)
+            inserted = size
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Movie._meta.db_table}")
+
+            active = Movie.objects.filter(is_active=True).count()
+            timings = []
+            for _ in range(min(claims, active)):
+                start = time.perf_counter()
+                Movie.objects.claim_active()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1] if timings else 0
+            self.stdout.write(
+                f"{size:>10} {active:>8} {statistics.fmean(timings or [0]):>9.3f} "
+                f"{p95:>8.3f}  {self.plan()}"
+            )
+
+    def insert_movies(self, category, start, stop, active_every):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Movie._meta.db_table}
+                    (title, original_title, slug, description, release_date, director,
+                     category_id, is_active, created_at, updated_at)
+                SELECT
+                    'Benchmark ' || i, '', 'benchmark-' || i, '',
+                    DATE '2000-01-01' + (i %% 9000), '', %s, i %% %s = 0, now(), now()
+                FROM generate_series(%s, %s) AS i
+                """,
+                [category.pk, active_every, start + 1, stop],
+            )
+
+    def plan(self):
+        ordering = [*Movie._meta.ordering, "pk"]
+        plan = Movie.objects.filter(is_active=True).order_by(*ordering)[:1].explain()
+        return plan.splitlines()[1].strip(" ->") if "\n" in plan else plan
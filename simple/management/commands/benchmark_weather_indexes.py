@@ -0,0 +1,164 @@
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+
+from simple.models import Weather
+
+BENCH_TABLE = "simple_weather_bench"
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+SCANS = {
+    # A day of readings of every city, e.g. a dashboard or a retention sweep
+    "window": (
+        f"SELECT count(*), avg(temperature) FROM {BENCH_TABLE} "
+        "WHERE created_at >= %(from)s AND created_at < %(to)s"
+    ),
+    # The latest readings of one city
+    "latest": (
+        f"SELECT * FROM {BENCH_TABLE} WHERE city_name = %(city)s "
+        "ORDER BY api_timestamp DESC LIMIT 24"
+    ),
+    # Hourly buckets of one city over a day, as `WeatherQuerySet.bucket("hour")`
+    "buckets": (
+        "SELECT date_trunc('hour', api_timestamp) AS bucket, count(*), avg(temperature) "
+        f"FROM {BENCH_TABLE} WHERE city_name = %(city)s "
+        "AND api_timestamp >= %(from)s AND api_timestamp < %(to)s GROUP BY 1 ORDER BY 1"
+    ),
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the insert throughput and range scan latency of the Weather indexes "
+        "with the index set of an earlier migration, on a copy of the table filled "
+        "with synthetic readings. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--baseline",
+            default="0011_partition_weather",
+            help="Migration of the simple app whose Weather indexes are the baseline",
+        )
+        parser.add_argument("--rows", type=int, default=200000, help="Rows inserted per set")
+        parser.add_argument("--batch", type=int, default=1000, help="Rows per INSERT")
+        parser.add_argument("--cities", type=int, default=50, help="Distinct cities")
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=600,
+            help="Seconds between two readings of a city",
+        )
+        parser.add_argument("--repeats", type=int, default=20, help="Runs of each scan")
+
+    def handle(self, *args, **options):
+        loader = MigrationLoader(connection)
+        if ("simple", options["baseline"]) not in loader.graph.nodes:
+            raise CommandError(f"Unknown migration simple.{options['baseline']}")
+        baseline = loader.project_state(("simple", options["baseline"])).apps.get_model(
+            "simple", "Weather"
+        )
+        index_sets = [
+            (options["baseline"], baseline._meta.indexes),
+            ("current", Weather._meta.indexes),
+        ]
+
+        scans = " ".join(f"{name + ' ms':>11}" for name in SCANS)
+        self.stdout.write(f"{'indexes':<24} {'rows/s':>10} {scans} {'index MB':>9}")
+        for name, indexes in index_sets:
+            try:
+                with transaction.atomic():
+                    self.run(name, indexes, options)
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def run(self, name, indexes, options):
+        quote = connection.ops.quote_name
+        table = quote(Weather._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {BENCH_TABLE} (LIKE {table} INCLUDING CONSTRAINTS)")
+            cursor.execute(f"ALTER TABLE {BENCH_TABLE} ADD PRIMARY KEY (id, created_at)")
+            with connection.schema_editor(atomic=False) as schema_editor:
+                for number, index in enumerate(indexes):
+                    index = index.clone()
+                    index.name = f"{BENCH_TABLE}_{number}"
+                    statement = index.create_sql(Weather, schema_editor)
+                    statement.rename_table_references(Weather._meta.db_table, BENCH_TABLE)
+                    cursor.execute(str(statement))
+
+            elapsed = 0.0
+            for start in range(0, options["rows"], options["batch"]):
+                stop = min(start + options["batch"], options["rows"])
+                began = time.perf_counter()
+                self.insert_readings(cursor, start, stop, options)
+                elapsed += time.perf_counter() - began
+
+            cursor.execute(
+                "SELECT indexrelid::regclass::text FROM pg_index JOIN pg_class "
+                "ON pg_class.oid = indexrelid JOIN pg_am ON pg_am.oid = relam "
+                "WHERE indrelid = %s::regclass AND amname = 'brin'",
+                [BENCH_TABLE],
+            )
+            for (brin,) in cursor.fetchall():
+                # autosummarize does this in the background after the inserts
+                cursor.execute("SELECT brin_summarize_new_values(%s::regclass)", [brin])
+            cursor.execute(f"ANALYZE {BENCH_TABLE}")
+
+            span = timedelta(seconds=options["interval"] * options["rows"] // options["cities"])
+            middle = START + span / 2
+            params = {"from": middle, "to": middle + timedelta(days=1), "city": "City 0"}
+            timings = {}
+            for scan, sql in SCANS.items():
+                runs = []
+                for _ in range(options["repeats"]):
+                    began = time.perf_counter()
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                    runs.append((time.perf_counter() - began) * 1000)
+                timings[scan] = statistics.fmean(runs)
+
+            cursor.execute("SELECT pg_indexes_size(%s::regclass)", [BENCH_TABLE])
+            (size,) = cursor.fetchone()
+
+        rate = options["rows"] / elapsed if elapsed else 0
+        scans = " ".join(f"{timings[scan]:>11.3f}" for scan in SCANS)
+        self.stdout.write(f"{name:<24} {rate:>10.0f} {scans} {size / 2**20:>9.2f}")
+
+    def insert_readings(self, cursor, start, stop, options):
+        """Readings `start` to `stop`, one city after the other in time order."""
+        cursor.execute(
+            f"""
+            INSERT INTO {BENCH_TABLE}
+                (id, city_name, country_code, longitude, latitude, weather_id, weather_main,
+                 weather_description, weather_icon, temperature, feels_like, temp_min,
+                 temp_max, pressure, humidity, visibility, wind_speed, wind_degree, clouds,
+                 sunrise, sunset, api_timestamp, timezone_offset, is_active, created_at,
+                 updated_at)
+            SELECT
+                i + 1, 'City ' || i %% %(cities)s, 'RU', 37.6, 55.7, 800, 'Clear', 'clear sky',
+                '01d', 270 + i %% 30, 268 + i %% 30, 265 + i %% 30, 275 + i %% 30,
+                1000 + i %% 30, i %% 100, 10000, i %% 15, i %% 360, i %% 100,
+                moment, moment, moment, 10800, true, moment, moment
+            FROM generate_series(%(start)s, %(stop)s - 1) AS i,
+                LATERAL (
+                    SELECT %(origin)s::timestamptz
+                        + make_interval(secs => i / %(cities)s * %(interval)s) AS moment
+                ) AS reading
+            """,
+            {
+                "cities": options["cities"],
+                "interval": options["interval"],
+                "origin": START,
+                "start": start,
+                "stop": stop,
+            },
+        )
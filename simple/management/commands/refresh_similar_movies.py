@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from simple.api.movies.similarity import refresh_similar_movies
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed similar movies of the movies that changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute the similar movies of every movie",
+        )
+
+    def handle(self, *args, **options):
+        written = refresh_similar_movies(full=options["full"])
+        self.stdout.write(f"{written} similar movie lists written")
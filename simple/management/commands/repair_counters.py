@@ -0,0 +1,56 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from simple.models.common import DatabaseCountersMixin
+
+
+class Command(BaseCommand):
+    help = "Recount the trigger-maintained counter columns (movies_count, books_count)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the rows whose counters are wrong",
+        )
+
+    def handle(self, *args, **options):
+        models = [
+            model
+            for model in apps.get_app_config("simple").get_models()
+            if issubclass(model, DatabaseCountersMixin)
+        ]
+        for model in models:
+            for counter, relation in model.counter_fields.items():
+                with transaction.atomic():
+                    fixed = self.repair(model, counter, relation, options["dry_run"])
+                self.stdout.write(f"{model._meta.label}.{counter}: {fixed} wrong")
+
+    def repair(self, model, counter, relation, dry_run):
+        """
+        Set `counter` to the actual number of related rows where it drifted,
+        return the number of such rows.
+        """
+        remote_field = model._meta.get_field(relation).field
+        actual = Coalesce(
+            Subquery(
+                remote_field.model._base_manager.filter(**{remote_field.name: OuterRef("pk")})
+                .order_by()
+                .values(remote_field.name)
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            Value(0),
+        )
+        drifted = list(
+            model._base_manager.select_for_update()
+            .annotate(actual=actual)
+            .exclude(**{counter: F("actual")})
+            .values_list("pk", flat=True)
+        )
+        if drifted and not dry_run:
+            model._default_manager.filter(pk__in=drifted).update(**{counter: actual})
+        return len(drifted)
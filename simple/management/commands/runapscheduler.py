@@ -9,7 +9,9 @@ from django_apscheduler.jobstores import DjangoJobStore
 from django_apscheduler.models import DjangoJobExecution
 from django_dramatiq.tasks import delete_old_tasks
 
+from simple.api.movies.similarity import refresh_similar_movies
 from simple.processes.get_weather import get_weather_data
+from simple.processes.partitions import maintain_weather_partitions
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +36,7 @@ def fetch_weather_data():
     Fetch weather data from OpenWeatherMap API and save to database.
     """
     logger.info("Starting weather data fetch job...")
-    success, message = get_weather_data()
+    success, message, _ = get_weather_data()
 
     if success:
         logger.info(f"Weather data fetch successful: {message}")
@@ -42,6 +44,28 @@ def fetch_weather_data():
         logger.error(f"Weather data fetch failed: {message}")
 
 
+@util.close_old_connections
+def maintain_weather_partitions_job():
+    """
+    Create the upcoming monthly weather partitions and drop the expired ones.
+    """
+    created, removed, deleted = maintain_weather_partitions()
+    logger.info(
+        f"Weather partitions maintained: created {created}, removed {removed}, "
+        f"{deleted} rows deleted"
+    )
+
+
+@util.close_old_connections
+def refresh_similar_movies_job(full=False):
+    """
+    Recompute the similar movies of the movies changed since the last run,
+    or of every movie with `full`.
+    """
+    written = refresh_similar_movies(full=full)
+    logger.info(f"Similar movies refreshed: {written} lists written")
+
+
 class Command(BaseCommand):
     help = "Runs APScheduler."
 
@@ -69,6 +93,34 @@ class Command(BaseCommand):
         )
         logger.info("Added periodic job (every 5 minutes): 'fetch_weather_data'.")
 
+        scheduler.add_job(
+            maintain_weather_partitions_job,
+            trigger=CronTrigger(hour="00", minute="15"),
+            id="maintain_weather_partitions",
+            max_instances=1,
+            replace_existing=True,
+        )
+        logger.info("Added daily job: 'maintain_weather_partitions'.")
+
+        scheduler.add_job(
+            refresh_similar_movies_job,
+            trigger=CronTrigger(minute="*/10"),
+            id="refresh_similar_movies",
+            max_instances=1,
+            replace_existing=True,
+        )
+        logger.info("Added periodic job (every 10 minutes): 'refresh_similar_movies'.")
+
+        scheduler.add_job(
+            refresh_similar_movies_job,
+            trigger=CronTrigger(hour="03", minute="30"),
+            kwargs={"full": True},
+            id="rebuild_similar_movies",
+            max_instances=1,
+            replace_existing=True,
+        )
+        logger.info("Added daily job: 'rebuild_similar_movies'.")
+
         try:
             logger.info("Starting scheduler...")
             scheduler.start()
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from simple.processes.partitions import maintain_weather_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the upcoming monthly partitions of the weather table and drop "
+        "the data older than the retention period."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=settings.WEATHER_PARTITIONS_AHEAD,
+            help="Months of partitions to create ahead of the current one",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.WEATHER_RETENTION_DAYS,
+            help="Age in days of the rows to drop",
+        )
+        parser.add_argument(
+            "--detach",
+            action="store_true",
+            help="Detach the expired partitions instead of dropping them",
+        )
+
+    def handle(self, *args, **options):
+        created, removed, deleted = maintain_weather_partitions(
+            ahead=options["ahead"],
+            retention_days=options["retention_days"],
+            detach=options["detach"],
+        )
+        for name in created:
+            self.stdout.write(f"created {name}")
+        for name in removed:
+            self.stdout.write(f"{'detached' if options['detach'] else 'dropped'} {name}")
+        self.stdout.write(f"{deleted} expired rows deleted")
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone as django_timezone
+
+from simple.factories.weather import WeatherFactory
+from simple.models import Weather, WeatherDaily, WeatherHourly
+from simple.processes.rollups import METRIC_FIELDS
+
+
+def reading(city, day, hour, minute, temperature, weather_main="Clouds", month=None, **kwargs):
+    month = month or datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return WeatherFactory.create(
+        city_name=city,
+        temperature=temperature,
+        weather_main=weather_main,
+        api_timestamp=month + timedelta(days=day - 1, hours=hour, minutes=minute),
+        **kwargs,
+    )
+
+
+def rollups(model):
+    fields = ["city_name", "bucket", "samples", *METRIC_FIELDS, "weather_main"]
+    return [
+        {**row, **{field: pytest.approx(row[field]) for field in METRIC_FIELDS}}
+        for row in model.objects.values(*fields, "weather_main_counts")
+    ]
+
+
+@pytest.fixture
+def readings(db):
+    return [
+        reading("Moscow", 1, 10, 5, 280.0, "Rain", wind_speed=2.0),
+        reading("Moscow", 1, 10, 35, 284.0, "Clear", wind_speed=4.0),
+        reading("Moscow", 1, 10, 50, 283.0, "Clear", wind_speed=3.0),
+        reading("Moscow", 1, 23, 55, 270.0, "Snow"),
+        reading("Moscow", 2, 0, 5, 269.0, "Snow"),
+        reading("Kazan", 1, 10, 20, 275.0),
+    ]
+
+
+def test_readings_are_rolled_up_as_saved(readings):
+    hour = WeatherHourly.objects.get(
+        city_name="Moscow", bucket=datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+    )
+    assert hour.samples == 3
+    assert (hour.temperature_min, hour.temperature_max) == (280.0, 284.0)
+    assert hour.temperature_avg == pytest.approx(282.333333)
+    assert hour.wind_speed_avg == pytest.approx(3.0)
+    assert (hour.weather_main, hour.weather_main_counts) == ("Clear", {"Rain": 1, "Clear": 2})
+
+    days = WeatherDaily.objects.filter(city_name="Moscow").values_list("bucket__day", "samples")
+    assert list(days) == [(1, 4), (2, 1)]
+    assert WeatherHourly.objects.count() == 4
+
+
+@pytest.fixture
+def recent_readings(db):
+    # Readings of days still within the retention
+    month = django_timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    month -= timedelta(days=10)
+    return [
+        reading("Moscow", 1, 10, 5, 280.0, "Rain", month=month, wind_speed=2.0),
+        reading("Moscow", 1, 10, 35, 284.0, "Clear", month=month, wind_speed=4.0),
+        reading("Moscow", 1, 10, 50, 283.0, "Clear", month=month, wind_speed=3.0),
+        reading("Moscow", 1, 23, 55, 270.0, "Snow", month=month),
+        reading("Moscow", 2, 0, 5, 269.0, "Snow", month=month),
+        reading("Kazan", 1, 10, 20, 275.0, month=month),
+    ]
+
+
+def test_backfill_matches_incremental_rollups(recent_readings):
+    incremental = {model: rollups(model) for model in (WeatherHourly, WeatherDaily)}
+    WeatherHourly.objects.all().delete()
+    WeatherDaily.objects.all().delete()
+    out = StringIO()
+
+    call_command("backfill_weather_rollups", chunk_days=1, stdout=out)
+
+    assert out.getvalue() == "7 rollup rows written\n"
+    for model, rows in incremental.items():
+        assert rollups(model) == rows
+
+
+def test_changed_and_deleted_readings_are_retracted_from_old_rollups(readings):
+    readings[0].city_name = "Kazan"
+    readings[0].save()
+    readings[5].delete()
+
+    hour = WeatherHourly.objects.get(
+        city_name="Moscow", bucket=datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+    )
+    assert (hour.samples, hour.weather_main, hour.weather_main_counts) == (
+        2,
+        "Clear",
+        {"Clear": 2},
+    )
+    assert hour.temperature_avg == pytest.approx(283.5)
+    # The min and max of buckets past the retention cannot be recomputed
+    assert hour.temperature_min == 280.0
+    kazan = WeatherDaily.objects.get(city_name="Kazan")
+    assert (kazan.samples, kazan.weather_main, kazan.weather_main_counts) == (
+        1,
+        "Rain",
+        {"Rain": 1},
+    )
+
+    # Rollups outlive the readings expired by the retention
+    Weather.objects.filter(pk=readings[1].pk)._raw_delete("default")
+    readings[2].delete()
+    assert WeatherHourly.objects.get(pk=hour.pk).samples == 1
+    moscow = WeatherDaily.objects.get(city_name="Moscow", bucket__day=1)
+    assert moscow.samples == 2
+    call_command("backfill_weather_rollups", stdout=StringIO())
+    assert WeatherDaily.objects.count() == 3
+
+
+def test_changed_readings_rebuild_retained_rollups(db):
+    hour = django_timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    coldest, warmest = (
+        WeatherFactory.create(api_timestamp=hour + timedelta(minutes=minute), temperature=value)
+        for minute, value in [(5, 270.0), (10, 280.0)]
+    )
+
+    coldest.temperature = 275.0
+    coldest.save()
+    rollup = WeatherHourly.objects.get(bucket=hour)
+    assert (rollup.samples, rollup.temperature_min, rollup.temperature_max) == (2, 275.0, 280.0)
+
+    warmest.delete()
+    coldest.delete()
+    assert not WeatherHourly.objects.exists()
+
+
+def test_backfill_keeps_rollups_past_the_retention(recent_readings, settings):
+    expired_day = django_timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    expired_day -= timedelta(days=settings.WEATHER_RETENTION_DAYS)
+    expired = [
+        reading("Moscow", 1, 10, minute, 280.0 + minute, month=expired_day)
+        for minute in (5, 15)
+    ]
+    kept = {model: rollups(model) for model in (WeatherHourly, WeatherDaily)}
+    # The retention deletes part of the readings of the oldest stored day
+    Weather.objects.filter(pk=expired[0].pk)._raw_delete("default")
+    WeatherHourly.objects.filter(bucket__gte=expired_day + timedelta(days=1)).delete()
+    WeatherDaily.objects.filter(bucket__gte=expired_day + timedelta(days=1)).delete()
+
+    call_command("backfill_weather_rollups", stdout=StringIO())
+
+    for model, rows in kept.items():
+        assert rollups(model) == rows
@@ -0,0 +1,18 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from simple.models import Movie, MovieCategory
+
+
+def test_benchmark_next_active_movie_rolls_back(db):
+    out = StringIO()
+
+    call_command(
+        "benchmark_next_active_movie", sizes="200,400", active_every=10, claims=5, stdout=out
+    )
+
+    rows = out.getvalue().splitlines()[1:]
+    assert [row.split()[:2] for row in rows] == [["200", "20"], ["400", "35"]]
+    assert not Movie.objects.exists()
+    assert not MovieCategory.objects.exists()
@@ -0,0 +1,19 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+
+from simple.models import Weather
+
+
+def test_benchmark_weather_indexes_rolls_back(db):
+    out = StringIO()
+
+    call_command(
+        "benchmark_weather_indexes", rows=300, batch=100, cities=3, repeats=2, stdout=out
+    )
+
+    rows = out.getvalue().splitlines()[1:]
+    assert [row.split()[0] for row in rows] == ["0011_partition_weather", "current"]
+    assert not Weather.objects.exists()
+    assert "simple_weather_bench" not in connection.introspection.table_names()
@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models.signals import post_save
+
+from simple.factories.author import AuthorFactory
+from simple.factories.book import BookFactory
+from simple.factories.category import MovieCategoryFactory
+from simple.factories.movie import MovieFactory
+from simple.models import Author, MovieCategory
+
+
+def test_counters_follow_inserts_moves_and_deletes(db):
+    drama = MovieCategoryFactory.create(name="Drama", slug="drama")
+    comedy = MovieCategoryFactory.create(name="Comedy", slug="comedy")
+    movies = [
+        MovieFactory.create(title=f"Movie {index}", slug=f"movie-{index}", category=drama)
+        for index in range(3)
+    ]
+
+    movies[0].category = comedy
+    movies[0].save()
+    movies[1].delete()
+    drama.name = "Drama (stale instance)"
+    drama.save()
+
+    counts = dict(MovieCategory.objects.values_list("slug", "movies_count"))
+    assert counts == {"drama": 1, "comedy": 1}
+
+
+def test_repair_counters(db):
+    author = AuthorFactory.create(first_name="Anna", last_name="Akhmatova")
+    BookFactory.create(author=author, title="Evening", slug="evening", page_count=100)
+    Author.objects.filter(pk=author.pk).update(books_count=7)
+    out = StringIO()
+
+    call_command("repair_counters", stdout=out)
+
+    assert "simple.Author.books_count: 1 wrong" in out.getvalue()
+    assert Author.objects.get(pk=author.pk).books_count == 1
+
+
+def test_saves_keep_the_trigger_counters(db):
+    received = []
+    category = MovieCategoryFactory.create(name="Drama", slug="drama")
+    MovieFactory.create(title="Movie", slug="movie", category=category)
+
+    def receiver(sender, update_fields, **kwargs):
+        received.append(update_fields)
+
+    post_save.connect(receiver, sender=MovieCategory)
+    try:
+        category.save()
+        category.save(update_fields=["name"])
+    finally:
+        post_save.disconnect(receiver, sender=MovieCategory)
+    assert received == [None, frozenset({"name"})]
+    assert category.movies_count == 1
+    assert MovieCategory.objects.get(pk=category.pk).movies_count == 1
+
+    # A deleted row is inserted again, with the in-memory counters
+    comedy = MovieCategoryFactory.create(name="Comedy", slug="comedy")
+    MovieCategory.objects.filter(pk=comedy.pk).delete()
+    comedy.save()
+    assert MovieCategory.objects.get(pk=comedy.pk).movies_count == 0
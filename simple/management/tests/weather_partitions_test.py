@@ -0,0 +1,60 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from simple.factories.weather import WeatherFactory
+from simple.models import Weather
+from simple.processes.partitions import (
+    add_months,
+    maintain_weather_partitions,
+    month_start,
+    weather_partitions,
+)
+
+
+def partition_rows():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text, count(*) FROM simple_weather GROUP BY 1"
+        )
+        return dict(cursor.fetchall())
+
+
+def test_partitions_created_ahead_take_rows_from_default(db):
+    now = timezone.now()
+    later = add_months(month_start(now), 6)
+    weather = WeatherFactory.create()
+    Weather.objects.filter(pk=weather.pk).update(created_at=later + timedelta(days=2))
+    assert partition_rows() == {"simple_weather_default": 1}
+
+    created = weather_partitions.ensure(later, ahead=1)
+
+    assert created == [
+        weather_partitions.name(later),
+        weather_partitions.name(add_months(later, 1)),
+    ]
+    assert partition_rows() == {weather_partitions.name(later): 1}
+    assert weather_partitions.ensure(later, ahead=1) == []
+
+
+def test_retention_drops_expired_partitions(db):
+    now = timezone.now()
+    current = month_start(now)
+    old = WeatherFactory.create()
+    recent = WeatherFactory.create()
+    Weather.objects.filter(pk=old.pk).update(created_at=now - timedelta(days=75))
+    Weather.objects.filter(pk=recent.pk).update(created_at=now - timedelta(days=1))
+    weather_partitions.ensure(add_months(current, -3), ahead=3)
+
+    out = StringIO()
+    call_command("weather_partitions", "--retention-days", "30", stdout=out)
+
+    assert list(Weather.objects.values_list("pk", flat=True)) == [recent.pk]
+    assert f"dropped {weather_partitions.name(add_months(current, -3))}" in out.getvalue()
+    partitions = weather_partitions.partitions()
+    assert add_months(current, -3) not in partitions
+    assert add_months(current, 3) in partitions
+    assert maintain_weather_partitions(now=now, retention_days=30) == ([], [], 0)
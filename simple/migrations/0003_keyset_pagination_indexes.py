@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0002_alter_weather_wind_degree"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                fields=["last_name", "first_name", "id"],
+                name="simple_auth_last_na_a256a4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["-publication_date", "title", "id"],
+                name="simple_book_publica_ed27c4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["author", "-publication_date", "title", "id"],
+                name="simple_book_author__08db8d_idx",
+            ),
+        ),
+    ]
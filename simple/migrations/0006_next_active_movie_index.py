@@ -0,0 +1,21 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0005_trigram_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-release_date", "title", "id"],
+                name="simple_movie_next_active",
+            ),
+        ),
+    ]
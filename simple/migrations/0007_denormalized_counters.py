@@ -0,0 +1,105 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:51
+
+from django.db import migrations, models
+
+
+def counter_triggers(child, fk, parent, counter):
+    """
+    Statement-level triggers keeping `parent.counter` equal to the number of
+    `child` rows pointing at it through `fk` on insert, delete and update
+    (reassignment), followed by a backfill of the current counts.
+    """
+    name = f"{child}_{counter}"
+
+    def apply_delta(changes):
+        return f"""
+            UPDATE {parent} AS parent SET {counter} = parent.{counter} + delta.value
+            FROM (
+                SELECT {fk}, sum(value) AS value FROM ({changes}) AS changes GROUP BY {fk}
+            ) AS delta
+            WHERE parent.id = delta.{fk} AND delta.value <> 0;
+        """
+
+    moved = (
+        "FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id "
+        f"WHERE old_rows.{fk} IS DISTINCT FROM new_rows.{fk}"
+    )
+    functions = {
+        "insert": apply_delta(f"SELECT {fk}, 1 AS value FROM new_rows"),
+        "delete": apply_delta(f"SELECT {fk}, -1 AS value FROM old_rows"),
+        "update": apply_delta(
+            f"SELECT new_rows.{fk} AS {fk}, 1 AS value {moved} "
+            f"UNION ALL SELECT old_rows.{fk}, -1 {moved}"
+        ),
+    }
+    transition_tables = {
+        "insert": "NEW TABLE AS new_rows",
+        "delete": "OLD TABLE AS old_rows",
+        "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    }
+
+    forward = [
+        f"""
+        CREATE FUNCTION {name}_{event}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            {body}
+            RETURN NULL;
+        END $$;
+        CREATE TRIGGER {name}_{event} AFTER {event.upper()} ON {child}
+            REFERENCING {transition_tables[event]}
+            FOR EACH STATEMENT EXECUTE FUNCTION {name}_{event}();
+        """
+        for event, body in functions.items()
+    ]
+    forward.append(
+        f"""
+        UPDATE {parent} AS parent SET {counter} = (
+            SELECT count(*) FROM {child} WHERE {child}.{fk} = parent.id
+        );
+        """
+    )
+    reverse = [
+        f"DROP TRIGGER {name}_{event} ON {child}; DROP FUNCTION {name}_{event}();"
+        for event in functions
+    ]
+    return migrations.RunSQL(forward, reverse)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0006_next_active_movie_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="books_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of books of this author, maintained by database triggers",
+                verbose_name="Books Count",
+            ),
+        ),
+        migrations.AddField(
+            model_name="moviecategory",
+            name="movies_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of movies in this category, maintained by database triggers",
+                verbose_name="Movies Count",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["books_count"], name="simple_auth_books_c_f97a18_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="moviecategory",
+            index=models.Index(fields=["movies_count"], name="simple_movi_movies__569b8d_idx"),
+        ),
+        counter_triggers("simple_movie", "category_id", "simple_moviecategory", "movies_count"),
+        counter_triggers("simple_book", "author_id", "simple_author", "books_count"),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0007_denormalized_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["category", "-release_date", "title", "id"],
+                name="simple_movie_category_browse",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                fields=["category", "rating"], name="simple_movie_category_rating"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.5 on 2026-10-18 17:57
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0008_movie_browse_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MovieSimilarity",
+            fields=[
+                (
+                    "movie",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="similarity",
+                        serialize=False,
+                        to="simple.movie",
+                        verbose_name="Movie",
+                    ),
+                ),
+                (
+                    "similar_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(),
+                        default=list,
+                        help_text="IDs of the most similar movies, most similar first",
+                        size=None,
+                        verbose_name="Similar Movies",
+                    ),
+                ),
+                (
+                    "scores",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.FloatField(),
+                        default=list,
+                        help_text="Cosine similarity of each of the similar movies",
+                        size=None,
+                        verbose_name="Scores",
+                    ),
+                ),
+                (
+                    "is_stale",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Whether the neighbours must be recomputed",
+                        verbose_name="Stale",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+            ],
+            options={
+                "verbose_name": "Movie Similarity",
+                "verbose_name_plural": "Movie Similarities",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("is_stale", True)),
+                        fields=["movie"],
+                        name="simple_moviesim_stale",
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["similar_ids"], name="simple_moviesim_similar_gin"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:00
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+import re
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+NAME_SEPARATORS = re.compile(r"\s*(?:[,;&/]|\band\b)\s*", re.IGNORECASE)
+BATCH_SIZE = 2000
+
+
+def link_directors(apps, schema_editor):
+    """
+    Split the `director` strings of the existing movies into directors
+    ("Lana Wachowski, Lilly Wachowski" names two) and link them.
+    """
+    Movie = apps.get_model("simple", "Movie")
+    Director = apps.get_model("simple", "Director")
+    Through = Movie.directors.through
+
+    movies = Movie.objects.exclude(director="").order_by("pk").values_list("pk", "director")
+    links = []
+    directors = {}
+    for movie_id, director in movies.iterator(chunk_size=BATCH_SIZE):
+        slugs = {}
+        for name in NAME_SEPARATORS.split(director):
+            name = " ".join(name.split())
+            slug = slugify(name, allow_unicode=True)[:255]
+            if slug:
+                slugs.setdefault(slug, name)
+        directors.update((slug, name) for slug, name in slugs.items() if slug not in directors)
+        links.extend((movie_id, slug) for slug in slugs)
+
+    Director.objects.bulk_create(
+        [Director(name=name, slug=slug) for slug, name in directors.items()],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    director_ids = dict(Director.objects.values_list("slug", "pk"))
+    Through.objects.bulk_create(
+        [
+            Through(movie_id=movie_id, director_id=director_ids[slug])
+            for movie_id, slug in links
+        ],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0009_movie_similarity"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="movie",
+            name="director",
+            field=models.CharField(
+                blank=True,
+                help_text="Movie director(s), comma-separated display string",
+                max_length=255,
+                verbose_name="Director",
+            ),
+        ),
+        migrations.CreateModel(
+            name="Director",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Full name of the director",
+                        max_length=255,
+                        verbose_name="Name",
+                    ),
+                ),
+                (
+                    "slug",
+                    models.SlugField(
+                        allow_unicode=True,
+                        help_text="URL-friendly name, unique per person",
+                        max_length=255,
+                        unique=True,
+                        verbose_name="Slug",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated at"),
+                ),
+            ],
+            options={
+                "verbose_name": "Director",
+                "verbose_name_plural": "Directors",
+                "ordering": ["name"],
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="simple_director_name_trgm",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="movie",
+            name="directors",
+            field=models.ManyToManyField(
+                blank=True,
+                help_text="Directors listed in `director`, kept in sync with it",
+                related_name="movies",
+                to="simple.director",
+                verbose_name="Directors",
+            ),
+        ),
+        migrations.RunPython(link_directors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+TABLE = "simple_weather"
+# Months of partitions created ahead of the current one
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def rebuild(cursor, partitioned):
+    """
+    Recreate `simple_weather` (partitioned by month on `created_at` or not)
+    with the same columns, defaults, constraints, indexes and rows.
+    """
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+        [TABLE, f"{TABLE}_pkey"],
+    )
+    indexes = [definition for (definition,) in cursor.fetchall()]
+    cursor.execute(f"SELECT min(created_at), max(id) FROM {TABLE}")
+    first, last_id = cursor.fetchone()
+
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_old")
+    cursor.execute(
+        f"ALTER TABLE {TABLE}_old RENAME CONSTRAINT {TABLE}_pkey TO {TABLE}_old_pkey"
+    )
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [f"{TABLE}_old"])
+    (sequence,) = cursor.fetchone()
+    if sequence:
+        cursor.execute(f"ALTER SEQUENCE {sequence} RENAME TO {TABLE}_old_id_seq")
+    cursor.execute(
+        f"CREATE TABLE {TABLE} (LIKE {TABLE}_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        + (" PARTITION BY RANGE (created_at)" if partitioned else "")
+    )
+    if partitioned:
+        # Identity columns are not allowed on partitioned tables before
+        # PostgreSQL 17, number the rows with an owned sequence instead
+        cursor.execute(f"CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')"
+        )
+        # The primary key of a partitioned table must include the partition key
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)"
+        )
+
+        now = datetime.now(timezone.utc)
+        month = datetime((first or now).year, (first or now).month, 1, tzinfo=timezone.utc)
+        last = add_months(datetime(now.year, now.month, 1, tzinfo=timezone.utc), MONTHS_AHEAD)
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [month, add_months(month, 1)],
+            )
+            month = add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    else:
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)")
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id DROP DEFAULT")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"
+        )
+
+    cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {TABLE}_old")
+    cursor.execute(f"DROP TABLE {TABLE}_old CASCADE")
+    if last_id is not None:
+        cursor.execute("SELECT setval(pg_get_serial_sequence(%s, 'id'), %s)", [TABLE, last_id])
+    for definition in indexes:
+        cursor.execute(definition)
+
+
+def partition_weather(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        rebuild(cursor, partitioned=True)
+
+
+def unpartition_weather(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        rebuild(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0010_movie_directors"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_weather, unpartition_weather),
+    ]
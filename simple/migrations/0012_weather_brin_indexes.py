@@ -0,0 +1,56 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:06
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0011_partition_weather"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="weather",
+            name="simple_weat_city_na_a963df_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="weather",
+            name="simple_weat_country_968527_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="weather",
+            name="simple_weat_created_f3d371_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="weather",
+            name="simple_weat_is_acti_d8df4f_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="weather",
+            name="simple_weat_tempera_33d454_idx",
+        ),
+        migrations.AddIndex(
+            model_name="weather",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                autosummarize=True,
+                fields=["created_at"],
+                name="simple_weather_created_brin",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weather",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                autosummarize=True,
+                fields=["api_timestamp"],
+                name="simple_weather_api_ts_brin",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weather",
+            index=models.Index(
+                fields=["city_name", "-api_timestamp"], name="simple_weather_city_ts"
+            ),
+        ),
+    ]
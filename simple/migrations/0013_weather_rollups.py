@@ -0,0 +1,183 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0012_weather_brin_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeatherDaily",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "city_name",
+                    models.CharField(max_length=100, verbose_name="City Name"),
+                ),
+                (
+                    "bucket",
+                    models.DateTimeField(
+                        help_text="Start of the aggregated period",
+                        verbose_name="Bucket",
+                    ),
+                ),
+                (
+                    "samples",
+                    models.PositiveIntegerField(
+                        help_text="Number of readings aggregated",
+                        verbose_name="Samples",
+                    ),
+                ),
+                ("temperature_min", models.FloatField(verbose_name="Min Temperature")),
+                ("temperature_avg", models.FloatField(verbose_name="Avg Temperature")),
+                ("temperature_max", models.FloatField(verbose_name="Max Temperature")),
+                ("humidity_min", models.FloatField(verbose_name="Min Humidity (%)")),
+                ("humidity_avg", models.FloatField(verbose_name="Avg Humidity (%)")),
+                ("humidity_max", models.FloatField(verbose_name="Max Humidity (%)")),
+                ("pressure_min", models.FloatField(verbose_name="Min Pressure (hPa)")),
+                ("pressure_avg", models.FloatField(verbose_name="Avg Pressure (hPa)")),
+                ("pressure_max", models.FloatField(verbose_name="Max Pressure (hPa)")),
+                (
+                    "wind_speed_min",
+                    models.FloatField(verbose_name="Min Wind Speed (m/s)"),
+                ),
+                (
+                    "wind_speed_avg",
+                    models.FloatField(verbose_name="Avg Wind Speed (m/s)"),
+                ),
+                (
+                    "wind_speed_max",
+                    models.FloatField(verbose_name="Max Wind Speed (m/s)"),
+                ),
+                (
+                    "weather_main",
+                    models.CharField(
+                        help_text="Most frequent weather parameters group",
+                        max_length=50,
+                        verbose_name="Weather Main",
+                    ),
+                ),
+                (
+                    "weather_main_counts",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Number of readings of each weather parameters group",
+                        verbose_name="Weather Main Counts",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Weather",
+                "verbose_name_plural": "Daily Weather",
+                "ordering": ["city_name", "bucket"],
+                "abstract": False,
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("city_name", "bucket"),
+                        name="simple_weatherdaily_city_bucket",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="WeatherHourly",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "city_name",
+                    models.CharField(max_length=100, verbose_name="City Name"),
+                ),
+                (
+                    "bucket",
+                    models.DateTimeField(
+                        help_text="Start of the aggregated period",
+                        verbose_name="Bucket",
+                    ),
+                ),
+                (
+                    "samples",
+                    models.PositiveIntegerField(
+                        help_text="Number of readings aggregated",
+                        verbose_name="Samples",
+                    ),
+                ),
+                ("temperature_min", models.FloatField(verbose_name="Min Temperature")),
+                ("temperature_avg", models.FloatField(verbose_name="Avg Temperature")),
+                ("temperature_max", models.FloatField(verbose_name="Max Temperature")),
+                ("humidity_min", models.FloatField(verbose_name="Min Humidity (%)")),
+                ("humidity_avg", models.FloatField(verbose_name="Avg Humidity (%)")),
+                ("humidity_max", models.FloatField(verbose_name="Max Humidity (%)")),
+                ("pressure_min", models.FloatField(verbose_name="Min Pressure (hPa)")),
+                ("pressure_avg", models.FloatField(verbose_name="Avg Pressure (hPa)")),
+                ("pressure_max", models.FloatField(verbose_name="Max Pressure (hPa)")),
+                (
+                    "wind_speed_min",
+                    models.FloatField(verbose_name="Min Wind Speed (m/s)"),
+                ),
+                (
+                    "wind_speed_avg",
+                    models.FloatField(verbose_name="Avg Wind Speed (m/s)"),
+                ),
+                (
+                    "wind_speed_max",
+                    models.FloatField(verbose_name="Max Wind Speed (m/s)"),
+                ),
+                (
+                    "weather_main",
+                    models.CharField(
+                        help_text="Most frequent weather parameters group",
+                        max_length=50,
+                        verbose_name="Weather Main",
+                    ),
+                ),
+                (
+                    "weather_main_counts",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Number of readings of each weather parameters group",
+                        verbose_name="Weather Main Counts",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Hourly Weather",
+                "verbose_name_plural": "Hourly Weather",
+                "ordering": ["city_name", "bucket"],
+                "abstract": False,
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("city_name", "bucket"),
+                        name="simple_weatherhourly_city_bucket",
+                    )
+                ],
+            },
+        ),
+    ]
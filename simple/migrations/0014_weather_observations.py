@@ -0,0 +1,55 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0013_weather_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeatherObservation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "city_name",
+                    models.CharField(max_length=100, verbose_name="City Name"),
+                ),
+                ("api_timestamp", models.DateTimeField(verbose_name="API Timestamp")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created At"),
+                ),
+            ],
+            options={
+                "verbose_name": "Weather Observation",
+                "verbose_name_plural": "Weather Observations",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("city_name", "api_timestamp"),
+                        name="simple_weather_observation_unique",
+                    )
+                ],
+            },
+        ),
+        # Claim the observations already stored, duplicates included
+        migrations.RunSQL(
+            """
+            INSERT INTO simple_weatherobservation (city_name, api_timestamp, created_at)
+            SELECT city_name, api_timestamp, min(created_at) FROM simple_weather
+            GROUP BY city_name, api_timestamp
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
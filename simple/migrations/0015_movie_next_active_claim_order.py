@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:36
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple", "0014_weather_observations"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="movie",
+            name="simple_movie_next_active",
+        ),
+        migrations.AddIndex(
+            model_name="movie",
+            index=models.Index(
+                models.OrderBy(models.F("release_date"), descending=True),
+                django.db.models.functions.comparison.Collate("title", "C"),
+                models.F("id"),
+                condition=models.Q(("is_active", True)),
+                name="simple_movie_next_active",
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
 # flake8: noqa: E401
 
-from .models import Movie, MovieCategory, Author
-from .weather import Weather
+from .models import Movie, MovieCategory, Author, Director
+from .weather import Weather, WeatherDaily, WeatherHourly, WeatherObservation
@@ -1,7 +1,16 @@
+import operator
+import re
 from enum import Enum
+from functools import reduce
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import router, transaction
+from django.db.models.functions import Upper
 
 
 IP_REGEX = r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$"
+NAME_SEPARATORS = re.compile(r"\s*(?:[,;&/]|\band\b)\s*", re.IGNORECASE)
 
 
 class EnumChoices(Enum):
@@ -32,3 +41,75 @@ class EnumChoices(Enum):
     def names(cls):
         """Returns list of enum names"""
         return [key.name for key in cls]
+
+
+def trigram_index(field_name, name):
+    """
+    GIN trigram index on `UPPER(field)`.
+
+    Serves `icontains` lookups (`UPPER(col::text) LIKE UPPER('%term%')`),
+    e.g. the admin changelist search. Requires the pg_trgm extension.
+    """
+    return GinIndex(OpClass(Upper(field_name), name="gin_trgm_ops"), name=name)
+
+
+def weighted_search_vector(config, **weights):
+    """
+    Concatenated search vectors of the fields given with their weight,
+    e.g. `weighted_search_vector("english", title="A", description="B")`.
+    """
+    return reduce(
+        operator.add,
+        (
+            SearchVector(field, weight=weight, config=config)
+            for field, weight in weights.items()
+        ),
+    )
+
+
+class DatabaseCountersMixin:
+    """
+    Model with counter columns maintained by database triggers.
+
+    `counter_fields` maps each counter field to the reverse relation it
+    counts, e.g. `{"movies_count": "movies"}`. Saving an existing instance
+    first reads the counters back from its row, locked until the save
+    commits, so a stale in-memory value cannot overwrite what the triggers
+    maintain. `update_fields` is passed through untouched; a save that
+    names counters in it writes them as given, and saving an instance
+    whose row is gone inserts it with its in-memory counters.
+    """
+
+    counter_fields = {}
+
+    def save(self, *args, **kwargs):
+        inserting = self._state.adding or kwargs.get("force_insert")
+        if inserting or kwargs.get("update_fields") is not None:
+            return super().save(*args, **kwargs)
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            counters = (
+                type(self)
+                ._base_manager.using(using)
+                .select_for_update()
+                .filter(pk=self.pk)
+                .values(*self.counter_fields)
+                .first()
+            )
+            for name, value in (counters or {}).items():
+                setattr(self, name, value)
+            super().save(*args, **kwargs)
+
+
+def split_names(value):
+    """
+    Names listed in a free-text field such as `Movie.director`
+    ("Lana Wachowski, Lilly Wachowski"), whitespace collapsed, in order and
+    without case-insensitive duplicates.
+    """
+    names = {}
+    for name in NAME_SEPARATORS.split(value or ""):
+        name = " ".join(name.split())
+        if name:
+            names.setdefault(name.lower(), name)
+    return list(names.values())
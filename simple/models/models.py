@@ -1,10 +1,21 @@
 from datetime import date
+from decimal import Decimal
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models.functions import Collate
 
+from simple.models.common import DatabaseCountersMixin, trigram_index, weighted_search_vector
+from simple.models.querysets import MovieQuerySet, UpdateNotifyingQuerySet
 
-class MovieCategory(models.Model):
+# Text search configuration of the stored search vectors
+SEARCH_CONFIG = "english"
+
+
+class MovieCategory(DatabaseCountersMixin, models.Model):
     """
     Model for movie categories.
 
@@ -33,6 +44,12 @@ class MovieCategory(models.Model):
         default=True,
         help_text="Whether this category is active and should be displayed",
     )
+    movies_count = models.PositiveIntegerField(
+        verbose_name="Movies Count",
+        default=0,
+        editable=False,
+        help_text="Number of movies in this category, maintained by database triggers",
+    )
     created_at = models.DateTimeField(
         verbose_name="Created at",
         auto_now_add=True,
@@ -42,6 +59,10 @@ class MovieCategory(models.Model):
         auto_now=True,
     )
 
+    objects = UpdateNotifyingQuerySet.as_manager()
+
+    counter_fields = {"movies_count": "movies"}
+
     class Meta:
         verbose_name = "Movie Category"
         verbose_name_plural = "Movie Categories"
@@ -50,6 +71,7 @@ class MovieCategory(models.Model):
             models.Index(fields=["name"]),
             models.Index(fields=["slug"]),
             models.Index(fields=["is_active"]),
+            models.Index(fields=["movies_count"]),
         ]
 
     def __str__(self) -> str:
@@ -70,6 +92,47 @@ class MovieCategory(models.Model):
             self.slug = slugify(self.name)
 
 
+class Director(models.Model):
+    """Director model.
+
+    A normalized person directing movies; `Movie.directors` links the
+    names listed in the free-text `Movie.director`.
+    """
+
+    name = models.CharField(
+        verbose_name="Name",
+        max_length=255,
+        help_text="Full name of the director",
+    )
+    slug = models.SlugField(
+        verbose_name="Slug",
+        unique=True,
+        max_length=255,
+        allow_unicode=True,
+        help_text="URL-friendly name, unique per person",
+    )
+    created_at = models.DateTimeField(
+        verbose_name="Created at",
+        auto_now_add=True,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Updated at",
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = "Director"
+        verbose_name_plural = "Directors"
+        ordering = ["name"]
+        indexes = [
+            trigram_index("name", name="simple_director_name_trgm"),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of the director."""
+        return self.name
+
+
 class Movie(models.Model):
     """Movie model.
 
@@ -122,8 +185,8 @@ class Movie(models.Model):
         null=True,
         blank=True,
         validators=[
-            MinValueValidator(0.0, "Rating cannot be less than 0"),
-            MaxValueValidator(10.0, "Rating cannot exceed 10"),
+            MinValueValidator(Decimal("0.0"), "Rating cannot be less than 0"),
+            MaxValueValidator(Decimal("10.0"), "Rating cannot exceed 10"),
         ],
         help_text="Movie rating (0-10)",
     )
@@ -131,7 +194,14 @@ class Movie(models.Model):
         verbose_name="Director",
         max_length=255,
         blank=True,
-        help_text="Movie director",
+        help_text="Movie director(s), comma-separated display string",
+    )
+    directors = models.ManyToManyField(
+        Director,
+        verbose_name="Directors",
+        related_name="movies",
+        blank=True,
+        help_text="Directors listed in `director`, kept in sync with it",
     )
     category = models.ForeignKey(
         MovieCategory,
@@ -154,6 +224,8 @@ class Movie(models.Model):
         auto_now=True,
     )
 
+    objects = MovieQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Movie"
         verbose_name_plural = "Movies"
@@ -165,6 +237,23 @@ class Movie(models.Model):
             models.Index(fields=["release_date"]),
             models.Index(fields=["rating"]),
             models.Index(fields=["category"]),
+            # Serves `claim_active()`: active movies in the claim order
+            models.Index(
+                models.F("release_date").desc(),
+                Collate("title", "C"),
+                "id",
+                condition=models.Q(is_active=True),
+                name="simple_movie_next_active",
+            ),
+            # Serve the browse endpoint: a category in the page ordering, and
+            # category + rating range filters and facet counts
+            models.Index(
+                fields=["category", "-release_date", "title", "id"],
+                name="simple_movie_category_browse",
+            ),
+            models.Index(fields=["category", "rating"], name="simple_movie_category_rating"),
+            trigram_index("title", name="simple_movie_title_trgm"),
+            trigram_index("original_title", name="simple_movie_orig_title_trgm"),
         ]
 
     def __str__(self) -> str:
@@ -192,7 +281,60 @@ class Movie(models.Model):
         return self.release_date <= date.today()
 
 
-class Author(models.Model):
+class MovieSimilarity(models.Model):
+    """Precomputed nearest neighbours of a movie.
+
+    Built in batches by `simple.api.movies.similarity`; `is_stale` marks
+    the lists the next incremental refresh recomputes.
+    """
+
+    movie = models.OneToOneField(
+        Movie,
+        verbose_name="Movie",
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="similarity",
+    )
+    similar_ids = ArrayField(
+        models.IntegerField(),
+        verbose_name="Similar Movies",
+        default=list,
+        help_text="IDs of the most similar movies, most similar first",
+    )
+    scores = ArrayField(
+        models.FloatField(),
+        verbose_name="Scores",
+        default=list,
+        help_text="Cosine similarity of each of the similar movies",
+    )
+    is_stale = models.BooleanField(
+        verbose_name="Stale",
+        default=True,
+        help_text="Whether the neighbours must be recomputed",
+    )
+    updated_at = models.DateTimeField(
+        verbose_name="Updated at",
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = "Movie Similarity"
+        verbose_name_plural = "Movie Similarities"
+        indexes = [
+            models.Index(
+                fields=["movie"],
+                condition=models.Q(is_stale=True),
+                name="simple_moviesim_stale",
+            ),
+            GinIndex(fields=["similar_ids"], name="simple_moviesim_similar_gin"),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of the movie similarity."""
+        return f"Similar to {self.movie_id}"
+
+
+class Author(DatabaseCountersMixin, models.Model):
     """Model for authors.
 
     Contains information about authors including their name,
@@ -237,6 +379,12 @@ class Author(models.Model):
         default=True,
         help_text="Whether this author is active",
     )
+    books_count = models.PositiveIntegerField(
+        verbose_name="Books Count",
+        default=0,
+        editable=False,
+        help_text="Number of books of this author, maintained by database triggers",
+    )
     created_at = models.DateTimeField(
         verbose_name="Created at",
         auto_now_add=True,
@@ -246,6 +394,19 @@ class Author(models.Model):
         auto_now=True,
     )
 
+    search_vector = models.GeneratedField(
+        verbose_name="Search vector",
+        expression=weighted_search_vector(
+            SEARCH_CONFIG, last_name="A", first_name="A", biography="C"
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = UpdateNotifyingQuerySet.as_manager()
+
+    counter_fields = {"books_count": "books"}
+
     class Meta:
         verbose_name = "Author"
         verbose_name_plural = "Authors"
@@ -254,6 +415,13 @@ class Author(models.Model):
             models.Index(fields=["last_name"]),
             models.Index(fields=["first_name"]),
             models.Index(fields=["is_active"]),
+            # Serves keyset pagination over the default ordering
+            models.Index(fields=["last_name", "first_name", "id"]),
+            models.Index(fields=["books_count"]),
+            GinIndex(fields=["search_vector"], name="simple_author_search_gin"),
+            trigram_index("first_name", name="simple_author_first_name_trgm"),
+            trigram_index("last_name", name="simple_author_last_name_trgm"),
+            trigram_index("biography", name="simple_author_biography_trgm"),
         ]
 
     def __str__(self) -> str:
@@ -333,6 +501,16 @@ class Book(models.Model):
         verbose_name="Updated at",
         auto_now=True,
     )
+    search_vector = models.GeneratedField(
+        verbose_name="Search vector",
+        expression=weighted_search_vector(
+            SEARCH_CONFIG, title="A", original_title="A", description="B"
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = UpdateNotifyingQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Book"
@@ -344,6 +522,13 @@ class Book(models.Model):
             models.Index(fields=["is_active"]),
             models.Index(fields=["publication_date"]),
             models.Index(fields=["author"]),
+            # Serve keyset pagination over the default ordering, globally and per author
+            models.Index(fields=["-publication_date", "title", "id"]),
+            models.Index(fields=["author", "-publication_date", "title", "id"]),
+            GinIndex(fields=["search_vector"], name="simple_book_search_gin"),
+            trigram_index("title", name="simple_book_title_trgm"),
+            trigram_index("original_title", name="simple_book_orig_title_trgm"),
+            trigram_index("isbn", name="simple_book_isbn_trgm"),
         ]
 
     def __str__(self) -> str:
@@ -0,0 +1,190 @@
+from functools import partial
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, models, transaction
+from django.db.models import sql
+from django.db.models.sql.constants import CURSOR
+from django.db.models.functions import Collate, Trunc
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Sent after `QuerySet.update()` commits with `pks` (ids of the updated rows),
+# `fields` (names of the updated fields) and `values` (the update kwargs).
+post_update = Signal()
+
+
+class UpdateNotifyingQuerySet(models.QuerySet):
+    """
+    QuerySet that sends `post_update` after bulk `update()` calls.
+
+    `update()` bypasses `post_save`, so receivers that keep derived data
+    (caches, counters, queues) in sync would miss admin bulk actions.
+    """
+
+    def update(self, **kwargs):
+        """
+        Same as `QuerySet.update()`, as a single `UPDATE ... RETURNING pk`
+        statement whose returned ids are sent with `post_update` once the
+        transaction commits.
+
+        `update()` also bypasses `auto_now`: models with an `updated_at`
+        field (the conditional GET validator) get it set to now, unless
+        `kwargs` sets it.
+        """
+        self._not_support_combined_queries("update")
+        if self.query.is_sliced:
+            raise TypeError("Cannot update a query once a slice has been taken.")
+        opts = self.model._meta
+        if any(field.name == "updated_at" for field in opts.concrete_fields):
+            kwargs.setdefault("updated_at", timezone.now())
+        self._for_write = True
+        query = self.query.chain(sql.UpdateQuery)
+        query.add_update_values(kwargs)
+        query.annotations = {}
+        connection = connections[self.db]
+        with transaction.mark_for_rollback_on_error(using=self.db):
+            try:
+                update_sql, params = query.get_compiler(self.db).as_sql()
+            except EmptyResultSet:
+                return 0
+            if not update_sql:
+                return 0
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"{update_sql} RETURNING {connection.ops.quote_name(opts.pk.column)}",
+                    params,
+                )
+                pks = [pk for (pk,) in cursor.fetchall()]
+            for related in query.get_related_updates():
+                related.get_compiler(self.db).execute_sql(CURSOR)
+        self._result_cache = None
+        if pks:
+            transaction.on_commit(
+                partial(
+                    post_update.send,
+                    sender=self.model,
+                    pks=pks,
+                    fields=tuple(kwargs),
+                    values=kwargs,
+                ),
+                using=self.db,
+            )
+        return len(pks)
+
+
+class MovieQuerySet(UpdateNotifyingQuerySet):
+    # Collation of the text columns in the claim order: bytewise, the order
+    # of the ready queue members, whatever the database collation
+    claim_collation = "C"
+
+    def claim_active(self, count=1):
+        """
+        Deactivate and return up to `count` active movies of the queryset,
+        in the model ordering (text compared with `claim_collation`), with a
+        single statement:
+
+            WITH claimed AS (
+                UPDATE ... SET is_active = false, updated_at = now
+                WHERE id IN (SELECT id ... LIMIT n FOR UPDATE SKIP LOCKED)
+                RETURNING ...
+            ) SELECT ... FROM claimed ORDER BY ...
+
+        Rows locked by a concurrent claim are skipped instead of waited
+        for, so concurrent consumers never get the same movie.
+        """
+        ordering = []
+        for field, descending, collation in self._claim_ordering():
+            expression = Collate(field.name, collation) if collation else models.F(field.name)
+            ordering.append(expression.desc() if descending else expression.asc())
+        return self._claim(self.filter(is_active=True).order_by(*ordering)[:count])
+
+    def claim_ids(self, ids):
+        """
+        Same as `claim_active()` for the movies with the given ids; the ones
+        already inactive, missing or locked by a concurrent claim are left out.
+        """
+        return self._claim(self.filter(pk__in=ids, is_active=True).order_by())
+
+    def _claim_ordering(self):
+        """
+        `(field, descending, collation)` of the claim order: the model
+        ordering, then the primary key.
+        """
+        opts = self.model._meta
+        for name in [*opts.ordering, opts.pk.name]:
+            field = opts.get_field(name.lstrip("-"))
+            text = isinstance(field, (models.CharField, models.TextField))
+            yield field, name.startswith("-"), self.claim_collation if text else None
+
+    def _claim(self, candidates):
+        opts = self.model._meta
+        quote_name = connections[self.db].ops.quote_name
+        subquery, params = candidates.values("pk").query.get_compiler(self.db).as_sql()
+
+        columns = ", ".join(quote_name(field.column) for field in opts.concrete_fields)
+        order_by = []
+        for field, descending, collation in self._claim_ordering():
+            term = quote_name(field.column)
+            if collation:
+                term = f"{term} COLLATE {quote_name(collation)}"
+            order_by.append(f"{term} DESC" if descending else term)
+        now = timezone.now()
+        sql = (
+            f"WITH claimed AS ("
+            f"UPDATE {quote_name(opts.db_table)} "
+            f"SET {quote_name(opts.get_field('is_active').column)} = false, "
+            f"{quote_name(opts.get_field('updated_at').column)} = %s "
+            f"WHERE {quote_name(opts.pk.column)} IN ({subquery} FOR UPDATE SKIP LOCKED) "
+            f"RETURNING {columns}"
+            f") SELECT {columns} FROM claimed ORDER BY {', '.join(order_by)}"
+        )
+        movies = list(self.raw(sql, [now, *params]))
+        if movies:
+            post_update.send(
+                sender=self.model,
+                pks=[movie.pk for movie in movies],
+                fields=("is_active", "updated_at"),
+                values={"is_active": False, "updated_at": now},
+            )
+        return movies
+
+
+class WeatherQuerySet(models.QuerySet):
+    # date_trunc() precisions accepted by `bucket()`
+    BUCKET_INTERVALS = ("minute", "hour", "day", "week", "month", "quarter", "year")
+
+    def bucket(self, interval, field="api_timestamp", group_by=("city_name",), **aggregates):
+        """
+        Aggregate the queryset per `interval` time bucket of `field` (and per
+        `group_by` fields), ordered by group and bucket:
+
+            SELECT city_name, date_trunc('hour', api_timestamp AT TIME ZONE ...) AS bucket,
+                   count(*), avg(temperature), ...
+            GROUP BY city_name, bucket ORDER BY city_name, bucket
+
+        Rows are dicts with the group fields, `bucket` (the start of the
+        bucket in the current time zone) and the aggregates, by default
+        the observation count and the min/avg/max temperature and the
+        average humidity, pressure and wind speed.
+        """
+        if interval not in self.BUCKET_INTERVALS:
+            raise ValueError(
+                f"Unknown bucket interval {interval!r}, expected one of "
+                f"{', '.join(self.BUCKET_INTERVALS)}"
+            )
+        aggregates = aggregates or {
+            "count": models.Count("pk"),
+            "temperature_min": models.Min("temperature"),
+            "temperature_avg": models.Avg("temperature"),
+            "temperature_max": models.Max("temperature"),
+            "humidity_avg": models.Avg("humidity"),
+            "pressure_avg": models.Avg("pressure"),
+            "wind_speed_avg": models.Avg("wind_speed"),
+        }
+        return (
+            self.order_by()
+            .annotate(bucket=Trunc(field, interval))
+            .values(*group_by, "bucket")
+            .annotate(**aggregates)
+            .order_by(*group_by, "bucket")
+        )
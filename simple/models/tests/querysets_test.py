@@ -0,0 +1,68 @@
+from datetime import datetime, timezone
+
+from simple.factories.category import MovieCategoryFactory
+from simple.factories.movie import MovieFactory
+from simple.models import Movie, MovieCategory
+from simple.models.querysets import post_update
+
+
+def test_update_sets_updated_at_and_notifies_on_commit(db, django_capture_on_commit_callbacks):
+    categories = [
+        MovieCategoryFactory.create(name=name, slug=name.lower())
+        for name in ("Drama", "Action")
+    ]
+    before = categories[0].updated_at
+    sent = []
+
+    def receiver(sender, pks, fields, **kwargs):
+        sent.append((sorted(pks), set(fields)))
+
+    post_update.connect(receiver, sender=MovieCategory)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            rows = MovieCategory.objects.filter(name="Drama").distinct().update(is_active=False)
+            assert rows == 1
+            assert sent == []
+    finally:
+        post_update.disconnect(receiver, sender=MovieCategory)
+
+    assert sent == [([categories[0].pk], {"is_active", "updated_at"})]
+    categories[0].refresh_from_db()
+    assert categories[0].updated_at > before
+    assert MovieCategory.objects.filter(name="Nothing").update(is_active=False) == 0
+
+
+def test_claims_order_titles_bytewise(db, django_assert_num_queries):
+    with django_assert_num_queries(1) as captured:
+        Movie.objects.claim_active()
+
+    # Bytewise, as the ready queue pops them, whatever the database collation
+    assert captured.captured_queries[0]["sql"].count('"title" COLLATE "C"') == 2
+
+
+def test_update_is_a_single_statement(
+    db, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    drama = MovieCategoryFactory.create(name="Drama", slug="drama")
+    MovieCategoryFactory.create(name="Action", slug="action")
+    movie = MovieFactory.create(title="Movie", slug="movie", category=drama)
+    sent = []
+
+    def receiver(sender, pks, fields, values, **kwargs):
+        sent.append((pks, values))
+
+    moment = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    post_update.connect(receiver, sender=Movie)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            with django_assert_num_queries(1):
+                rows = Movie.objects.filter(category__slug="drama").update(
+                    rating="7.5", updated_at=moment
+                )
+    finally:
+        post_update.disconnect(receiver, sender=Movie)
+
+    assert rows == 1
+    assert sent == [([movie.pk], {"rating": "7.5", "updated_at": moment})]
+    assert Movie.objects.get(pk=movie.pk).updated_at == moment
+    assert Movie.objects.filter(pk__in=[]).update(rating="1.0") == 0
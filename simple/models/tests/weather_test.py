@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db.models import Max
+
+from simple.factories.weather import WeatherFactory
+from simple.models import Weather
+
+
+def test_bucket_aggregates_per_city_and_interval(db):
+    for city, minute, hour, temperature in [
+        ("Moscow", 5, 10, 280.0),
+        ("Moscow", 50, 10, 284.0),
+        ("Moscow", 5, 11, 290.0),
+        ("Kazan", 30, 10, 270.0),
+    ]:
+        WeatherFactory.create(
+            city_name=city,
+            temperature=temperature,
+            api_timestamp=datetime(2025, 1, 1, hour, minute, tzinfo=timezone.utc),
+        )
+
+    rows = list(Weather.objects.filter(city_name="Moscow").bucket("hour"))
+
+    assert [(row["bucket"].hour, row["count"]) for row in rows] == [(10, 2), (11, 1)]
+    assert rows[0]["temperature_avg"] == pytest.approx(282.0)
+    assert (rows[0]["temperature_min"], rows[0]["temperature_max"]) == (280.0, 284.0)
+    assert list(Weather.objects.bucket("day", group_by=(), warmest=Max("temperature"))) == [
+        {"bucket": datetime(2025, 1, 1, tzinfo=timezone.utc), "warmest": 290.0}
+    ]
+    with pytest.raises(ValueError):
+        Weather.objects.bucket("fortnight")
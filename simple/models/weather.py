@@ -1,11 +1,23 @@
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from simple.models.common import trigram_index
+from simple.models.querysets import WeatherQuerySet
+
 
 class Weather(models.Model):
     """
     Model for weather data from OpenWeatherMap API.
     Stores comprehensive weather information for specific locations and times.
+
+    The table is range partitioned by month on `created_at`, see
+    `simple.processes.partitions`; its primary key is `(id, created_at)`.
+
+    Rows are appended in time order, so the time columns are indexed with
+    BRIN (a few pages summarizing block ranges) rather than B-trees that
+    every insert has to maintain; `(city_name, -api_timestamp)` serves the
+    per-city history and latest readings.
     """
 
     city_name = models.CharField(
@@ -146,17 +158,24 @@ class Weather(models.Model):
         help_text="Time when record was updated",
     )
 
+    objects = WeatherQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Weather Data"
         verbose_name_plural = "Weather Data"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["city_name"]),
-            models.Index(fields=["country_code"]),
-            models.Index(fields=["created_at"]),
-            models.Index(fields=["is_active"]),
+            BrinIndex(
+                fields=["created_at"], name="simple_weather_created_brin", autosummarize=True
+            ),
+            BrinIndex(
+                fields=["api_timestamp"], name="simple_weather_api_ts_brin", autosummarize=True
+            ),
+            models.Index(fields=["city_name", "-api_timestamp"], name="simple_weather_city_ts"),
             models.Index(fields=["weather_main"]),
-            models.Index(fields=["temperature"]),
+            trigram_index("city_name", name="simple_weather_city_trgm"),
+            trigram_index("weather_description", name="simple_weather_descr_trgm"),
+            trigram_index("weather_main", name="simple_weather_main_trgm"),
         ]
 
     def __str__(self):
@@ -186,3 +205,104 @@ class Weather(models.Model):
     def clean(self):
         """Validate the model."""
         super().clean()
+
+
+class WeatherRollup(models.Model):
+    """
+    Weather readings of a city aggregated over a time bucket, maintained
+    incrementally as readings are saved, see `simple.processes.rollups`.
+
+    `weather_main_counts` counts the readings of every `weather_main`
+    value, `weather_main` is the most frequent one.
+    """
+
+    # Reading fields aggregated into `<field>_min`, `<field>_avg` and `<field>_max`
+    METRICS = ("temperature", "humidity", "pressure", "wind_speed")
+    # date_trunc() precision of the buckets
+    interval = None
+
+    city_name = models.CharField(verbose_name="City Name", max_length=100)
+    bucket = models.DateTimeField(
+        verbose_name="Bucket", help_text="Start of the aggregated period"
+    )
+    samples = models.PositiveIntegerField(
+        verbose_name="Samples", help_text="Number of readings aggregated"
+    )
+    temperature_min = models.FloatField(verbose_name="Min Temperature")
+    temperature_avg = models.FloatField(verbose_name="Avg Temperature")
+    temperature_max = models.FloatField(verbose_name="Max Temperature")
+    humidity_min = models.FloatField(verbose_name="Min Humidity (%)")
+    humidity_avg = models.FloatField(verbose_name="Avg Humidity (%)")
+    humidity_max = models.FloatField(verbose_name="Max Humidity (%)")
+    pressure_min = models.FloatField(verbose_name="Min Pressure (hPa)")
+    pressure_avg = models.FloatField(verbose_name="Avg Pressure (hPa)")
+    pressure_max = models.FloatField(verbose_name="Max Pressure (hPa)")
+    wind_speed_min = models.FloatField(verbose_name="Min Wind Speed (m/s)")
+    wind_speed_avg = models.FloatField(verbose_name="Avg Wind Speed (m/s)")
+    wind_speed_max = models.FloatField(verbose_name="Max Wind Speed (m/s)")
+    weather_main = models.CharField(
+        verbose_name="Weather Main",
+        max_length=50,
+        help_text="Most frequent weather parameters group",
+    )
+    weather_main_counts = models.JSONField(
+        verbose_name="Weather Main Counts",
+        default=dict,
+        help_text="Number of readings of each weather parameters group",
+    )
+    updated_at = models.DateTimeField(verbose_name="Updated At", auto_now=True)
+
+    class Meta:
+        abstract = True
+        ordering = ["city_name", "bucket"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["city_name", "bucket"], name="%(app_label)s_%(class)s_city_bucket"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.city_name} - {self.bucket:%Y-%m-%d %H:%M}"
+
+
+class WeatherHourly(WeatherRollup):
+    interval = "hour"
+
+    class Meta(WeatherRollup.Meta):
+        verbose_name = "Hourly Weather"
+        verbose_name_plural = "Hourly Weather"
+
+
+class WeatherDaily(WeatherRollup):
+    interval = "day"
+
+    class Meta(WeatherRollup.Meta):
+        verbose_name = "Daily Weather"
+        verbose_name_plural = "Daily Weather"
+
+
+class WeatherObservation(models.Model):
+    """
+    Ledger of the stored `Weather` observations, one per city and
+    `api_timestamp`, making the ingestion idempotent.
+
+    The partitioned weather table can only have unique constraints that
+    include its partition key `created_at`; a reading is saved only once
+    its observation is inserted here, see `simple.processes.get_weather`.
+    """
+
+    city_name = models.CharField(verbose_name="City Name", max_length=100)
+    api_timestamp = models.DateTimeField(verbose_name="API Timestamp")
+    created_at = models.DateTimeField(verbose_name="Created At", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Weather Observation"
+        verbose_name_plural = "Weather Observations"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["city_name", "api_timestamp"], name="simple_weather_observation_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.city_name} - {self.api_timestamp:%Y-%m-%d %H:%M}"
@@ -1,27 +1,53 @@
 import requests
 import logging
 from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import datetime
 
-from simple.models.weather import Weather
+from simple.models.weather import Weather, WeatherObservation
 
 logger = logging.getLogger(__name__)
 
 
+def store_weather(weather):
+    """
+    Save `weather` unless the observation of its city at its `api_timestamp`
+    is already stored, return whether it was saved.
+
+    The observation is claimed in the `WeatherObservation` ledger with
+    `INSERT ... ON CONFLICT DO NOTHING RETURNING`, so concurrent fetches of
+    the same observation store it once.
+    """
+    quote = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(WeatherObservation._meta.db_table)} "
+            "(city_name, api_timestamp, created_at) VALUES (%s, %s, %s) "
+            "ON CONFLICT (city_name, api_timestamp) DO NOTHING RETURNING id",
+            [weather.city_name, weather.api_timestamp, timezone.now()],
+        )
+        if cursor.fetchone() is None:
+            return False
+        # The hourly and daily rollups are updated with the reading
+        weather.save()
+    return True
+
+
 def get_weather_data():
     """
     Fetch weather data from OpenWeatherMap API for Moscow and save to database.
 
     Returns:
-        tuple: (success: bool, message: str)
+        tuple: (success: bool, message: str, stored: bool), `stored` is False
+        when the observation was already stored
     """
     API_KEY = getattr(settings, "OPENWEATHER_API_KEY", None)
 
     if not API_KEY:
         error_msg = "OPENWEATHER_API_KEY not found in settings"
         logger.error(error_msg)
-        return False, error_msg
+        return False, error_msg, False
 
     # Coordinates for Moscow
     LAT = 55.75
@@ -43,7 +69,7 @@ def get_weather_data():
         if data.get("cod") != 200:
             error_msg = f"API returned error: {data.get('message', 'Unknown error')}"
             logger.error(error_msg)
-            return False, error_msg
+            return False, error_msg, False
 
         # Extract data from response
         coord = data.get("coord", {})
@@ -99,28 +125,34 @@ def get_weather_data():
         )
 
         weather.full_clean()
-        weather.save()
-
-        success_msg = f"Weather data for {weather.city_name} successfully fetched and saved"
+        stored = store_weather(weather)
+
+        if stored:
+            success_msg = f"Weather data for {weather.city_name} successfully fetched and saved"
+        else:
+            success_msg = (
+                f"Weather data for {weather.city_name} fetched, observation of "
+                f"{timezone.localtime(api_timestamp):%Y-%m-%d %H:%M} already stored"
+            )
         logger.info(success_msg)
-        return True, success_msg
+        return True, success_msg, stored
 
     except requests.exceptions.RequestException as e:
         error_msg = f"Network error while fetching weather data: {str(e)}"
         logger.error(error_msg)
-        return False, error_msg
+        return False, error_msg, False
 
     except requests.exceptions.HTTPError as e:
         error_msg = f"HTTP error while fetching weather data: {str(e)}"
         logger.error(error_msg)
-        return False, error_msg
+        return False, error_msg, False
 
     except KeyError as e:
         error_msg = f"Missing expected data in API response: {str(e)}"
         logger.error(error_msg)
-        return False, error_msg
+        return False, error_msg, False
 
     except Exception as e:
         error_msg = f"Unexpected error while fetching weather data: {str(e)}"
         logger.error(error_msg)
-        return False, error_msg
+        return False, error_msg, False
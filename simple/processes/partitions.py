@@ -0,0 +1,171 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from simple.models.weather import Weather, WeatherObservation
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(moment):
+    """First instant (UTC) of the month of `moment`."""
+    moment = moment.astimezone(dt_timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+class MonthlyPartitions:
+    """
+    Monthly range partitions of a table partitioned on `column`.
+
+    Partitions are named `<table>_pYYYYMM` and cover one UTC month each;
+    `<table>_default` takes the rows of months without a partition.
+    """
+
+    def __init__(self, model, column):
+        self.model = model
+        self.table = model._meta.db_table
+        self.column = column
+        self.default = f"{self.table}_default"
+        self.pattern = re.compile(rf"^{re.escape(self.table)}_p(\d{{4}})(\d{{2}})$")
+
+    def name(self, month):
+        return f"{self.table}_p{month:%Y%m}"
+
+    def partitions(self):
+        """Attached monthly partitions by month."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+                """,
+                [self.table],
+            )
+            names = [name for (name,) in cursor.fetchall()]
+        partitions = {}
+        for name in names:
+            match = self.pattern.match(name)
+            if match:
+                month = datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+                partitions[month] = name
+        return partitions
+
+    def create(self, month):
+        """
+        Attach the partition of `month`, moving its rows out of the default
+        partition.
+
+        `ATTACH PARTITION` takes a SHARE UPDATE EXCLUSIVE lock on the table
+        but an ACCESS EXCLUSIVE lock on the default partition, which it
+        scans for rows of the new range. The rows were just moved out, so
+        the scan is short, but writes to the default partition wait for
+        the transaction. The new partition itself is not scanned: its
+        CHECK constraint already proves the range.
+        """
+        name = self.name(month)
+        bounds = [month, add_months(month, 1)]
+        quote = connection.ops.quote_name
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {quote(name)} "
+                f"(LIKE {quote(self.table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(name)} ADD CONSTRAINT {quote(name + '_range')} "
+                f"CHECK ({quote(self.column)} >= %s AND {quote(self.column)} < %s)",
+                bounds,
+            )
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {quote(self.default)}
+                    WHERE {quote(self.column)} >= %s AND {quote(self.column)} < %s
+                    RETURNING *
+                )
+                INSERT INTO {quote(name)} SELECT * FROM moved
+                """,
+                bounds,
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(self.table)} ATTACH PARTITION {quote(name)} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                bounds,
+            )
+            cursor.execute(
+                f"ALTER TABLE {quote(name)} DROP CONSTRAINT {quote(name + '_range')}"
+            )
+        return name
+
+    def ensure(self, now, ahead):
+        """Create the missing partitions from the month of `now` to `ahead` months later."""
+        existing = self.partitions()
+        months = [add_months(month_start(now), offset) for offset in range(ahead + 1)]
+        return [self.create(month) for month in months if month not in existing]
+
+    def expire(self, before, detach=False):
+        """
+        Remove the rows older than `before`: the partitions entirely older are
+        detached and dropped (only detached with `detach`), the rest is
+        deleted from the partitions that straddle `before`.
+
+        Returns the names of the removed partitions and the number of rows deleted.
+        """
+        quote = connection.ops.quote_name
+        removed = []
+        for month, name in sorted(self.partitions().items()):
+            if add_months(month, 1) > before:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {quote(self.table)} DETACH PARTITION {quote(name)}"
+                )
+                if not detach:
+                    cursor.execute(f"DROP TABLE {quote(name)}")
+            removed.append(name)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {quote(self.table)} WHERE {quote(self.column)} < %s", [before]
+            )
+            deleted = cursor.rowcount
+        return removed, deleted
+
+
+weather_partitions = MonthlyPartitions(Weather, "created_at")
+
+
+def maintain_weather_partitions(now=None, ahead=None, retention_days=None, detach=False):
+    """
+    Create the upcoming monthly `Weather` partitions and expire the data
+    older than the retention period, and the observations of the
+    ingestion ledger as well.
+
+    Returns `(created, removed, deleted)`: the names of the created and of
+    the removed partitions, and the number of rows deleted.
+    """
+    now = now or timezone.now()
+    if ahead is None:
+        ahead = settings.WEATHER_PARTITIONS_AHEAD
+    if retention_days is None:
+        retention_days = settings.WEATHER_RETENTION_DAYS
+
+    before = now - timedelta(days=retention_days)
+    created = weather_partitions.ensure(now, ahead)
+    removed, deleted = weather_partitions.expire(before, detach=detach)
+    # Observations that old are not served by the API anymore
+    WeatherObservation.objects.filter(api_timestamp__lt=before).delete()
+    logger.info(
+        "Weather partitions maintained",
+        extra={"created": created, "removed": removed, "deleted": deleted},
+    )
+    return created, removed, deleted
@@ -0,0 +1,262 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Max, Min
+from django.utils import timezone
+
+from simple.models.weather import Weather, WeatherDaily, WeatherHourly, WeatherRollup
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS = (WeatherHourly, WeatherDaily)
+# Reading field the readings are bucketed by
+BUCKET_FIELD = "api_timestamp"
+METRIC_FIELDS = [
+    f"{metric}_{stat}" for metric in WeatherRollup.METRICS for stat in ("min", "avg", "max")
+]
+
+
+def bucket_start(moment, interval):
+    """Start of the `interval` ("hour" or "day") bucket of `moment`, as `date_trunc`."""
+    moment = timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+    if interval == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _merge_sql(rollup):
+    """
+    Upsert of one reading into `rollup`: the bucket row is created from the
+    reading or merged with it (running min/avg/max, weather_main counts).
+    """
+    quote = connection.ops.quote_name
+    metrics = ", ".join(quote(field) for field in METRIC_FIELDS)
+    updates = []
+    for metric in WeatherRollup.METRICS:
+        low, avg, high = (quote(f"{metric}_{stat}") for stat in ("min", "avg", "max"))
+        updates += [
+            f"{low} = LEAST(t.{low}, EXCLUDED.{low})",
+            f"{avg} = t.{avg} + (EXCLUDED.{avg} - t.{avg}) / (t.samples + 1)",
+            f"{high} = GREATEST(t.{high}, EXCLUDED.{high})",
+        ]
+    count = "COALESCE((t.weather_main_counts ->> {})::int, 0)"
+    new_count = f"{count.format('EXCLUDED.weather_main')} + 1"
+    return f"""
+        INSERT INTO {quote(rollup._meta.db_table)} AS t
+            (city_name, bucket, samples, {metrics}, weather_main, weather_main_counts,
+             updated_at)
+        VALUES (%s, %s, 1, {", ".join(["%s"] * len(METRIC_FIELDS))}, %s,
+                jsonb_build_object(%s::text, 1), %s)
+        ON CONFLICT (city_name, bucket) DO UPDATE SET
+            samples = t.samples + 1,
+            {", ".join(updates)},
+            weather_main_counts = t.weather_main_counts
+                || jsonb_build_object(EXCLUDED.weather_main, {new_count}),
+            weather_main = CASE
+                WHEN {new_count} > {count.format("t.weather_main")} THEN EXCLUDED.weather_main
+                ELSE t.weather_main
+            END,
+            updated_at = EXCLUDED.updated_at
+    """
+
+
+def add_to_rollups(readings, rollups=ROLLUPS):
+    """Merge new `Weather` readings into their hourly and daily rollups."""
+    now = timezone.now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        for rollup in rollups:
+            cursor.executemany(
+                _merge_sql(rollup),
+                [
+                    [
+                        reading.city_name,
+                        bucket_start(getattr(reading, BUCKET_FIELD), rollup.interval),
+                        *(getattr(reading, field.rsplit("_", 1)[0]) for field in METRIC_FIELDS),
+                        reading.weather_main,
+                        reading.weather_main,
+                        now,
+                    ]
+                    for reading in readings
+                ],
+            )
+
+
+def rebuild_rollups(start, end, city_names=None, prune=False, rollups=ROLLUPS):
+    """
+    Recompute from the readings the rollups of the buckets in `[start, end)`
+    (bounds aligned on days) of the given cities (all by default), and
+    return the number of rollup rows written.
+
+    With `prune`, the rollups of buckets without readings are deleted;
+    without, rollups outliving the retention of the readings are kept.
+    """
+    readings = Weather.objects.filter(
+        **{f"{BUCKET_FIELD}__gte": start, f"{BUCKET_FIELD}__lt": end}
+    )
+    if city_names is not None:
+        readings = readings.filter(city_name__in=city_names)
+    aggregates = {
+        "samples": Count("pk"),
+        **{
+            f"{metric}_{stat}": function(metric)
+            for metric in WeatherRollup.METRICS
+            for stat, function in (("min", Min), ("avg", Avg), ("max", Max))
+        },
+    }
+
+    written = 0
+    with transaction.atomic():
+        for rollup in rollups:
+            counts = {}
+            for row in readings.bucket(
+                rollup.interval,
+                field=BUCKET_FIELD,
+                group_by=("city_name", "weather_main"),
+                count=Count("pk"),
+            ):
+                counts.setdefault((row["city_name"], row["bucket"]), {})[
+                    row["weather_main"]
+                ] = row["count"]
+            rows = [
+                rollup(
+                    **row,
+                    # Most frequent, the first in alphabetical order on a tie
+                    weather_main=min(
+                        counts[row["city_name"], row["bucket"]].items(),
+                        key=lambda item: (-item[1], item[0]),
+                    )[0],
+                    weather_main_counts=counts[row["city_name"], row["bucket"]],
+                )
+                for row in readings.bucket(rollup.interval, field=BUCKET_FIELD, **aggregates)
+            ]
+            rollup.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["city_name", "bucket"],
+                update_fields=[
+                    "samples",
+                    *METRIC_FIELDS,
+                    "weather_main",
+                    "weather_main_counts",
+                    "updated_at",
+                ],
+                batch_size=1000,
+            )
+            written += len(rows)
+            if prune:
+                stale = rollup.objects.filter(bucket__gte=start, bucket__lt=end)
+                if city_names is not None:
+                    stale = stale.filter(city_name__in=city_names)
+                stale.exclude(pk__in=[row.pk for row in rows]).delete()
+    return written
+
+
+def retained_since():
+    """
+    Start of the buckets whose readings are all still stored. A day of
+    margin covers readings stored a while after their `api_timestamp`.
+    """
+    return timezone.now() - timedelta(days=settings.WEATHER_RETENTION_DAYS - 1)
+
+
+def replace_in_rollups(previous, current=None):
+    """
+    Apply a changed reading (`previous` replaced by `current`) or a deleted
+    one (`current` None) to the rollups.
+
+    Buckets whose readings are all retained are recomputed from them. The
+    older ones only hold aggregates of readings since expired, so the
+    previous reading is retracted from them and the current one merged.
+    """
+    since = retained_since()
+    with transaction.atomic():
+        for rollup in ROLLUPS:
+            step = timedelta(hours=1) if rollup.interval == "hour" else timedelta(days=1)
+            rebuilt = set()
+            for reading in (previous, current):
+                if reading is None:
+                    continue
+                key = (
+                    reading.city_name,
+                    bucket_start(getattr(reading, BUCKET_FIELD), rollup.interval),
+                )
+                if key[1] >= since:
+                    if key not in rebuilt:
+                        rebuild_rollups(
+                            key[1], key[1] + step, [key[0]], prune=True, rollups=[rollup]
+                        )
+                        rebuilt.add(key)
+                elif reading is previous:
+                    _retract(rollup, reading)
+                else:
+                    add_to_rollups([reading], rollups=[rollup])
+
+
+def _retract(rollup, reading):
+    """
+    Take a reading out of its bucket of `rollup`: the sample count, the
+    averages and the weather_main counts are updated. The min and max
+    cannot be recomputed without the expired readings and are kept.
+    """
+    row = (
+        rollup.objects.select_for_update()
+        .filter(
+            city_name=reading.city_name,
+            bucket=bucket_start(getattr(reading, BUCKET_FIELD), rollup.interval),
+        )
+        .first()
+    )
+    if row is None:
+        return
+    if row.samples <= 1:
+        row.delete()
+        return
+    for metric in WeatherRollup.METRICS:
+        average = getattr(row, f"{metric}_avg")
+        setattr(
+            row,
+            f"{metric}_avg",
+            (average * row.samples - getattr(reading, metric)) / (row.samples - 1),
+        )
+    row.samples -= 1
+    counts = row.weather_main_counts
+    if counts.get(reading.weather_main, 0) > 1:
+        counts[reading.weather_main] -= 1
+    else:
+        counts.pop(reading.weather_main, None)
+    if counts:
+        row.weather_main = min(counts.items(), key=lambda item: (-item[1], item[0]))[0]
+    row.save()
+
+
+def backfill_rollups(start=None, end=None, chunk_days=7):
+    """
+    Rebuild the rollups of the readings from `start` to `end` (all of them
+    by default, widened to whole days), `chunk_days` days at a time.
+    Returns the number of rollup rows written.
+
+    Days before `retained_since()` are skipped: the retention deleted part
+    of their readings, so their rollups are kept as they are.
+    """
+    bounds = Weather.objects.aggregate(first=Min(BUCKET_FIELD), last=Max(BUCKET_FIELD))
+    if bounds["first"] is None:
+        return 0
+    since = retained_since()
+    retained = bucket_start(since, "day")
+    if retained < since:
+        retained += timedelta(days=1)
+    start = max(bucket_start(max(start or bounds["first"], bounds["first"]), "day"), retained)
+    last = min(end - timedelta(microseconds=1), bounds["last"]) if end else bounds["last"]
+    end = bucket_start(last, "day") + timedelta(days=1)
+
+    written = 0
+    while start < end:
+        stop = min(bucket_start(start + timedelta(days=chunk_days), "day"), end)
+        written += rebuild_rollups(start, stop)
+        logger.info(
+            "Weather rollups rebuilt", extra={"start": start, "end": stop, "written": written}
+        )
+        start = stop
+    return written
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from simple.factories.weather import WeatherFactory
+from simple.models import Weather, WeatherHourly, WeatherObservation
+from simple.processes.get_weather import store_weather
+from simple.processes.partitions import maintain_weather_partitions
+
+
+def test_store_weather_stores_each_observation_once(db):
+    observed = timezone.now().replace(microsecond=0)
+
+    assert store_weather(WeatherFactory.build(api_timestamp=observed))
+    assert not store_weather(WeatherFactory.build(api_timestamp=observed, temperature=300.0))
+    assert store_weather(WeatherFactory.build(api_timestamp=observed, city_name="Kazan"))
+    assert store_weather(WeatherFactory.build(api_timestamp=observed + timedelta(minutes=10)))
+
+    assert Weather.objects.count() == 3
+    assert WeatherObservation.objects.count() == 3
+    assert sum(WeatherHourly.objects.values_list("samples", flat=True)) == 3
+    assert not Weather.objects.filter(temperature=300.0).exists()
+
+
+def test_expired_observations_are_pruned(db):
+    now = timezone.now()
+    store_weather(WeatherFactory.build(api_timestamp=now - timedelta(days=40)))
+    store_weather(WeatherFactory.build(api_timestamp=now))
+
+    maintain_weather_partitions(now=now, retention_days=30)
+
+    assert list(WeatherObservation.objects.values_list("api_timestamp", flat=True)) == [now]
@@ -37,8 +37,18 @@ ALLOWED_HOSTS = ["simple.dev.intra", "localhost", "0.0.0.0", "127.0.0.1"]
 # OpenWeatherMap API settings
 OPENWEATHER_API_KEY = os.environ.get("OPENWEATHER_API_KEY", "your_api_key_here")
 
+# Weather table partitioning: months of partitions created ahead and
+# age of the rows dropped by the partition maintenance job
+WEATHER_PARTITIONS_AHEAD = 3
+WEATHER_RETENTION_DAYS = 30
+
 REST_FRAMEWORK = {
     "DATETIME_FORMAT": "%Y-%m-%dT%H:%M:%S.%fZ",
+    "DEFAULT_RENDERER_CLASSES": [
+        "simple.api.common.renderers.ORJSONRenderer",
+        "simple.api.common.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
@@ -61,6 +71,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "djmoney",
     "phonenumber_field",
     "rangefilter",
@@ -139,6 +150,24 @@ DATABASES = {
 # }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+    }
+}
+
+# Ready queue of active movie ids consumed by NextActiveMovieView
+MOVIE_READY_QUEUE = {
+    "BACKEND": "simple.api.movies.queue.RedisReadyQueue",
+    "LOCATION": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+    "KEY": "movies:ready",
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
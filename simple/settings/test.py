@@ -22,6 +22,16 @@ DRAMATIQ_BROKER = {
 # class ProcessesAccountTests(BaseTestSet, DramatiqTestCase):
 # stat = StatisticsProcess(call_id=call_5.id).execute()
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+MOVIE_READY_QUEUE = {
+    "BACKEND": "simple.api.movies.queue.LocalReadyQueue",
+}
+
 BASE_URL = "https://base.url.intra"
 
 
@@ -0,0 +1,6 @@
+# flake8: noqa: F401
+"""
+Signal receivers of the simple application, connected in `SimpleConfig.ready()`.
+"""
+
+from simple.signals import authors, categories, movies, weather
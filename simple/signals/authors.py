@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from simple.api.library.cache import invalidate_authors
+from simple.models.models import Author
+from simple.models.querysets import post_update
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author_cache(sender, instance, **kwargs):
+    """Drop the cached API payload of a saved or deleted author."""
+    invalidate_authors([instance.pk])
+
+
+@receiver(post_update, sender=Author)
+def invalidate_updated_authors_cache(sender, pks, **kwargs):
+    """Drop the cached API payloads of authors changed by `QuerySet.update()`."""
+    invalidate_authors(pks)
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from simple.api.movies.snapshot import bump_category_generation
+from simple.models.models import MovieCategory
+from simple.models.querysets import post_update
+
+
+@receiver(post_save, sender=MovieCategory)
+@receiver(post_delete, sender=MovieCategory)
+@receiver(post_update, sender=MovieCategory)
+def refresh_category_snapshot(sender, **kwargs):
+    """Make every process rebuild its category snapshot after a category write."""
+    bump_category_generation()
@@ -0,0 +1,128 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from simple.api.movies.directors import sync_movie_directors
+from simple.api.movies.queue import dequeue_movies, enqueue_movies, refresh_movies
+from simple.api.movies.similarity import (
+    SIMILARITY_FIELDS,
+    mark_neighbours_stale,
+    mark_similarity_stale,
+)
+from simple.api.movies.snapshot import get_category_snapshot
+from simple.api.movies.top import TOP_FIELDS, invalidate_top_movies
+from simple.models.models import Movie
+from simple.models.querysets import post_update
+
+# Movie fields the ready queue depends on
+QUEUE_FIELDS = {"is_active", "release_date", "title"}
+
+
+@receiver(post_save, sender=Movie)
+def sync_saved_movie(sender, instance, **kwargs):
+    """Queue a saved movie when it is active, drop it otherwise."""
+    enqueue_movies([(instance.pk, instance.is_active, instance.release_date, instance.title)])
+
+
+@receiver(post_delete, sender=Movie)
+def drop_deleted_movie(sender, instance, **kwargs):
+    """Drop a deleted movie from the ready queue."""
+    dequeue_movies([instance.pk])
+
+
+@receiver(post_update, sender=Movie)
+def sync_updated_movies(sender, pks, fields, values=None, **kwargs):
+    """
+    Keep the ready queue in sync with `QuerySet.update()` calls, such as the
+    admin `mark_as_active`/`mark_as_inactive` actions and movie claims.
+    """
+    if not QUEUE_FIELDS.intersection(fields):
+        return
+    if values is not None and values.get("is_active") is False:
+        dequeue_movies(pks)
+    else:
+        refresh_movies(pks)
+
+
+@receiver(pre_save, sender=Movie)
+def remember_stored_movie(sender, instance, raw=False, **kwargs):
+    """
+    Keep the stored category and director of a saved movie as
+    `instance._stored` (None for new movies), for the post_save receivers
+    to act on what changed.
+    """
+    instance._stored = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._stored = (
+        Movie._base_manager.filter(pk=instance.pk).values("category_id", "director").first()
+    )
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def invalidate_category_top(sender, instance, **kwargs):
+    """
+    Drop the top movies of the category of a saved or deleted movie, and
+    of the category a saved movie was moved out of.
+    """
+    stored = getattr(instance, "_stored", None)
+    previous = [stored["category_id"]] if stored else []
+    invalidate_top_movies([instance.category_id, *previous])
+
+
+@receiver(post_update, sender=Movie)
+def invalidate_updated_categories_top(sender, pks, fields, **kwargs):
+    """
+    Drop the top movies of the categories of movies changed by
+    `QuerySet.update()`; moving movies to another category drops them all,
+    since the categories they came from are unknown by then.
+    """
+    if not TOP_FIELDS.intersection(fields):
+        return
+    if {"category", "category_id"}.intersection(fields):
+        invalidate_top_movies(category.id for category in get_category_snapshot().rows)
+    else:
+        invalidate_top_movies(
+            Movie._base_manager.filter(pk__in=pks).values_list("category_id", flat=True)
+        )
+
+
+@receiver(post_save, sender=Movie)
+def flag_saved_movie_similarity(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Flag the neighbours of a saved movie for the next similarity refresh."""
+    if raw or (update_fields is not None and not SIMILARITY_FIELDS.intersection(update_fields)):
+        return
+    mark_similarity_stale([instance.pk])
+
+
+@receiver(post_delete, sender=Movie)
+def flag_deleted_movie_neighbours(sender, instance, **kwargs):
+    """Flag the neighbour lists a deleted movie was part of."""
+    mark_neighbours_stale(instance.pk)
+
+
+@receiver(post_update, sender=Movie)
+def flag_updated_movies_similarity(sender, pks, fields, **kwargs):
+    """Flag the neighbours of movies changed by `QuerySet.update()`."""
+    if SIMILARITY_FIELDS.intersection(fields):
+        mark_similarity_stale(pks)
+
+
+@receiver(post_save, sender=Movie)
+def sync_saved_movie_directors(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Link a saved movie to the directors named in its `director`, when it changed."""
+    if raw or (update_fields is not None and "director" not in update_fields):
+        return
+    stored = getattr(instance, "_stored", None)
+    if stored and stored["director"] == instance.director:
+        return
+    sync_movie_directors([(instance.pk, instance.director)])
+
+
+@receiver(post_update, sender=Movie)
+def sync_updated_movies_directors(sender, pks, fields, **kwargs):
+    """Relink the directors of movies whose `director` changed in `QuerySet.update()`."""
+    if "director" in fields:
+        sync_movie_directors(
+            Movie._base_manager.filter(pk__in=pks).values_list("pk", "director")
+        )
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from simple.models.weather import Weather, WeatherRollup
+from simple.processes.rollups import BUCKET_FIELD, add_to_rollups, replace_in_rollups
+
+
+@receiver(pre_save, sender=Weather)
+def remember_previous_reading(sender, instance, raw=False, **kwargs):
+    """Keep the stored values of a changed reading, to take them out of its rollups."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_reading = (
+        Weather._base_manager.filter(pk=instance.pk)
+        .only("city_name", "weather_main", BUCKET_FIELD, *WeatherRollup.METRICS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Weather)
+def roll_up_saved_reading(sender, instance, created, **kwargs):
+    """Merge a new reading into its rollups, replace a changed one in them."""
+    if created:
+        add_to_rollups([instance])
+        return
+    previous = getattr(instance, "_previous_reading", None)
+    if previous is None:
+        add_to_rollups([instance])
+    else:
+        replace_in_rollups(previous, instance)
+
+
+@receiver(post_delete, sender=Weather)
+def roll_up_deleted_reading(sender, instance, **kwargs):
+    """Take a deleted reading out of its rollups."""
+    replace_in_rollups(instance)
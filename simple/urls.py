@@ -59,6 +59,20 @@ jwt_urlpatterns = [
             namespace="library-api",
         ),
     ),
+    re_path(
+        r"api/",
+        include(
+            ("simple.api.search.urls", "simple.api"),
+            namespace="search-api",
+        ),
+    ),
+    re_path(
+        r"api/",
+        include(
+            ("simple.api.weather.urls", "simple.api"),
+            namespace="weather-api",
+        ),
+    ),
 ]
 
 